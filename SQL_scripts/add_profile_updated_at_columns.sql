@@ -0,0 +1,5 @@
+-- Existing databases: add the updated_at columns that the Python backend uses
+-- to version cached profiles (see PROFILE_VERSION_COLUMNS in
+-- backend_python/app/database/repository.py)
+ALTER TABLE public.users ADD COLUMN IF NOT EXISTS updated_at timestamptz DEFAULT now();
+ALTER TABLE public.education ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
@@ -7,6 +7,7 @@ CREATE TABLE public.education (
   start_date DATE NULL,
   end_date DATE NULL,
   created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
 
   CONSTRAINT education_pkey PRIMARY KEY (id),
   CONSTRAINT education_user_id_fkey FOREIGN KEY (user_id)
@@ -9,6 +9,7 @@ CREATE TABLE public.users (
   location VARCHAR(255) NULL,
   phone VARCHAR(30) NULL,
   created_at timestamptz DEFAULT now(),
+  updated_at timestamptz DEFAULT now(),
   CONSTRAINT users_pkey PRIMARY KEY (id),
   CONSTRAINT users_email_key UNIQUE (email),
   CONSTRAINT users_username_key UNIQUE (username)
@@ -210,9 +210,10 @@ const updateUser = async (userId, updates) => {
        SET name = COALESCE($2, name),
            about = COALESCE($3, about),
            location = COALESCE($4, location),
-           phone = COALESCE($5, phone)
+           phone = COALESCE($5, phone),
+           updated_at = now()
        WHERE id = $1
-       RETURNING id, username, email, name, about, location, phone, created_at, provider, provider_id`,
+       RETURNING id, username, email, name, about, location, phone, created_at, updated_at, provider, provider_id`,
       [userId, name, about, location, phone]
     )
 
@@ -5,7 +5,7 @@ import crypto from "crypto"
 const getUserEducation = async (userId) => {
   try {
     const results = await query(
-      `SELECT id, user_id, title, description, grade, start_date, end_date, created_at
+      `SELECT id, user_id, title, description, grade, start_date, end_date, created_at, updated_at
        FROM education
        WHERE user_id = $1
        ORDER BY start_date DESC NULLS LAST, created_at DESC`,
@@ -22,7 +22,7 @@ const getUserEducation = async (userId) => {
 const getEducationById = async (educationId, userId) => {
   try {
     const results = await query(
-      `SELECT id, user_id, title, description, grade, start_date, end_date, created_at
+      `SELECT id, user_id, title, description, grade, start_date, end_date, created_at, updated_at
        FROM education
        WHERE id = $1 AND user_id = $2`,
       [educationId, userId]
@@ -43,7 +43,7 @@ const createEducation = async (userId, educationData) => {
     const results = await query(
       `INSERT INTO education(id, user_id, title, description, grade, start_date, end_date)
        VALUES($1, $2, $3, $4, $5, $6, $7)
-       RETURNING id, user_id, title, description, grade, start_date, end_date, created_at`,
+       RETURNING id, user_id, title, description, grade, start_date, end_date, created_at, updated_at`,
       [educationId, userId, title, description || null, grade || null, start_date || null, end_date || null]
     )
 
@@ -69,9 +69,10 @@ const updateEducation = async (educationId, userId, educationData) => {
            description = $4,
            grade = $5,
            start_date = $6,
-           end_date = $7
+           end_date = $7,
+           updated_at = now()
        WHERE id = $1 AND user_id = $2
-       RETURNING id, user_id, title, description, grade, start_date, end_date, created_at`,
+       RETURNING id, user_id, title, description, grade, start_date, end_date, created_at, updated_at`,
       [educationId, userId, title, description || null, grade || null, start_date || null, end_date || null]
     )
 
@@ -4,6 +4,7 @@ import cors from "cors"
 import cookies from "cookie-parser"
 import session from "express-session"
 import passport from "./config/passport.js"
+import { invalidateProfileCacheOnWrite } from "./utils/profileCache.js"
 
 import userRoutes from "./routes/auth.route.js"
 import educationRoutes from "./routes/education.route.js"
@@ -34,11 +35,11 @@ app.use(session({
 app.use(passport.initialize())
 app.use(passport.session())
 
-app.use("/api/v1/auth", userRoutes)
-app.use("/api/v1/education", educationRoutes)
-app.use("/api/v1/skills", skillsRoutes)
+app.use("/api/v1/auth", invalidateProfileCacheOnWrite, userRoutes)
+app.use("/api/v1/education", invalidateProfileCacheOnWrite, educationRoutes)
+app.use("/api/v1/skills", invalidateProfileCacheOnWrite, skillsRoutes)
 app.use("/api/v1/resume", resumeRoutes)
-app.use("/api/v1/resume-items", resumeItemsRoutes)
+app.use("/api/v1/resume-items", invalidateProfileCacheOnWrite, resumeItemsRoutes)
 app.use("/api/v1/curated-resumes", curatedResumesRoutes)
 
 try {
@@ -0,0 +1,44 @@
+const WRITE_METHODS = new Set(["POST", "PUT", "PATCH", "DELETE"])
+
+/**
+ * Tells the FastAPI service to drop its cached copy of a user's profile
+ * @param {string} userId - The user whose profile data changed
+ * @returns {Promise<void>} - Resolves once the call finishes (errors are logged, never thrown)
+ */
+const invalidateProfileCache = async (userId) => {
+    const FASTAPI_URL = process.env.FASTAPI_URL || 'http://localhost:8000'
+
+    try {
+        const response = await fetch(`${FASTAPI_URL}/api/cache/invalidate`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                ...(process.env.INTERNAL_API_TOKEN && { 'X-Internal-Token': process.env.INTERNAL_API_TOKEN })
+            },
+            body: JSON.stringify({ user_id: userId })
+        })
+
+        if (!response.ok) {
+            console.error(`Profile cache invalidation failed: ${response.status}`)
+        }
+    } catch (error) {
+        // The cache also expires on its own, so a failed call is not fatal
+        console.error("Profile cache invalidation error:", error.message)
+    }
+}
+
+/**
+ * Express middleware: after any successful write, invalidate the user's cached profile
+ */
+const invalidateProfileCacheOnWrite = (req, res, next) => {
+    if (WRITE_METHODS.has(req.method)) {
+        res.on("finish", () => {
+            if (res.statusCode < 400 && req.user?.id) {
+                invalidateProfileCache(req.user.id)
+            }
+        })
+    }
+    next()
+}
+
+export { invalidateProfileCache, invalidateProfileCacheOnWrite }
@@ -10,17 +10,163 @@ try:
 except ImportError:
     pass
 
+# backend_python/, so relative data paths do not depend on the process's working directory
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 
 class Settings:
     """Application settings loaded from environment variables."""
     
     # OpenAI Configuration
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    # Max concurrent model calls when generating several bullet variants for one request
+    BULLET_GENERATION_CONCURRENCY: int = int(os.getenv("BULLET_GENERATION_CONCURRENCY", "3"))
+    # "parallel" = one model call per bullet, "single_call" = one structured call returning all bullets
+    BULLET_GENERATION_MODE: str = os.getenv("BULLET_GENERATION_MODE", "parallel")
+    # Drop generated bullets that near-duplicate the item's existing bullets or each other
+    # (character shingle overlap >= BULLET_DEDUP_THRESHOLD) and regenerate only those slots,
+    # at most BULLET_DEDUP_MAX_REGENERATIONS times; slots still duplicated are left out
+    BULLET_DEDUP_ENABLED: bool = os.getenv("BULLET_DEDUP_ENABLED", "true").lower() == "true"
+    BULLET_DEDUP_THRESHOLD: float = float(os.getenv("BULLET_DEDUP_THRESHOLD", "0.6"))
+    BULLET_DEDUP_MAX_REGENERATIONS: int = int(os.getenv("BULLET_DEDUP_MAX_REGENERATIONS", "1"))
+    # Model used for schema-enforced (structured output) calls; must support json_schema output
+    STRUCTURED_OUTPUT_MODEL: str = os.getenv("STRUCTURED_OUTPUT_MODEL", "gpt-4o")
+    # Per-task model routing overrides as JSON, e.g. '{"full_resume": {"primary": "gpt-4o", "fallback": "gpt-4o-mini"}}'
+    # (fields: primary, fallback, max_tokens, temperature; see app/services/model_routing.py for tasks and defaults)
+    LLM_MODEL_ROUTES: str = os.getenv("LLM_MODEL_ROUTES", "")
+    
+    # Outbound LLM limiter (process-wide, per model)
+    LLM_MAX_CONCURRENT_REQUESTS: int = int(os.getenv("LLM_MAX_CONCURRENT_REQUESTS", "8"))
+    # Tokens (input + output) per minute per model; 0 disables the token bucket.
+    # Set to the account's rate limit for the model to avoid 429s under load
+    LLM_TOKENS_PER_MINUTE: int = int(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+    # Per-model overrides as "model=concurrency/tokens_per_minute,...", e.g. "gpt-4=4/10000,gpt-4o=16/30000"
+    LLM_MODEL_LIMITS: str = os.getenv("LLM_MODEL_LIMITS", "")
+    # Calls allowed to wait for a slot per model before new ones are rejected (backpressure)
+    LLM_MAX_QUEUE_SIZE: int = int(os.getenv("LLM_MAX_QUEUE_SIZE", "100"))
+    # Max seconds a call waits in the queue before it is rejected
+    LLM_QUEUE_TIMEOUT: float = float(os.getenv("LLM_QUEUE_TIMEOUT", "30"))
+    # Output tokens reserved per call until the real usage is known
+    LLM_ESTIMATED_OUTPUT_TOKENS: int = int(os.getenv("LLM_ESTIMATED_OUTPUT_TOKENS", "600"))
+    # Times a call is re-queued after a 429 (the model is paused for Retry-After first)
+    LLM_RATE_LIMIT_RETRIES: int = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "2"))
+    
+    # Outbound LLM failure handling (per call / per model)
+    # Deadline in seconds for one model call (a hung call is cancelled and retried)
+    LLM_CALL_TIMEOUT: float = float(os.getenv("LLM_CALL_TIMEOUT", "60"))
+    # Retries after a timeout, connection error or 5xx, with full-jitter exponential backoff
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    LLM_RETRY_BASE_DELAY: float = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+    LLM_RETRY_MAX_DELAY: float = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+    # Consecutive failures that open a model's circuit, and how long it stays open
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    LLM_CIRCUIT_RESET_SECONDS: float = float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "30"))
+    # Namespaces whose calls are hedged: a second call starts once the first is slower
+    # than the model's recent LLM_HEDGE_PERCENTILE latency (costs extra tokens on slow calls)
+    LLM_HEDGE_NAMESPACES: set = {
+        name.strip() for name in os.getenv("LLM_HEDGE_NAMESPACES", "").split(",") if name.strip()
+    }
+    LLM_HEDGE_PERCENTILE: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+    # Never hedge earlier than this many seconds, nor before this many latencies are known
+    LLM_HEDGE_MIN_DELAY: float = float(os.getenv("LLM_HEDGE_MIN_DELAY", "1.0"))
+    LLM_HEDGE_MIN_SAMPLES: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    # Recent successful calls per model kept for the latency percentiles
+    LLM_LATENCY_WINDOW: int = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+    
+    # LLM Response Cache Configuration
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    # Endpoints (cache namespaces) that opt in: full_resume, resume_analysis, bullets
+    LLM_CACHE_NAMESPACES: set = {
+        name.strip() for name in os.getenv("LLM_CACHE_NAMESPACES", "full_resume,resume_analysis").split(",") if name.strip()
+    }
+    LLM_CACHE_TTL_SECONDS: float = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+    # Optional SQLite file for a cache tier that survives restarts (disabled when unset)
+    LLM_CACHE_SQLITE_PATH: Optional[str] = os.getenv("LLM_CACHE_SQLITE_PATH")
+    
+    # Near-duplicate job description reuse (full resume + analysis, same user and profile version)
+    JD_DEDUP_ENABLED: bool = os.getenv("JD_DEDUP_ENABLED", "true").lower() == "true"
+    # Estimated Jaccard similarity of the normalized JD shingles above which results are reused
+    JD_DEDUP_SIMILARITY_THRESHOLD: float = float(os.getenv("JD_DEDUP_SIMILARITY_THRESHOLD", "0.9"))
+    JD_DEDUP_NUM_PERM: int = int(os.getenv("JD_DEDUP_NUM_PERM", "128"))
+    JD_DEDUP_TTL_SECONDS: float = float(os.getenv("JD_DEDUP_TTL_SECONDS", str(24 * 60 * 60)))
+    JD_DEDUP_MAX_ENTRIES: int = int(os.getenv("JD_DEDUP_MAX_ENTRIES", "2048"))
+    
+    # Pick the full resume's skills locally (user skills the JD mentions, aliases included)
+    # when at least LOCAL_SKILL_SELECTION_MIN match; otherwise the model's selection is used
+    LOCAL_SKILL_SELECTION_ENABLED: bool = os.getenv("LOCAL_SKILL_SELECTION_ENABLED", "true").lower() == "true"
+    LOCAL_SKILL_SELECTION_MIN: int = int(os.getenv("LOCAL_SKILL_SELECTION_MIN", "4"))
+    LOCAL_SKILL_SELECTION_MAX: int = int(os.getenv("LOCAL_SKILL_SELECTION_MAX", "8"))
+    
+    # Default /api/analyze-resume mode: "fast" = local scores and rule-based feedback (no model call),
+    # "full" = local scores, the model writes the strengths/weaknesses/suggestions
+    ANALYSIS_MODE: str = os.getenv("ANALYSIS_MODE", "full")
+    
+    # Batch full resume generation (/api/generate-full-resume/batch)
+    BATCH_MAX_JOBS: int = int(os.getenv("BATCH_MAX_JOBS", "50"))
+    # Jobs generated at once within one batch request
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", "4"))
+    
+    # Share one computation between concurrent identical requests (double submits, two tabs)
+    SINGLEFLIGHT_ENABLED: bool = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+    
+    # Local data files (e.g. the SQLite job store); relative paths are resolved against backend_python/
+    DATA_DIR: str = os.path.join(BASE_DIR, os.getenv("DATA_DIR", "data"))
+    
+    # Background jobs (/api/generate-full-resume/jobs, /api/analyze-resume/jobs)
+    # Queue backend: "memory", or "sqlite" so queued jobs and results survive restarts
+    JOB_QUEUE_BACKEND: str = os.getenv("JOB_QUEUE_BACKEND", "memory")
+    # Relative paths are resolved against DATA_DIR
+    JOB_QUEUE_SQLITE_PATH: str = os.path.join(DATA_DIR, os.getenv("JOB_QUEUE_SQLITE_PATH", "jobs.sqlite3"))
+    # A running job is owned by its worker for this long and renewed while it runs; with a shared
+    # SQLite store, other processes only re-run jobs whose owner stopped renewing (crashed)
+    JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+    # Jobs run at once per process; the rest wait in the queue
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "4"))
+    # Waiting jobs accepted before new submissions are rejected with 503
+    JOB_QUEUE_MAX_PENDING: int = int(os.getenv("JOB_QUEUE_MAX_PENDING", "100"))
+    # How long finished jobs (and their results) can still be fetched
+    JOB_RESULT_TTL_SECONDS: float = float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+    
+    # Prompt context budgets (estimated tokens); lower-ranked context is condensed or dropped
+    CONTEXT_BUDGET_ENABLED: bool = os.getenv("CONTEXT_BUDGET_ENABLED", "true").lower() == "true"
+    # Bullet lists sent as context (existing / other bullets of a bullet prompt)
+    CONTEXT_BUDGET_BULLETS_TOKENS: int = int(os.getenv("CONTEXT_BUDGET_BULLETS_TOKENS", "600"))
+    # Experiences and projects of the full resume and analysis prompts
+    CONTEXT_BUDGET_RESUME_ITEMS_TOKENS: int = int(os.getenv("CONTEXT_BUDGET_RESUME_ITEMS_TOKENS", "2000"))
+    # All bullets of the analysis prompt
+    CONTEXT_BUDGET_ANALYSIS_BULLETS_TOKENS: int = int(os.getenv("CONTEXT_BUDGET_ANALYSIS_BULLETS_TOKENS", "1500"))
+    # Longer single entries (a description or bullet) are truncated
+    CONTEXT_MAX_ENTRY_TOKENS: int = int(os.getenv("CONTEXT_MAX_ENTRY_TOKENS", "150"))
+    # Experiences + projects (ranked locally by BM25 against the JD) sent to the full resume prompt; 0 = all
+    FULL_RESUME_SHORTLIST_SIZE: int = int(os.getenv("FULL_RESUME_SHORTLIST_SIZE", "8"))
     
     # Supabase Configuration
     SUPABASE_URL: Optional[str] = os.getenv("SUPABASE_URL")
     SUPABASE_KEY: Optional[str] = os.getenv("SUPABASE_KEY")
     SUPABASE_BUCKET: str = os.getenv("SUPABASE_BUCKET", "pdf-uploads")
+    # Shared HTTP connection pool behind the process-wide Supabase client
+    SUPABASE_POOL_SIZE: int = int(os.getenv("SUPABASE_POOL_SIZE", "16"))
+    SUPABASE_KEEPALIVE_EXPIRY: float = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "60"))
+    SUPABASE_HTTP_TIMEOUT: float = float(os.getenv("SUPABASE_HTTP_TIMEOUT", "120"))
+    # Max threads running blocking Supabase queries off the event loop
+    # (keep <= SUPABASE_POOL_SIZE so threads never queue for a connection)
+    DB_MAX_WORKERS: int = int(os.getenv("DB_MAX_WORKERS", "16"))
+    # Per-query deadline (seconds) for reads awaited by the API handlers
+    DB_QUERY_TIMEOUT: float = float(os.getenv("DB_QUERY_TIMEOUT", "10"))
+    
+    # Profile Cache Configuration
+    PROFILE_CACHE_ENABLED: bool = os.getenv("PROFILE_CACHE_ENABLED", "true").lower() == "true"
+    PROFILE_CACHE_TTL_SECONDS: float = float(os.getenv("PROFILE_CACHE_TTL_SECONDS", "300"))
+    PROFILE_CACHE_MAX_ENTRIES: int = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "1000"))
+    PROFILE_CACHE_MAX_BYTES: int = int(os.getenv("PROFILE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    # Check the data version (row counts + max updated_at) before serving a hit.
+    # Off by default: the check costs as many round trips as a cold load, and the
+    # Node backend already invalidates on every write (hits then cost zero queries)
+    PROFILE_CACHE_VERIFY_VERSION: bool = os.getenv("PROFILE_CACHE_VERIFY_VERSION", "false").lower() == "true"
+    
+    # Shared secret the Node backend sends when calling internal endpoints
+    INTERNAL_API_TOKEN: Optional[str] = os.getenv("INTERNAL_API_TOKEN")
     
     # Application Configuration
     APP_TITLE: str = "resumATE AI Agent"
@@ -0,0 +1,150 @@
+"""In-process LRU cache of assembled user profiles.
+
+Entries hold the document built by `repository.get_user_resume_data` together
+with the data version it was built from. They expire after a TTL, are evicted
+least-recently-used once the entry count or estimated memory cap is exceeded,
+and can be dropped explicitly via `invalidate` (exposed to the Node backend
+through `/api/cache/invalidate`).
+"""
+
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from app.config.settings import settings
+
+
+@dataclass
+class CachedProfile:
+    """A cached profile document and the data version it reflects."""
+    version: str
+    profile: Dict[str, Any]
+    expires_at: float
+    size_bytes: int
+
+
+class ProfileCache:
+    """Thread-safe LRU cache with TTL and an approximate memory cap."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedProfile]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str) -> Optional[CachedProfile]:
+        """Return a live entry for the user (the profile is a private copy)."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(user_id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+        return CachedProfile(entry.version, copy.deepcopy(entry.profile), entry.expires_at, entry.size_bytes)
+
+    def generation(self, user_id: str) -> int:
+        """Current invalidation generation of a user (read before loading)."""
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def set(self, user_id: str, version: str, profile: Dict[str, Any], generation: int) -> bool:
+        """Store a freshly loaded profile.
+
+        The write is skipped if the user was invalidated after `generation`
+        was read, so a load that raced with a write never caches stale data.
+
+        Returns:
+            True if the profile was cached
+        """
+        size_bytes = len(json.dumps(profile, default=str))
+        if size_bytes > self.max_bytes:
+            return False
+
+        with self._lock:
+            if self._generations.get(user_id, 0) != generation:
+                return False
+            if user_id in self._entries:
+                self._remove(user_id)
+            self._entries[user_id] = CachedProfile(
+                version=version,
+                profile=copy.deepcopy(profile),
+                expires_at=time.monotonic() + self.ttl_seconds,
+                size_bytes=size_bytes
+            )
+            self._total_bytes += size_bytes
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                oldest_user_id = next(iter(self._entries))
+                self._remove(oldest_user_id)
+                self.evictions += 1
+        return True
+
+    def mark_stale(self, user_id: str) -> None:
+        """Drop an entry whose version no longer matches the database."""
+        with self._lock:
+            if user_id in self._entries:
+                self._remove(user_id)
+                self.stale += 1
+
+    def invalidate(self, user_id: str) -> bool:
+        """Drop a user's entry and fence off loads that started before now.
+
+        Returns:
+            True if an entry was removed
+        """
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self.invalidations += 1
+            if user_id in self._entries:
+                self._remove(user_id)
+                return True
+            return False
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            for user_id in list(self._entries):
+                self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+    def _remove(self, user_id: str) -> None:
+        entry = self._entries.pop(user_id)
+        self._total_bytes -= entry.size_bytes
+
+
+# Global profile cache instance
+profile_cache = ProfileCache(
+    max_entries=settings.PROFILE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.PROFILE_CACHE_MAX_BYTES,
+    ttl_seconds=settings.PROFILE_CACHE_TTL_SECONDS
+)
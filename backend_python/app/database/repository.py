@@ -0,0 +1,352 @@
+"""Async data access for resume data stored in Supabase.
+
+The supabase client is synchronous, so every query is executed on the bounded
+DB thread pool (see `run_in_db_thread`) instead of on the event loop.
+
+Reads go through the current request's data context (if any), so a row that
+was already loaded during the request is never fetched a second time.
+"""
+
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional
+from app.config.settings import settings
+from app.database.supabase import get_supabase_client, run_in_db_thread
+from app.database.request_context import get_request_context
+from app.database.profile_cache import profile_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def execute(query, timeout: Optional[float] = None, label: str = "query") -> Any:
+    """Execute a postgrest query builder on the DB thread pool.
+
+    Args:
+        query: Fully built query (e.g. `supabase.table(...).select(...).eq(...)`)
+        timeout: Optional deadline in seconds; raises asyncio.TimeoutError when exceeded
+        label: Name used in the timeout log message
+
+    Returns:
+        The postgrest API response
+    """
+    context = get_request_context()
+    if context is not None:
+        context.record_db_call()
+
+    if timeout is None:
+        return await run_in_db_thread(query.execute)
+
+    try:
+        return await asyncio.wait_for(run_in_db_thread(query.execute), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.error(f"Supabase {label} timed out after {timeout}s")
+        raise
+
+
+async def get_pointers_for_items(supabase, resume_item_ids: List[str], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Fetch the pointers of many resume items with a single `in_` query.
+
+    Args:
+        supabase: Supabase client
+        resume_item_ids: IDs of the resume items whose pointers are needed
+        timeout: Optional per-query deadline in seconds
+
+    Returns:
+        Pointer rows for all requested items, ordered by display_order
+    """
+    if not resume_item_ids:
+        return []
+
+    pointers = await execute(
+        supabase.table("resume_item_points").select("*").in_("resume_item_id", resume_item_ids).order("display_order"),
+        timeout=timeout,
+        label="resume_item_points"
+    )
+    return pointers.data or []
+
+
+def attach_pointers_to_items(items: List[Dict[str, Any]], pointers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Stitch pointer rows onto their resume items in memory.
+
+    Each item gets an `existing_pointers` list that keeps the display_order
+    of the incoming pointer rows. Items without pointers get an empty list.
+
+    Args:
+        items: Resume item rows
+        pointers: Pointer rows (already ordered by display_order)
+
+    Returns:
+        The same items, each with `existing_pointers` populated
+    """
+    pointers_by_item: Dict[str, List[Dict[str, Any]]] = {item["id"]: [] for item in items}
+    for pointer in pointers:
+        bucket = pointers_by_item.get(pointer.get("resume_item_id"))
+        if bucket is not None:
+            bucket.append(pointer)
+
+    for item in items:
+        item["existing_pointers"] = pointers_by_item[item["id"]]
+
+    return items
+
+
+# Tables that make up a profile: (column holding the user's id, timestamp column used for its version)
+PROFILE_VERSION_COLUMNS = {
+    "users": ("id", "updated_at"),
+    "resume_items": ("user_id", "updated_at"),
+    "resume_item_points": ("user_id", "updated_at"),
+    "skills": ("user_id", "updated_at"),
+    "education": ("user_id", "updated_at")
+}
+
+
+def _table_version(table: str, count: int, latest: Optional[str]) -> str:
+    return f"{table}:{count}:{latest or '-'}"
+
+
+def compute_profile_version(profile: Dict[str, Any]) -> str:
+    """Derive the data version of an assembled profile.
+
+    The version combines the row count and latest timestamp of every table
+    in the profile, so inserts, updates and deletes all change it.
+    """
+    points = [p for item in profile.get("resume_items", []) for p in item.get("existing_pointers", [])]
+    rows_by_table = {
+        "users": [profile["user"]] if profile.get("user") else [],
+        "resume_items": profile.get("resume_items", []),
+        "resume_item_points": points,
+        "skills": profile.get("skills", []),
+        "education": profile.get("education", [])
+    }
+    return "|".join(
+        _table_version(
+            table,
+            len(rows_by_table[table]),
+            max((row.get(column) for row in rows_by_table[table] if row.get(column)), default=None)
+        )
+        for table, (_, column) in PROFILE_VERSION_COLUMNS.items()
+    )
+
+
+async def get_profile_version(supabase, user_id: str) -> str:
+    """Fetch the current data version of a user's profile (one tiny query per table)."""
+    timeout = settings.DB_QUERY_TIMEOUT
+
+    async def table_version(table: str, owner_column: str, column: str) -> str:
+        result = await execute(
+            supabase.table(table).select(column, count="exact").eq(owner_column, user_id).order(column, desc=True, nullsfirst=False).limit(1),
+            timeout=timeout,
+            label=f"{table} version"
+        )
+        latest = result.data[0].get(column) if result.data else None
+        return _table_version(table, result.count or 0, latest)
+
+    versions = await asyncio.gather(*(
+        table_version(table, owner_column, column) for table, (owner_column, column) in PROFILE_VERSION_COLUMNS.items()
+    ))
+    return "|".join(versions)
+
+
+async def _load_user_resume_data(supabase, user_id: str) -> Dict[str, Any]:
+    """Load a user's profile from Supabase.
+
+    The users, resume_items (+ their points), skills and education reads are
+    independent, so they run concurrently and the load takes as long as the
+    slowest one. Each query is bounded by `DB_QUERY_TIMEOUT`.
+    """
+    timeout = settings.DB_QUERY_TIMEOUT
+
+    async def load_resume_items() -> List[Dict[str, Any]]:
+        # Points depend on the item IDs, so they are chained after the items read
+        resume_items = await execute(
+            supabase.table("resume_items").select("*").eq("user_id", user_id),
+            timeout=timeout,
+            label="resume_items"
+        )
+        # Get existing pointers for ALL resume items in one round trip
+        return attach_pointers_to_items(
+            resume_items.data,
+            await get_pointers_for_items(supabase, [item["id"] for item in resume_items.data], timeout=timeout)
+        )
+
+    user_data, resume_items_with_pointers, skills, education = await asyncio.gather(
+        execute(supabase.table("users").select("*").eq("id", user_id), timeout=timeout, label="users"),
+        load_resume_items(),
+        execute(supabase.table("skills").select("*").eq("user_id", user_id), timeout=timeout, label="skills"),
+        execute(supabase.table("education").select("*").eq("user_id", user_id), timeout=timeout, label="education")
+    )
+
+    return {
+        "user": user_data.data[0] if user_data.data else None,
+        "resume_items": resume_items_with_pointers,
+        "skills": skills.data,
+        "education": education.data
+    }
+
+
+async def _get_cached_profile(supabase, user_id: str) -> Optional[Dict[str, Any]]:
+    """Return the cached profile if it is still live and (optionally) current."""
+    cached = profile_cache.get(user_id)
+    if cached is None:
+        return None
+
+    if settings.PROFILE_CACHE_VERIFY_VERSION:
+        try:
+            current_version = await get_profile_version(supabase, user_id)
+        except Exception as e:
+            logger.warning(f"Profile version check failed, reloading profile: {e!r}")
+            return None
+        if current_version != cached.version:
+            logger.info(f"Cached profile for user {user_id} is stale, reloading")
+            profile_cache.mark_stale(user_id)
+            return None
+
+    return cached.profile
+
+
+async def get_user_resume_data(user_id: str) -> Dict[str, Any]:
+    """Get all resume data for a user.
+
+    Lookup order: the current request's data context, then the process-wide
+    profile cache (validated against the data version), then Supabase.
+    """
+    context = get_request_context()
+    if context is not None:
+        cached_profile = context.get("profiles", user_id)
+        if cached_profile is not None:
+            return cached_profile
+
+    supabase = get_supabase_client()
+    if not supabase:
+        logger.warning("Supabase client not available")
+        return {}
+
+    try:
+        profile = None
+        if settings.PROFILE_CACHE_ENABLED:
+            profile = await _get_cached_profile(supabase, user_id)
+
+        if profile is None:
+            generation = profile_cache.generation(user_id)
+            profile = await _load_user_resume_data(supabase, user_id)
+            if settings.PROFILE_CACHE_ENABLED:
+                profile_cache.set(user_id, compute_profile_version(profile), profile, generation)
+
+        if context is not None:
+            # Register everything we loaded so later lookups in this request are free
+            if profile["user"]:
+                context.put("users", user_id, profile["user"])
+            for item in profile["resume_items"]:
+                context.put("resume_items", item["id"], item)
+            context.put("profiles", user_id, profile)
+
+        return profile
+
+    except Exception as e:
+        logger.error(f"Error fetching user resume data: {e!r}")
+        return {}
+
+
+async def get_resume_item_with_pointers(resume_item_id: str) -> Optional[Dict[str, Any]]:
+    """Get a specific resume item with its existing pointers."""
+    context = get_request_context()
+    if context is not None:
+        cached_item = context.get("resume_items", resume_item_id)
+        if cached_item is not None:
+            return cached_item
+
+    supabase = get_supabase_client()
+    if not supabase:
+        return None
+
+    timeout = settings.DB_QUERY_TIMEOUT
+
+    try:
+        # Item and pointers are both keyed by resume_item_id, so fetch them together
+        resume_item, pointers = await asyncio.gather(
+            execute(supabase.table("resume_items").select("*").eq("id", resume_item_id), timeout=timeout, label="resume_items"),
+            execute(
+                supabase.table("resume_item_points").select("*").eq("resume_item_id", resume_item_id).order("display_order"),
+                timeout=timeout,
+                label="resume_item_points"
+            )
+        )
+        if not resume_item.data:
+            return None
+
+        item = resume_item.data[0]
+        item["existing_pointers"] = pointers.data
+
+        if context is not None:
+            context.put("resume_items", resume_item_id, item)
+
+        return item
+
+    except Exception as e:
+        logger.error(f"Error fetching resume item: {e!r}")
+        return None
+
+
+async def get_jobs_for_user(user_id: str, job_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch saved jobs of a user with a single `in_` query.
+
+    Only jobs owned by `user_id` are returned, so unknown IDs and other
+    users' jobs are simply missing from the result.
+
+    Returns:
+        Job rows keyed by job ID
+    """
+    if not job_ids:
+        return {}
+
+    supabase = get_supabase_client()
+    if not supabase:
+        logger.warning("Supabase client not available")
+        return {}
+
+    jobs = await execute(
+        supabase.table("jobs").select("id, title, company, description").eq("user_id", user_id).in_("id", job_ids),
+        timeout=settings.DB_QUERY_TIMEOUT,
+        label="jobs"
+    )
+    return {job["id"]: job for job in jobs.data or []}
+
+
+async def save_new_pointers(resume_item_id: str, user_id: str, new_pointers: List[str]) -> bool:
+    """Save new generated pointers to the database."""
+    supabase = get_supabase_client()
+    if not supabase:
+        return False
+
+    try:
+        # Get current max display order
+        existing_pointers = await execute(
+            supabase.table("resume_item_points").select("display_order").eq("resume_item_id", resume_item_id).order("display_order", desc=True)
+        )
+        max_order = existing_pointers.data[0]["display_order"] if existing_pointers.data else 0
+
+        # Insert new pointers
+        pointer_data = []
+        for i, pointer_content in enumerate(new_pointers):
+            pointer_data.append({
+                "resume_item_id": resume_item_id,
+                "user_id": user_id,
+                "content": pointer_content,
+                "display_order": max_order + i + 1,
+                "usage_count": 0
+            })
+
+        result = await execute(supabase.table("resume_item_points").insert(pointer_data))
+
+        # The cached item/profile no longer reflect the database
+        context = get_request_context()
+        if context is not None:
+            context.evict("resume_items", resume_item_id)
+            context.evict("profiles", user_id)
+        profile_cache.invalidate(user_id)
+
+        return len(result.data) == len(new_pointers)
+
+    except Exception as e:
+        logger.error(f"Error saving new pointers: {e}")
+        return False
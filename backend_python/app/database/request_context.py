@@ -0,0 +1,59 @@
+"""Request-scoped data context: identity map and DB call instrumentation.
+
+A `RequestDataContext` lives for exactly one HTTP request (see the middleware in
+`app.main`). The repository consults it before querying Supabase, so rows that
+were already loaded during the request are served from memory instead of being
+fetched again, and every query that does go out is counted.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+class RequestDataContext:
+    """Identity map of rows loaded during one request, keyed by (table, id)."""
+
+    def __init__(self):
+        self._rows: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.db_calls = 0
+        self.hits = 0
+
+    def get(self, table: str, row_id: str) -> Optional[Dict[str, Any]]:
+        """Return a previously loaded row, or None if it was never loaded."""
+        row = self._rows.get((table, row_id))
+        if row is not None:
+            self.hits += 1
+        return row
+
+    def put(self, table: str, row_id: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Register a loaded row under (table, row_id) and return it."""
+        self._rows[(table, row_id)] = row
+        return row
+
+    def evict(self, table: str, row_id: str) -> None:
+        """Forget a row (e.g. after it was written)."""
+        self._rows.pop((table, row_id), None)
+
+    def record_db_call(self) -> None:
+        """Count one round trip to the database."""
+        self.db_calls += 1
+
+
+_current_context: ContextVar[Optional[RequestDataContext]] = ContextVar("request_data_context", default=None)
+
+
+def get_request_context() -> Optional[RequestDataContext]:
+    """Get the data context of the current request, if any."""
+    return _current_context.get()
+
+
+@contextmanager
+def request_data_context() -> Iterator[RequestDataContext]:
+    """Install a fresh data context for the duration of the block."""
+    context = RequestDataContext()
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
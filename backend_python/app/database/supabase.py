@@ -1,27 +1,120 @@
 """Supabase database client configuration and utilities."""
 
-from typing import Optional
-from supabase import create_client, Client
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+import httpx
+from supabase import create_client, Client, ClientOptions
 
 from app.config.settings import settings
 
+logger = logging.getLogger(__name__)
+
+# Process-wide client shared by every service (created lazily)
+_supabase_client: Optional[Client] = None
+_supabase_http_client: Optional[httpx.Client] = None
+_supabase_client_lock = threading.Lock()
+
+# Bounded pool that runs blocking Supabase calls off the event loop
+_db_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _create_http_client() -> httpx.Client:
+    """Create the pooled keep-alive HTTP client used for all Supabase requests."""
+    return httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        timeout=settings.SUPABASE_HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=settings.SUPABASE_POOL_SIZE,
+            max_keepalive_connections=settings.SUPABASE_POOL_SIZE,
+            keepalive_expiry=settings.SUPABASE_KEEPALIVE_EXPIRY
+        )
+    )
+
 
 def get_supabase_client() -> Optional[Client]:
-    """Create and return a Supabase client using environment variables.
+    """Return the shared Supabase client, creating it on first use.
+    
+    All callers share one client and therefore one HTTP connection pool, so
+    connections (and their TLS sessions) are reused across requests.
     
     Returns:
         Supabase client instance or None if configuration is missing.
     """
+    global _supabase_client, _supabase_http_client
+    if _supabase_client is not None:
+        return _supabase_client
+    
     if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
         return None
     
-    try:
-        return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-    except Exception as e:
-        print(f"Failed to create Supabase client: {e}")
-        return None
+    with _supabase_client_lock:
+        if _supabase_client is None:
+            http_client = _create_http_client()
+            try:
+                _supabase_client = create_client(
+                    settings.SUPABASE_URL,
+                    settings.SUPABASE_KEY,
+                    options=ClientOptions(httpx_client=http_client)
+                )
+                _supabase_http_client = http_client
+            except Exception as e:
+                http_client.close()
+                logger.error(f"Failed to create Supabase client: {e}")
+                return None
+    
+    return _supabase_client
+
+
+def close_supabase_client() -> None:
+    """Close the shared client's connection pool (called on application shutdown)."""
+    global _supabase_client, _supabase_http_client
+    with _supabase_client_lock:
+        if _supabase_http_client is not None:
+            _supabase_http_client.close()
+        _supabase_client = None
+        _supabase_http_client = None
 
 
 def get_supabase_bucket_name() -> str:
     """Get the Supabase storage bucket name from settings."""
     return settings.SUPABASE_BUCKET
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Get the thread pool used for blocking database calls (created lazily)."""
+    global _db_executor
+    if _db_executor is None:
+        _db_executor = ThreadPoolExecutor(
+            max_workers=settings.DB_MAX_WORKERS,
+            thread_name_prefix="supabase-db"
+        )
+    return _db_executor
+
+
+async def run_in_db_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking database call on the DB thread pool without blocking the event loop.
+    
+    Args:
+        func: Blocking callable (e.g. a postgrest builder's `execute`)
+        *args: Positional arguments for `func`
+        **kwargs: Keyword arguments for `func`
+        
+    Returns:
+        Whatever `func` returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_db_executor() -> None:
+    """Shut down the DB thread pool (called on application shutdown)."""
+    global _db_executor
+    if _db_executor is not None:
+        _db_executor.shutdown(wait=False, cancel_futures=True)
+        _db_executor = None
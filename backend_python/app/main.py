@@ -1,10 +1,14 @@
 """Main FastAPI application."""
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
 from app.config.settings import settings, setup_logging
-from app.database.supabase import get_supabase_client
-from app.routes import health, root, resume
+from app.database.supabase import get_supabase_client, close_supabase_client, shutdown_db_executor
+from app.database.request_context import request_data_context
+from app.routes import health, root, resume, cache, jobs
+from app.services.job_queue import job_queue
+from app.services.rate_limiter import LLMOverloadedError
 
 
 def create_app() -> FastAPI:
@@ -22,10 +26,36 @@ def create_app() -> FastAPI:
         version=settings.APP_VERSION
     )
     
+    # Give every request its own data context (identity map + DB call counter)
+    @app.middleware("http")
+    async def request_data_context_middleware(request: Request, call_next):
+        with request_data_context() as data_context:
+            request.state.data_context = data_context
+            response = await call_next(request)
+        response.headers["X-DB-Calls"] = str(data_context.db_calls)
+        if data_context.db_calls or data_context.hits:
+            logger.info(
+                f"{request.method} {request.url.path}: {data_context.db_calls} DB calls, "
+                f"{data_context.hits} served from request data context"
+            )
+        return response
+    
+    # Shed load when the outbound LLM queue is saturated
+    @app.exception_handler(LLMOverloadedError)
+    async def llm_overloaded_handler(request: Request, exc: LLMOverloadedError):
+        logger.warning(f"{request.method} {request.url.path}: {exc}")
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(int(exc.retry_after + 0.999))}
+        )
+    
     # Include routers
     app.include_router(root.router)
     app.include_router(health.router)
     app.include_router(resume.router)
+    app.include_router(cache.router)
+    app.include_router(jobs.router)
     
     # Startup event
     @app.on_event("startup")
@@ -36,6 +66,16 @@ def create_app() -> FastAPI:
             logger.info("Supabase client configured successfully")
         else:
             logger.warning("Supabase client not configured - check environment variables")
+        # Start the background job workers (with sqlite, picks up stored jobs nobody is running)
+        await job_queue.start()
+    
+    # Shutdown event
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        logger.info("Shutting down ResumATE AI Agent backend")
+        await job_queue.stop()
+        shutdown_db_executor()
+        close_supabase_client()
     
     return app
 
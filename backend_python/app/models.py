@@ -1,6 +1,6 @@
 """Pydantic models for API request/response validation."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional
 from pydantic import BaseModel
 
 
@@ -23,6 +23,10 @@ class GeneratePointerChunksRequest(BaseModel):
     resume_item_id: str
     user_id: str
     job_description: str
+    # "parallel" (one call per bullet) or "single_call" (one structured call); defaults to settings
+    generation_mode: Optional[Literal["parallel", "single_call"]] = None
+    # True = skip cached AI responses and generate fresh ones
+    regenerate: bool = False
 
 
 class GeneratePointerChunksResponse(BaseModel):
@@ -85,6 +89,8 @@ class GenerateFullResumeRequest(BaseModel):
     """Request model for full resume optimization."""
     user_id: str
     job_description: str
+    # True = skip cached AI responses and generate fresh ones
+    regenerate: bool = False
 
 
 class GenerateFullResumeResponse(BaseModel):
@@ -106,6 +112,19 @@ class GenerateFullResumeResponse(BaseModel):
     education: List[Education]
 
 
+class GenerateFullResumeBatchRequest(BaseModel):
+    """Request model for tailoring one profile to many jobs.
+    
+    Jobs are given as job description texts and/or IDs of the user's saved
+    jobs; results are numbered in that order (texts first, then IDs).
+    """
+    user_id: str
+    job_descriptions: List[str] = []
+    job_ids: List[str] = []
+    # True = skip cached AI responses and generate fresh ones
+    regenerate: bool = False
+
+
 class CategoryScores(BaseModel):
     """Category scores breakdown."""
     skills_match: int
@@ -118,6 +137,11 @@ class AnalyzeResumeRequest(BaseModel):
     """Request model for resume analysis."""
     user_id: str
     job_description: str
+    # True = skip cached AI responses and analyze again
+    regenerate: bool = False
+    # "fast" = local scoring only (no AI call), "full" = local scores + AI-written feedback;
+    # None = settings.ANALYSIS_MODE
+    mode: Optional[Literal["fast", "full"]] = None
 
 
 class AnalyzeResumeResponse(BaseModel):
@@ -127,3 +151,42 @@ class AnalyzeResumeResponse(BaseModel):
     strengths: List[str]
     weaknesses: List[str]
     suggestions: List[str]
+
+
+class InvalidateProfileCacheRequest(BaseModel):
+    """Request model for dropping a user's cached profile after a write."""
+    user_id: str
+
+
+class InvalidateProfileCacheResponse(BaseModel):
+    """Response model for profile cache invalidation."""
+    user_id: str
+    invalidated: bool
+
+
+class JobSubmittedResponse(BaseModel):
+    """Response model for a queued background job."""
+    job_id: str
+    status: str
+    # Poll for the state and result
+    status_url: str
+    # Server-Sent Events with each state change
+    events_url: str
+
+
+class JobStatusResponse(BaseModel):
+    """State of a background job.
+    
+    `result` is what the synchronous endpoint returns, once the job succeeded;
+    `error` is {"status", "detail"[, "retry_after"]} with the HTTP status the
+    synchronous endpoint would have returned, once it failed.
+    """
+    job_id: str
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    # Unix timestamps (seconds)
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, Any]] = None
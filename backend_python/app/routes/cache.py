@@ -0,0 +1,49 @@
+"""Cache management and metrics routes (invalidation is called by the Node backend)."""
+
+import logging
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
+from app.config.settings import settings
+from app.database.profile_cache import profile_cache
+from app.services.jd_dedup import jd_result_store
+from app.services.llm_cache import llm_cache
+from app.services.singleflight import request_coalescer
+from app.models import InvalidateProfileCacheRequest, InvalidateProfileCacheResponse
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/cache", tags=["cache"])
+
+
+def verify_internal_token(x_internal_token: Optional[str]) -> None:
+    """Reject the call if an internal token is configured and does not match."""
+    if settings.INTERNAL_API_TOKEN and x_internal_token != settings.INTERNAL_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid internal token")
+
+
+@router.post("/invalidate", response_model=InvalidateProfileCacheResponse)
+async def invalidate_profile_cache(
+    request: InvalidateProfileCacheRequest,
+    x_internal_token: Optional[str] = Header(default=None)
+):
+    """
+    Drop a user's cached profile.
+    
+    The Node backend calls this after writes to resume items, points,
+    skills, education or the user record.
+    """
+    verify_internal_token(x_internal_token)
+    invalidated = profile_cache.invalidate(request.user_id)
+    logger.info(f"Profile cache invalidated for user {request.user_id} (entry removed: {invalidated})")
+    return InvalidateProfileCacheResponse(user_id=request.user_id, invalidated=invalidated)
+
+
+@router.get("/stats")
+async def cache_stats(x_internal_token: Optional[str] = Header(default=None)):
+    """Hit/miss counters for the profile cache, LLM response cache and near-duplicate JD reuse, plus coalesced requests."""
+    verify_internal_token(x_internal_token)
+    return {
+        "profile_cache": profile_cache.stats(),
+        "llm_cache": llm_cache.stats(),
+        "jd_dedup": jd_result_store.stats(),
+        "singleflight": request_coalescer.stats()
+    }
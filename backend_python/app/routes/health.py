@@ -1,6 +1,13 @@
 """Health check and basic API routes."""
 
 from fastapi import APIRouter, Request
+from app.services.bullet_dedup import bullet_dedup_meter
+from app.services.context_budget import context_budgeter
+from app.services.job_queue import job_queue
+from app.services.model_routing import model_router
+from app.services.rate_limiter import llm_rate_limiter
+from app.services.resilience import llm_health
+from app.services.token_usage import token_usage
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -13,3 +20,17 @@ async def health_check(request: Request):
         "status": "ok", 
         "supabase_configured": supabase is not None
     }
+
+
+@router.get("/llm")
+async def llm_limiter_stats():
+    """Outbound LLM state: per-model limiter, circuit and latency stats, the task routing table, context budget savings, prompt cache hits, generated bullet duplicate rates and the background job queue."""
+    return {
+        "models": llm_rate_limiter.stats(),
+        "health": llm_health.stats(),
+        "routes": model_router.table(),
+        "context_budget": context_budgeter.stats(),
+        "token_usage": token_usage.stats(),
+        "bullet_dedup": bullet_dedup_meter.stats(),
+        "jobs": job_queue.stats()
+    }
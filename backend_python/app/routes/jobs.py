@@ -0,0 +1,152 @@
+"""Background job routes: queue a full resume or analysis, then poll it or subscribe to its events."""
+
+import logging
+from typing import Any, Dict
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from app.models import (
+    AnalyzeResumeRequest,
+    GenerateFullResumeRequest,
+    JobStatusResponse,
+    JobSubmittedResponse
+)
+from app.routes import resume
+from app.routes.resume import format_sse_event
+from app.services.job_queue import Job, JobQueueFullError, job_queue
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api", tags=["jobs"])
+
+# Job kinds
+JOB_FULL_RESUME = "full_resume"
+JOB_RESUME_ANALYSIS = "resume_analysis"
+
+# How often an event stream re-reads the job (changes in this process wake it at once;
+# this picks up changes made by another process sharing the SQLite store)
+JOB_EVENTS_POLL_SECONDS = 1.0
+# Comment line sent after this long without events, so proxies keep the stream open
+JOB_EVENTS_KEEPALIVE_SECONDS = 15.0
+
+
+async def run_full_resume_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    response = await resume.generate_full_resume(GenerateFullResumeRequest(**payload))
+    return response.model_dump()
+
+
+async def run_resume_analysis_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    response = await resume.analyze_resume(AnalyzeResumeRequest(**payload))
+    return response.model_dump()
+
+
+job_queue.register(JOB_FULL_RESUME, run_full_resume_job)
+job_queue.register(JOB_RESUME_ANALYSIS, run_resume_analysis_job)
+
+
+def build_job_status(job: Job) -> JobStatusResponse:
+    """API view of a job."""
+    return JobStatusResponse(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        result=job.result,
+        error=job.error
+    )
+
+
+async def submit_job(kind: str, payload: Dict[str, Any]) -> JobSubmittedResponse:
+    """Queue a job, or answer 503 with Retry-After when the queue is full."""
+    try:
+        job = await job_queue.submit(kind, payload)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(int(e.retry_after + 0.999))})
+    logger.info(f"Queued {kind} job {job.id}")
+    return JobSubmittedResponse(
+        job_id=job.id,
+        status=job.status,
+        status_url=f"/api/jobs/{job.id}",
+        events_url=f"/api/jobs/{job.id}/events"
+    )
+
+
+@router.post("/generate-full-resume/jobs", response_model=JobSubmittedResponse, status_code=202)
+async def submit_full_resume_job(request: GenerateFullResumeRequest):
+    """
+    Queue /api/generate-full-resume as a background job.
+
+    POST /api/generate-full-resume/jobs
+
+    Returns 202 with the job id right away; the result (the same
+    GenerateFullResumeResponse) is fetched from GET /api/jobs/{job_id} or
+    pushed by GET /api/jobs/{job_id}/events.
+    """
+    return await submit_job(JOB_FULL_RESUME, request.model_dump())
+
+
+@router.post("/analyze-resume/jobs", response_model=JobSubmittedResponse, status_code=202)
+async def submit_resume_analysis_job(request: AnalyzeResumeRequest):
+    """
+    Queue /api/analyze-resume as a background job.
+
+    POST /api/analyze-resume/jobs
+
+    Returns 202 with the job id right away; the result is the same
+    AnalyzeResumeResponse (see submit_full_resume_job).
+    """
+    return await submit_job(JOB_RESUME_ANALYSIS, request.model_dump())
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    """
+    State of a background job, with its result once it finished.
+
+    GET /api/jobs/{job_id}
+    """
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return build_job_status(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    Server-Sent Events for a background job.
+
+    GET /api/jobs/{job_id}/events
+
+    Sends the current state right away, then one event per change, named after
+    the job's status (queued, running, succeeded, failed) with the
+    JobStatusResponse as data. The stream ends after succeeded or failed.
+    """
+    if await job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_stream():
+        last_status = None
+        idle = 0.0
+        while True:
+            job = await job_queue.get(job_id)
+            if job is None:
+                yield format_sse_event("error", {"status": 404, "detail": "Job not found"})
+                return
+            if job.status != last_status:
+                last_status = job.status
+                idle = 0.0
+                yield format_sse_event(job.status, build_job_status(job).model_dump())
+            if job.finished:
+                return
+            if not await job_queue.wait_for_change(job_id, JOB_EVENTS_POLL_SECONDS):
+                idle += JOB_EVENTS_POLL_SECONDS
+                if idle >= JOB_EVENTS_KEEPALIVE_SECONDS:
+                    idle = 0.0
+                    yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,11 +1,16 @@
 """Resume optimization API routes."""
 
+import asyncio
+import json
 import logging
-from fastapi import APIRouter, HTTPException
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
 from app.models import (
     GeneratePointerChunksRequest,
     GeneratePointerChunksResponse,
     GenerateFullResumeRequest,
+    GenerateFullResumeBatchRequest,
     GenerateFullResumeResponse,
     AnalyzeResumeRequest,
     AnalyzeResumeResponse,
@@ -15,19 +20,141 @@ from app.models import (
     Education,
     ResumeItemContext
 )
+from app.config.settings import settings
+from app.database.repository import get_user_resume_data, get_resume_item_with_pointers, get_jobs_for_user
 from app.services.pointer_service import (
+    CandidateSection,
     generate_pointer_chunks_with_context,
-    get_user_resume_data,
-    get_resume_item_with_pointers,
-    generate_full_resume_with_single_call
+    stream_pointer_chunks_with_context,
+    generate_full_resume_with_single_call,
+    stream_full_resume_with_single_call
 )
 from app.services.feedback_service import analyze_resume_relevancy
+from app.services.rate_limiter import LLMOverloadedError
+from app.services.singleflight import coalesced, text_digest
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["resume"])
 
 
+def build_contact_info(user_info: Dict[str, Any]) -> ContactInfo:
+    """Build contact info (static data - directly from DB)."""
+    return ContactInfo(
+        name=user_info.get("name", ""),
+        email=user_info.get("email", ""),
+        phone=user_info.get("phone")
+    )
+
+
+def build_education_list(user_data: Dict[str, Any]) -> List[Education]:
+    """Build education list (static data - directly from DB)."""
+    return [
+        Education(
+            degree=edu.get("title", ""),
+            institution=edu.get("description", ""),
+            year=edu.get("end_date", "")[:4] if edu.get("end_date") else None
+        )
+        for edu in user_data.get("education", [])
+    ]
+
+
+def find_matching_item(resume_items: List[Dict[str, Any]], item_type: str, title: str) -> Optional[Dict[str, Any]]:
+    """Find the database item an AI-selected entry refers to (for date information)."""
+    for item in resume_items:
+        if item.get("item_type") == item_type and item.get("title") == title:
+            return item
+    return None
+
+
+def format_experience(exp: Dict[str, Any], resume_items: List[Dict[str, Any]]) -> Experience:
+    """Format an AI-selected experience for the frontend, with dates from the database."""
+    matching_item = find_matching_item(resume_items, "experience", exp.get("title"))
+    
+    # Format dates
+    start_date = ""
+    end_date = ""
+    if matching_item:
+        start_date = matching_item.get('start_date', '')[:7] if matching_item.get('start_date') else ''
+        end_date = matching_item.get('end_date', '')[:7] if matching_item.get('end_date') and not matching_item.get('is_current') else 'Present' if matching_item.get('is_current') else ''
+    
+    return Experience(
+        title=exp.get("title", ""),
+        company=exp.get("company", ""),
+        startDate=start_date,
+        endDate=end_date,
+        points=exp.get("points", [])[:4]  # Limit to 4 pointers
+    )
+
+
+def format_project(proj: Dict[str, Any], resume_items: List[Dict[str, Any]]) -> Project:
+    """Format an AI-selected project for the frontend, with its year from the database."""
+    matching_item = find_matching_item(resume_items, "project", proj.get("title"))
+    
+    # Format date
+    year = None
+    if matching_item:
+        end_date = matching_item.get('end_date', '')
+        start_date = matching_item.get('start_date', '')
+        year = end_date[:4] if end_date else start_date[:4] if start_date else None
+    
+    return Project(
+        title=proj.get("title", ""),
+        date=year,
+        points=proj.get("points", [])[:3]  # Limit to 3 pointers
+    )
+
+
+def build_full_resume_response(
+    ai_result: Dict[str, Any],
+    contact_info: ContactInfo,
+    education_list: List[Education],
+    resume_items: List[Dict[str, Any]]
+) -> GenerateFullResumeResponse:
+    """Combine the AI selection with the static data into the frontend response."""
+    return GenerateFullResumeResponse(
+        contactInfo=contact_info,
+        skills=ai_result.get("selected_skills", []),
+        experiences=[format_experience(exp, resume_items) for exp in ai_result.get("selected_experiences", [])[:2]],  # Limit to 2
+        projects=[format_project(proj, resume_items) for proj in ai_result.get("selected_projects", [])[:2]],  # Limit to 2
+        education=education_list
+    )
+
+
+def ai_error_status(error: Exception) -> int:
+    """HTTP status for a failed AI call: 402 for quota/billing problems, else 500."""
+    return 402 if "quota" in str(error).lower() or "billing" in str(error).lower() else 500
+
+
+def build_resume_item_context(resume_item: Dict[str, Any]) -> ResumeItemContext:
+    """Resume item details returned alongside generated pointers."""
+    return ResumeItemContext(
+        id=resume_item["id"],
+        title=resume_item.get("title", ""),
+        organization=resume_item.get("organization"),
+        item_type=resume_item.get("item_type", ""),
+        description=resume_item.get("description"),
+        location=resume_item.get("location"),
+        employment_type=resume_item.get("employment_type"),
+        start_date=resume_item.get("start_date"),
+        end_date=resume_item.get("end_date"),
+        is_current=resume_item.get("is_current", False)
+    )
+
+
+def format_sse_event(event: str, data: Any) -> str:
+    """Encode one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def format_ndjson_event(event: str, data: Any) -> str:
+    """Encode one event as a newline-delimited JSON line."""
+    return json.dumps({"event": event, "data": data}) + "\n"
+
+
 @router.post("/generate-pointer-chunks", response_model=GeneratePointerChunksResponse)
+@coalesced("pointer_chunks", key=lambda request: (
+    request.user_id, request.resume_item_id, text_digest(request.job_description), request.generation_mode, request.regenerate
+))
 async def generate_pointer_chunks(request: GeneratePointerChunksRequest):
     """
     Generate multiple bullet points for a resume item using database context.
@@ -40,8 +167,9 @@ async def generate_pointer_chunks(request: GeneratePointerChunksRequest):
     try:
         logger.info(f"Generating pointer chunks for resume item: {request.resume_item_id}")
         
-        # Get resume item details BEFORE generating
-        resume_item = get_resume_item_with_pointers(request.resume_item_id)
+        # Get resume item details BEFORE generating (the generation service then
+        # reads the same item from the request data context)
+        resume_item = await get_resume_item_with_pointers(request.resume_item_id)
         if not resume_item:
             raise HTTPException(status_code=404, detail="Resume item not found")
         
@@ -52,7 +180,9 @@ async def generate_pointer_chunks(request: GeneratePointerChunksRequest):
             resume_item_id=request.resume_item_id,
             user_id=request.user_id,
             job_description=request.job_description,
-            count=3
+            count=3,
+            mode=request.generation_mode,
+            bypass_cache=request.regenerate
         )
         
         # NOTE: Not saving to database - just returning for frontend to choose
@@ -61,29 +191,88 @@ async def generate_pointer_chunks(request: GeneratePointerChunksRequest):
         # Create verbose response
         # Note: total_pointers_count = existing because we're NOT saving these to DB
         return GeneratePointerChunksResponse(
-            resume_item=ResumeItemContext(
-                id=resume_item["id"],
-                title=resume_item.get("title", ""),
-                organization=resume_item.get("organization"),
-                item_type=resume_item.get("item_type", ""),
-                description=resume_item.get("description"),
-                location=resume_item.get("location"),
-                employment_type=resume_item.get("employment_type"),
-                start_date=resume_item.get("start_date"),
-                end_date=resume_item.get("end_date"),
-                is_current=resume_item.get("is_current", False)
-            ),
+            resume_item=build_resume_item_context(resume_item),
             generated_pointers=pointers,
             existing_pointers_count=existing_count,
             total_pointers_count=existing_count  # Same as existing since not saving
         )
         
+    except LLMOverloadedError:
+        raise
     except Exception as e:
         logger.error(f"Error in generate_pointer_chunks: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to generate pointer chunks: {str(e)}")
 
 
+@router.post("/generate-pointer-chunks/stream")
+async def generate_pointer_chunks_stream(request: GeneratePointerChunksRequest, accept: Optional[str] = Header(default=None)):
+    """
+    Streaming variant of /api/generate-pointer-chunks.
+    
+    POST /api/generate-pointer-chunks/stream
+    
+    Sends Server-Sent Events, or newline-delimited JSON objects
+    ({"event", "data"}) when the client sends `Accept: application/x-ndjson`.
+    Events, in order:
+    - resume_item: {"resume_item", "existing_pointers_count"}, before any AI call
+    - pointer: {"index", "content"} for each bullet as soon as it is generated
+    - done: the complete GeneratePointerChunksResponse
+    - error: {"status", "detail"} if generation fails mid-stream
+    """
+    try:
+        resume_item = await get_resume_item_with_pointers(request.resume_item_id)
+    except Exception as e:
+        logger.error(f"Error loading resume item for streaming: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to generate pointer chunks: {str(e)}")
+    
+    if not resume_item:
+        raise HTTPException(status_code=404, detail="Resume item not found")
+    
+    use_ndjson = accept is not None and "application/x-ndjson" in accept
+    format_event = format_ndjson_event if use_ndjson else format_sse_event
+    resume_item_context = build_resume_item_context(resume_item)
+    existing_count = len(resume_item.get("existing_pointers", []))
+    
+    async def event_stream():
+        yield format_event("resume_item", {
+            "resume_item": resume_item_context.model_dump(),
+            "existing_pointers_count": existing_count
+        })
+        
+        pointers = []
+        try:
+            async for pointer in stream_pointer_chunks_with_context(
+                resume_item_id=request.resume_item_id,
+                job_description=request.job_description,
+                count=3,
+                mode=request.generation_mode,
+                bypass_cache=request.regenerate
+            ):
+                yield format_event("pointer", {"index": len(pointers), "content": pointer})
+                pointers.append(pointer)
+            
+            response = GeneratePointerChunksResponse(
+                resume_item=resume_item_context,
+                generated_pointers=pointers,
+                existing_pointers_count=existing_count,
+                total_pointers_count=existing_count  # Not saved to DB, same as the blocking endpoint
+            )
+            yield format_event("done", response.model_dump())
+        except LLMOverloadedError as e:
+            yield format_event("error", {"status": 503, "detail": str(e), "retry_after": e.retry_after})
+        except Exception as e:
+            logger.error(f"Error in generate_pointer_chunks_stream: {e}")
+            yield format_event("error", {"status": 500, "detail": f"Failed to generate pointer chunks: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson" if use_ndjson else "text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/generate-full-resume", response_model=GenerateFullResumeResponse)
+@coalesced("full_resume", key=lambda request: (request.user_id, text_digest(request.job_description), request.regenerate))
 async def generate_full_resume(request: GenerateFullResumeRequest):
     """
     Full resume optimization with AI-powered selection (SINGLE AI CALL).
@@ -102,7 +291,7 @@ async def generate_full_resume(request: GenerateFullResumeRequest):
         logger.info("Starting full resume optimization with SINGLE AI call")
         
         # Get user's complete resume data from database
-        user_data = get_user_resume_data(request.user_id)
+        user_data = await get_user_resume_data(request.user_id)
         
         if not user_data or not user_data.get("resume_items"):
             raise HTTPException(status_code=404, detail="No resume data found for user")
@@ -114,22 +303,8 @@ async def generate_full_resume(request: GenerateFullResumeRequest):
         # (AI never sees or modifies these fields)
         # ============================================
         
-        # Build contact info (static data - directly from DB)
-        contact_info = ContactInfo(
-            name=user_info.get("name", ""),
-            email=user_info.get("email", ""),
-            phone=user_info.get("phone")
-        )
-        
-        # Build education list (static data - directly from DB)
-        education_list = [
-            Education(
-                degree=edu.get("title", ""),
-                institution=edu.get("description", ""),
-                year=edu.get("end_date", "")[:4] if edu.get("end_date") else None
-            )
-            for edu in user_data.get("education", [])
-        ]
+        contact_info = build_contact_info(user_info)
+        education_list = build_education_list(user_data)
         
         # ============================================
         # DYNAMIC DATA - AI optimizes based on job description
@@ -141,8 +316,11 @@ async def generate_full_resume(request: GenerateFullResumeRequest):
         try:
             ai_result = await generate_full_resume_with_single_call(
                 user_data=user_data,
-                job_description=request.job_description
+                job_description=request.job_description,
+                bypass_cache=request.regenerate
             )
+        except LLMOverloadedError:
+            raise
         except Exception as ai_error:
             logger.error(f"AI call failed: {ai_error}")
             # Check if it's a quota/billing error
@@ -157,9 +335,6 @@ async def generate_full_resume(request: GenerateFullResumeRequest):
             )
         
         # Parse AI result and format for frontend
-        experiences = []
-        projects = []
-        
         # Use AI-selected skills (NO fallback - empty is better than irrelevant)
         selected_skills = ai_result.get("selected_skills", [])
         if not selected_skills:
@@ -167,69 +342,172 @@ async def generate_full_resume(request: GenerateFullResumeRequest):
             # Return empty rather than all skills - better to show nothing than irrelevant skills
             selected_skills = []
         
-        # Map AI-selected experiences to database items for date information
-        resume_items_map = {item["id"]: item for item in user_data.get("resume_items", [])}
-        
-        for exp in ai_result.get("selected_experiences", [])[:2]:  # Limit to 2
-            # Try to find matching item in database for dates
-            matching_item = None
-            for item_id, item in resume_items_map.items():
-                if item.get("item_type") == "experience" and item.get("title") == exp.get("title"):
-                    matching_item = item
-                    break
-            
-            # Format dates
-            start_date = ""
-            end_date = ""
-            if matching_item:
-                start_date = matching_item.get('start_date', '')[:7] if matching_item.get('start_date') else ''
-                end_date = matching_item.get('end_date', '')[:7] if matching_item.get('end_date') and not matching_item.get('is_current') else 'Present' if matching_item.get('is_current') else ''
-            
-            experiences.append(Experience(
-                title=exp.get("title", ""),
-                company=exp.get("company", ""),
-                startDate=start_date,
-                endDate=end_date,
-                points=exp.get("points", [])[:4]  # Limit to 4 pointers
-            ))
-        
-        for proj in ai_result.get("selected_projects", [])[:2]:  # Limit to 2
-            # Try to find matching item in database for dates
-            matching_item = None
-            for item_id, item in resume_items_map.items():
-                if item.get("item_type") == "project" and item.get("title") == proj.get("title"):
-                    matching_item = item
-                    break
-            
-            # Format date
-            year = None
-            if matching_item:
-                end_date = matching_item.get('end_date', '')
-                start_date = matching_item.get('start_date', '')
-                year = end_date[:4] if end_date else start_date[:4] if start_date else None
-            
-            projects.append(Project(
-                title=proj.get("title", ""),
-                date=year,
-                points=proj.get("points", [])[:3]  # Limit to 3 pointers
-            ))
+        response = build_full_resume_response(
+            {**ai_result, "selected_skills": selected_skills}, contact_info, education_list, user_data.get("resume_items", [])
+        )
         
-        logger.info(f"Generated {len(selected_skills)} skills, {len(experiences)} experiences and {len(projects)} projects with SINGLE AI call")
+        logger.info(f"Generated {len(response.skills)} skills, {len(response.experiences)} experiences and {len(response.projects)} projects with SINGLE AI call")
         
-        return GenerateFullResumeResponse(
-            contactInfo=contact_info,
-            skills=selected_skills,
-            experiences=experiences,
-            projects=projects,
-            education=education_list
-        )
+        return response
         
+    except LLMOverloadedError:
+        raise
     except Exception as e:
         logger.error(f"Error in generate_full_resume: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to generate full resume: {str(e)}")
 
 
+@router.post("/generate-full-resume/stream")
+async def generate_full_resume_stream(request: GenerateFullResumeRequest):
+    """
+    Streaming variant of /api/generate-full-resume (Server-Sent Events).
+    
+    POST /api/generate-full-resume/stream
+    
+    Events, in order:
+    - contactInfo, education: static data, sent before the AI call starts
+    - skills: validated skill selection, before the AI call when picked locally, else as soon as the model has written it
+    - experience / project: one event per selected item as it completes
+    - done: the complete GenerateFullResumeResponse (authoritative)
+    - error: {"status", "detail"} if generation fails mid-stream
+    """
+    try:
+        user_data = await get_user_resume_data(request.user_id)
+    except Exception as e:
+        logger.error(f"Error loading resume data for streaming: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to generate full resume: {str(e)}")
+    
+    if not user_data or not user_data.get("resume_items"):
+        raise HTTPException(status_code=404, detail="No resume data found for user")
+    
+    contact_info = build_contact_info(user_data.get("user", {}))
+    education_list = build_education_list(user_data)
+    resume_items = user_data.get("resume_items", [])
+    
+    async def event_stream():
+        yield format_sse_event("contactInfo", contact_info.model_dump())
+        yield format_sse_event("education", [edu.model_dump() for edu in education_list])
+        
+        streamed_experiences = 0
+        streamed_projects = 0
+        try:
+            async for section, value in stream_full_resume_with_single_call(
+                user_data=user_data,
+                job_description=request.job_description,
+                bypass_cache=request.regenerate
+            ):
+                if section == "skills":
+                    yield format_sse_event("skills", value)
+                elif section == "experience" and streamed_experiences < 2:
+                    streamed_experiences += 1
+                    yield format_sse_event("experience", format_experience(value, resume_items).model_dump())
+                elif section == "project" and streamed_projects < 2:
+                    streamed_projects += 1
+                    yield format_sse_event("project", format_project(value, resume_items).model_dump())
+                elif section == "result":
+                    response = build_full_resume_response(value, contact_info, education_list, resume_items)
+                    yield format_sse_event("done", response.model_dump())
+        except LLMOverloadedError as e:
+            yield format_sse_event("error", {"status": 503, "detail": str(e), "retry_after": e.retry_after})
+        except Exception as e:
+            logger.error(f"Error in generate_full_resume_stream: {e}")
+            yield format_sse_event("error", {"status": ai_error_status(e), "detail": f"AI service error: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/generate-full-resume/batch")
+async def generate_full_resume_batch(request: GenerateFullResumeBatchRequest):
+    """
+    Tailor one profile to many jobs in one request (newline-delimited JSON).
+    
+    POST /api/generate-full-resume/batch
+    
+    The profile is loaded and the candidate section of the prompt is built
+    once for all jobs; up to BATCH_CONCURRENCY jobs are generated at a time.
+    One {"event", "data"} object per line:
+    - result: {"index", "job_id", "resume"} for each job as soon as it completes
+    - error: {"index", "job_id", "status", "detail"} for a failed job (the others continue)
+    - done: {"total", "succeeded", "failed"} after the last job
+    
+    `index` is the job's position in job_descriptions followed by job_ids;
+    `job_id` is null for jobs given as text.
+    """
+    jobs: List[Tuple[Optional[str], Optional[str]]] = [(None, text) for text in request.job_descriptions]
+    jobs += [(job_id, None) for job_id in request.job_ids]
+    if not jobs:
+        raise HTTPException(status_code=422, detail="Provide job_descriptions or job_ids")
+    if len(jobs) > settings.BATCH_MAX_JOBS:
+        raise HTTPException(status_code=422, detail=f"At most {settings.BATCH_MAX_JOBS} jobs per batch")
+    
+    try:
+        user_data = await get_user_resume_data(request.user_id)
+        saved_jobs = await get_jobs_for_user(request.user_id, request.job_ids)
+    except Exception as e:
+        logger.error(f"Error loading data for batch generation: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to generate full resumes: {str(e)}")
+    
+    if not user_data or not user_data.get("resume_items"):
+        raise HTTPException(status_code=404, detail="No resume data found for user")
+    
+    contact_info = build_contact_info(user_data.get("user", {}))
+    education_list = build_education_list(user_data)
+    resume_items = user_data.get("resume_items", [])
+    candidate = CandidateSection(user_data)
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+    
+    async def generate(index: int, job_id: Optional[str], job_description: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+        job = {"index": index, "job_id": job_id}
+        if job_id is not None:
+            job_description = saved_jobs.get(job_id, {}).get("description")
+            if not job_description:
+                return "error", {**job, "status": 404, "detail": "Job not found"}
+        
+        async with semaphore:
+            try:
+                ai_result = await generate_full_resume_with_single_call(
+                    user_data=user_data,
+                    job_description=job_description,
+                    bypass_cache=request.regenerate,
+                    candidate=candidate
+                )
+            except LLMOverloadedError as e:
+                return "error", {**job, "status": 503, "detail": str(e), "retry_after": e.retry_after}
+            except Exception as e:
+                logger.error(f"Batch job {index} failed: {e}")
+                return "error", {**job, "status": ai_error_status(e), "detail": f"AI service error: {str(e)}"}
+        
+        response = build_full_resume_response(ai_result, contact_info, education_list, resume_items)
+        return "result", {**job, "resume": response.model_dump()}
+    
+    async def event_stream():
+        tasks = [asyncio.ensure_future(generate(i, job_id, text)) for i, (job_id, text) in enumerate(jobs)]
+        succeeded = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                event, data = await next_done
+                succeeded += event == "result"
+                yield format_ndjson_event(event, data)
+            logger.info(f"Batch for user {request.user_id}: {succeeded}/{len(jobs)} resumes generated")
+            yield format_ndjson_event("done", {"total": len(jobs), "succeeded": succeeded, "failed": len(jobs) - succeeded})
+        finally:
+            # Client went away: stop the jobs still running
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/analyze-resume", response_model=AnalyzeResumeResponse)
+@coalesced("resume_analysis", key=lambda request: (request.user_id, text_digest(request.job_description), request.regenerate, request.mode))
 async def analyze_resume(request: AnalyzeResumeRequest):
     """
     Analyze resume relevancy to job description and provide feedback.
@@ -243,19 +521,26 @@ async def analyze_resume(request: AnalyzeResumeRequest):
     - Overall presentation
     
     Also provides strengths, weaknesses, and actionable suggestions.
+    
+    Scores are always computed locally. mode="fast" also builds the feedback
+    locally (milliseconds, no AI call); mode="full" has the AI write it.
     """
     try:
         logger.info(f"Analyzing resume for user {request.user_id}")
         
         analysis = await analyze_resume_relevancy(
             user_id=request.user_id,
-            job_description=request.job_description
+            job_description=request.job_description,
+            bypass_cache=request.regenerate,
+            mode=request.mode or settings.ANALYSIS_MODE
         )
         
         logger.info(f"Analysis complete: Score {analysis.get('score')}/100")
         
         return AnalyzeResumeResponse(**analysis)
         
+    except LLMOverloadedError:
+        raise
     except Exception as e:
         logger.error(f"Error in analyze_resume: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to analyze resume: {str(e)}")
@@ -0,0 +1,135 @@
+"""Near-duplicate filtering of generated bullet points.
+
+The bullet prompts ask for bullets that differ from the item's existing ones
+and from each other, but models still return near-copies ("Built payment APIs
+in FastAPI serving 2M users" / "Built payment APIs with FastAPI serving 2M+
+users"). Each bullet is normalized like a job description (see `jd_dedup`)
+and shingled into overlapping character n-grams; two bullets whose shingle
+sets overlap by at least BULLET_DEDUP_THRESHOLD of the smaller set are
+near-duplicates. The overlap coefficient (rather than Jaccard) also catches a
+copy with an extra clause appended.
+
+A request compares a handful of short bullets, so the shingle sets are
+compared exactly in microseconds; MinHash sketches (as used for job
+descriptions, which are long and compared against many stored ones) would
+cost more than they save here.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+from app.config.settings import settings
+from app.services.jd_dedup import NON_WORD_PATTERN, WHITESPACE_PATTERN
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 5
+
+# Why a bullet was rejected
+DUPLICATE_OF_EXISTING = "existing"
+DUPLICATE_OF_GENERATED = "generated"
+
+
+def normalize_bullet(text: str) -> str:
+    """Lowercase, drop punctuation other than tech symbols (+ # . /) and collapse whitespace."""
+    return WHITESPACE_PATTERN.sub(" ", NON_WORD_PATTERN.sub(" ", text.lower())).strip()
+
+
+def shingle_bullet(text: str, size: int = SHINGLE_SIZE) -> FrozenSet[str]:
+    """Overlapping character n-grams of a normalized bullet (the whole text when shorter)."""
+    normalized = normalize_bullet(text)
+    if len(normalized) <= size:
+        return frozenset([normalized]) if normalized else frozenset()
+    return frozenset(normalized[i:i + size] for i in range(len(normalized) - size + 1))
+
+
+def overlap_coefficient(shingles_a: FrozenSet[str], shingles_b: FrozenSet[str]) -> float:
+    """Shared shingles as a share of the smaller set (0 when either is empty)."""
+    if not shingles_a or not shingles_b:
+        return 0.0
+    return len(shingles_a & shingles_b) / min(len(shingles_a), len(shingles_b))
+
+
+class DuplicateRateMeter:
+    """Per agent: generated bullets checked, near-duplicates dropped, slots regenerated or left empty."""
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"checked": 0, "duplicates_of_existing": 0, "duplicates_of_generated": 0, "regenerated": 0, "unfilled": 0}
+        )
+
+    def record_check(self, agent_name: str, duplicate_of: Optional[str]) -> None:
+        """Count one checked bullet and, if it was dropped, what it duplicated."""
+        totals = self._totals[agent_name]
+        totals["checked"] += 1
+        if duplicate_of == DUPLICATE_OF_EXISTING:
+            totals["duplicates_of_existing"] += 1
+        elif duplicate_of == DUPLICATE_OF_GENERATED:
+            totals["duplicates_of_generated"] += 1
+
+    def record_regenerated(self, agent_name: str, slots: int) -> None:
+        self._totals[agent_name]["regenerated"] += slots
+
+    def record_unfilled(self, agent_name: str, slots: int) -> None:
+        self._totals[agent_name]["unfilled"] += slots
+
+    def reset(self) -> None:
+        """Forget all totals."""
+        self._totals.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per agent: counters and the share of checked bullets that were near-duplicates."""
+        return {
+            agent_name: {
+                **totals,
+                "duplicate_rate": round(
+                    (totals["duplicates_of_existing"] + totals["duplicates_of_generated"]) / totals["checked"], 3
+                ) if totals["checked"] else 0.0
+            }
+            for agent_name, totals in self._totals.items()
+        }
+
+
+# Global duplicate rate meter
+bullet_dedup_meter = DuplicateRateMeter()
+
+
+class BulletFilter:
+    """Accepts generated bullets that are not near-duplicates of the existing ones or of each other."""
+
+    def __init__(self, existing: Iterable[str], agent_name: str):
+        self.agent_name = agent_name
+        self.enabled = settings.BULLET_DEDUP_ENABLED
+        self.threshold = settings.BULLET_DEDUP_THRESHOLD
+        self._existing = [shingle_bullet(text) for text in existing if text and text.strip()] if self.enabled else []
+        self._accepted_shingles: List[FrozenSet[str]] = []
+        self.accepted: List[str] = []
+        self.rejected: List[str] = []
+
+    def duplicate_of(self, bullet: str) -> Optional[str]:
+        """What a bullet near-duplicates (DUPLICATE_OF_EXISTING / DUPLICATE_OF_GENERATED), or None."""
+        return self._duplicate_of(shingle_bullet(bullet))
+
+    def _duplicate_of(self, shingles: FrozenSet[str]) -> Optional[str]:
+        if any(overlap_coefficient(shingles, other) >= self.threshold for other in self._existing):
+            return DUPLICATE_OF_EXISTING
+        if any(overlap_coefficient(shingles, other) >= self.threshold for other in self._accepted_shingles):
+            return DUPLICATE_OF_GENERATED
+        return None
+
+    def accept(self, bullet: str) -> bool:
+        """Keep the bullet unless it is a near-duplicate (always kept when BULLET_DEDUP_ENABLED is off)."""
+        if not self.enabled:
+            self.accepted.append(bullet)
+            return True
+        shingles = shingle_bullet(bullet)
+        duplicate_of = self._duplicate_of(shingles)
+        bullet_dedup_meter.record_check(self.agent_name, duplicate_of)
+        if duplicate_of:
+            logger.info(f"{self.agent_name}: dropped near-duplicate of {duplicate_of} bullet: {bullet}")
+            self.rejected.append(bullet)
+            return False
+        self._accepted_shingles.append(shingles)
+        self.accepted.append(bullet)
+        return True
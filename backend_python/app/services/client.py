@@ -1,7 +1,33 @@
 """AI client service for creating and managing OpenAI agents."""
 
-from agents import set_default_openai_key, Agent, Runner, function_tool, WebSearchTool, ModelSettings
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Optional
+from agents import set_default_openai_client, Agent, Runner, function_tool, ModelSettings
+from openai import AsyncOpenAI, RateLimitError
+from openai.types.responses import ResponseTextDeltaEvent
 from app.config.settings import settings
+from app.services.llm_cache import llm_cache
+from app.services.model_routing import model_router
+from app.services.rate_limiter import LLMOverloadedError, llm_rate_limiter, estimate_tokens, retry_after_seconds
+from app.services.resilience import ModelHealth, llm_health, is_transient_error, backoff_delay
+from app.services.token_usage import token_usage
+
+logger = logging.getLogger(__name__)
+
+
+def create_openai_client(base_url: Optional[str] = None, api_key: Optional[str] = None) -> AsyncOpenAI:
+    """OpenAI client for the agents SDK, with the client's own retries turned off.
+    
+    By default the openai client retries 429s and 5xx twice inside a single
+    call, while the call holds its limiter slot and runs down
+    LLM_CALL_TIMEOUT, and without honouring the shared Retry-After pause.
+    Those attempts would multiply with LLM_RATE_LIMIT_RETRIES,
+    LLM_MAX_RETRIES and the route fallback, so AIClient is the only retry
+    layer: `_run_with_limits` for 429s and `_run_resilient` for the rest.
+    """
+    return AsyncOpenAI(api_key=api_key or settings.OPENAI_API_KEY, base_url=base_url, max_retries=0)
 
 
 class AIClient:
@@ -11,51 +37,304 @@ class AIClient:
         """Initialize AI client with OpenAI API key."""
         if not settings.OPENAI_API_KEY:
             raise RuntimeError("Missing OPENAI_API_KEY environment variable")
-        set_default_openai_key(settings.OPENAI_API_KEY)
+        set_default_openai_client(create_openai_client())
+        # Configured agents are immutable, so hot paths reuse them instead of rebuilding
+        self._agents: dict = {}
     
-    def create_agent(self, name: str, model: str = "gpt-4", tools: list = None, temperature: float = None) -> Agent:
-        """Create an AI agent with specified configuration.
+    def create_agent(self, name: str, model: str = "gpt-4", tools: list = None, temperature: float = None, output_type: type = None, max_tokens: int = None) -> Agent:
+        """Get a configured AI agent, reusing a cached instance when possible.
+        
+        Agents are cached by (name, model, temperature, max_tokens, tools,
+        output_type), so the name should identify the agent's role rather than
+        a single call.
         
         Args:
-            name: Agent name
+            name: Agent name (its role, e.g. "resume-analyzer")
             model: OpenAI model to use
-            tools: List of tools for the agent
+            tools: List of tools for the agent (none by default; pass e.g.
+                [WebSearchTool()] explicitly when the task needs it)
             temperature: Sampling temperature (0.0-2.0). Lower = more deterministic, less hallucination
+            output_type: Optional Pydantic model; the model's reply is schema-enforced and parsed into it
+            max_tokens: Optional cap on output tokens
             
         Returns:
             Configured Agent instance
         """
         if tools is None:
-            tools = [WebSearchTool()]
+            tools = []
         
-        # Build model settings with temperature if specified
+        cache_key = (name, model, temperature, max_tokens, tuple(repr(tool) for tool in tools), output_type)
+        agent = self._agents.get(cache_key)
+        if agent is None:
+            agent = self._build_agent(name, model, tools, temperature, output_type, max_tokens)
+            self._agents[cache_key] = agent
+        return agent
+    
+    def agent_for_task(self, name: str, task: str, output_type: type = None, fallback: bool = False) -> Optional[Agent]:
+        """Get the agent configured by the routing table for a task.
+        
+        Args:
+            name: Agent name (its role)
+            task: Task name (see `app.services.model_routing`)
+            output_type: Optional Pydantic model for schema-enforced output
+            fallback: Use the route's fallback model instead of its primary
+            
+        Returns:
+            Configured Agent instance (None when a fallback is asked for but the route has none)
+        """
+        route = model_router.route(task)
+        model = route.fallback if fallback else route.primary
+        if not model:
+            return None
+        return self.create_agent(
+            name=name,
+            model=model,
+            tools=[],
+            temperature=route.temperature,
+            output_type=output_type,
+            max_tokens=route.max_tokens
+        )
+    
+    def _build_agent(self, name: str, model: str, tools: list, temperature: float, output_type: type, max_tokens: int = None) -> Agent:
+        """Construct a new Agent (see `create_agent`)."""
+        # Build model settings with temperature / output cap if specified
         model_settings = None
-        if temperature is not None:
-            model_settings = ModelSettings(temperature=temperature)
+        if temperature is not None or max_tokens is not None:
+            model_settings = ModelSettings(temperature=temperature, max_tokens=max_tokens)
         
         agent_kwargs = {
             "name": name,
             "model": model,
-            "tools": tools
+            "tools": list(tools)
         }
         
-        # Add model_settings if temperature was specified
+        # Add model_settings if temperature or max_tokens was specified
         if model_settings is not None:
             agent_kwargs["model_settings"] = model_settings
+        
+        # Add structured output schema if specified
+        if output_type is not None:
+            agent_kwargs["output_type"] = output_type
             
         return Agent(**agent_kwargs)
     
-    async def run_agent(self, agent: Agent, prompt: str) -> dict:
+    async def run_agent(self, agent: Agent, prompt: str, cache_namespace: Optional[str] = None, bypass_cache: bool = False) -> dict:
         """Run an agent with a given prompt.
         
+        Each model call is bounded by LLM_CALL_TIMEOUT; timeouts, connection
+        errors and 5xx responses are retried with jittered backoff, and calls in
+        LLM_HEDGE_NAMESPACES are hedged (see `app.services.resilience`).
+        
         Args:
             agent: Agent instance to run
             prompt: Input prompt for the agent
+            cache_namespace: Endpoint name for the response cache; the response is
+                cached only if this namespace is listed in LLM_CACHE_NAMESPACES
+            bypass_cache: Skip the cache lookup (intentional regeneration); the
+                fresh response still replaces the cached one
+            
+        Returns:
+            Agent execution result (a CachedRunResult on a cache hit)
+        """
+        use_cache = llm_cache.is_enabled_for(cache_namespace)
+        if use_cache:
+            if bypass_cache:
+                llm_cache.record_bypass(cache_namespace)
+            else:
+                cached = await llm_cache.get(cache_namespace, agent, prompt)
+                if cached is not None:
+                    return cached
+        
+        hedge = cache_namespace is not None and cache_namespace in settings.LLM_HEDGE_NAMESPACES
+        result = await self._run_resilient(agent, prompt, hedge)
+        
+        if use_cache and result.final_output:
+            await llm_cache.set(cache_namespace, agent, prompt, result.final_output)
+        
+        return result
+    
+    async def run_task(self, task: str, name: str, prompt: str, output_type: type = None, cache_namespace: Optional[str] = None, bypass_cache: bool = False):
+        """Run a prompt on the model the routing table assigns to a task.
+        
+        When the primary model is overloaded (queue full, circuit open) or still
+        failing after its retries, the call is repeated once on the route's
+        fallback model.
+        
+        Args:
+            task: Task name (see `app.services.model_routing`)
+            name: Agent name (its role)
+            prompt: Input prompt for the agent
+            output_type: Optional Pydantic model for schema-enforced output
+            cache_namespace: Endpoint name for the response cache (see `run_agent`)
+            bypass_cache: Skip the cache lookup (intentional regeneration)
             
         Returns:
             Agent execution result
         """
-        return await Runner.run(agent, prompt)
+        agent = self.agent_for_task(name, task, output_type)
+        try:
+            return await self.run_agent(agent, prompt, cache_namespace=cache_namespace, bypass_cache=bypass_cache)
+        except Exception as e:
+            if not isinstance(e, LLMOverloadedError) and not is_transient_error(e):
+                raise
+            fallback = self.agent_for_task(name, task, output_type, fallback=True)
+            if fallback is None or fallback.model == agent.model:
+                raise
+            logger.warning(f"{task}: {agent.model} unavailable ({type(e).__name__}), falling back to {fallback.model}")
+            return await self.run_agent(fallback, prompt, cache_namespace=cache_namespace, bypass_cache=bypass_cache)
+    
+    async def stream_agent_text(self, agent: Agent, prompt: str, cache_namespace: Optional[str] = None, bypass_cache: bool = False) -> AsyncIterator[str]:
+        """Run an agent with the streaming runner and yield its output text as it arrives.
+        
+        Uses the same response cache as `run_agent`: a hit yields the whole cached
+        text as a single chunk, and a completed stream is stored in the cache.
+        
+        Args:
+            agent: Agent instance to run (plain text output)
+            prompt: Input prompt for the agent
+            cache_namespace: Endpoint name for the response cache (see `run_agent`)
+            bypass_cache: Skip the cache lookup (intentional regeneration)
+            
+        Yields:
+            Text deltas of the model's reply
+        """
+        use_cache = llm_cache.is_enabled_for(cache_namespace)
+        if use_cache:
+            if bypass_cache:
+                llm_cache.record_bypass(cache_namespace)
+            else:
+                cached = await llm_cache.get(cache_namespace, agent, prompt)
+                if cached is not None:
+                    yield str(cached.final_output)
+                    return
+        
+        limiter = llm_rate_limiter.for_model(str(agent.model))
+        breaker = llm_health.for_model(str(agent.model)).breaker
+        async with limiter.reserve(self._estimate_call_tokens(agent, prompt)) as reservation:
+            breaker.before_call()
+            result = Runner.run_streamed(agent, prompt)
+            try:
+                async for event in result.stream_events():
+                    if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                        yield event.data.delta
+            except RateLimitError as e:
+                breaker.release_probe()
+                limiter.pause(retry_after_seconds(e) or 1.0)
+                raise
+            except Exception as e:
+                if is_transient_error(e):
+                    breaker.record_failure()
+                else:
+                    breaker.release_probe()
+                raise
+            finally:
+                # The consumer stopped early (e.g. the client disconnected)
+                if not result.is_complete:
+                    breaker.release_probe()
+                    result.cancel()
+            breaker.record_success()
+            reservation.settle(result.context_wrapper.usage.total_tokens)
+            token_usage.record(agent.name, str(agent.model), result.context_wrapper.usage)
+        
+        if use_cache and result.final_output:
+            await llm_cache.set(cache_namespace, agent, prompt, result.final_output)
+    
+    def _estimate_call_tokens(self, agent: Agent, prompt: str) -> int:
+        """Tokens to reserve for a call before its real usage is known."""
+        instructions = agent.instructions if isinstance(agent.instructions, str) else ""
+        max_output_tokens = agent.model_settings.max_tokens or settings.LLM_ESTIMATED_OUTPUT_TOKENS
+        return estimate_tokens(instructions + prompt) + max_output_tokens
+    
+    async def _run_resilient(self, agent: Agent, prompt: str, hedge: bool = False):
+        """Run the agent, retrying transient failures through the model's circuit breaker.
+        
+        Each attempt that fails with a timeout, connection error or 5xx counts
+        against the circuit and is retried after a full-jitter backoff, up to
+        LLM_MAX_RETRIES times. Other errors are raised immediately. The openai
+        client itself does not retry (see `create_openai_client`), so this is
+        the only retry layer for these errors.
+        """
+        health = llm_health.for_model(str(agent.model))
+        for attempt in range(settings.LLM_MAX_RETRIES + 1):
+            health.breaker.before_call()
+            try:
+                if hedge:
+                    result = await self._run_hedged(agent, prompt, health)
+                else:
+                    result = await self._run_with_limits(agent, prompt, health)
+            except asyncio.CancelledError:
+                health.breaker.release_probe()
+                raise
+            except Exception as e:
+                if not is_transient_error(e):
+                    health.breaker.release_probe()
+                    raise
+                health.breaker.record_failure()
+                if attempt == settings.LLM_MAX_RETRIES:
+                    raise
+                delay = backoff_delay(attempt, settings.LLM_RETRY_BASE_DELAY, settings.LLM_RETRY_MAX_DELAY)
+                health.retries += 1
+                logger.warning(f"LLM call to {agent.model} failed ({type(e).__name__}), retry {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            health.breaker.record_success()
+            return result
+    
+    async def _run_hedged(self, agent: Agent, prompt: str, health: ModelHealth):
+        """Start a second call when the first outlasts the model's hedge delay; return the first success."""
+        delay = health.hedge_delay()
+        primary = asyncio.create_task(self._run_with_limits(agent, prompt, health))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                health.hedges += 1
+                logger.info(f"Hedging LLM call to {agent.model} after {delay:.2f}s")
+                pending.add(asyncio.create_task(self._run_with_limits(agent, prompt, health)))
+            error = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            health.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # The slower call is no longer needed
+            for task in pending:
+                task.cancel()
+    
+    async def _run_with_limits(self, agent: Agent, prompt: str, health: ModelHealth):
+        """Run the agent once through the process-wide limiter of its model.
+        
+        The model call itself (not the wait for a slot) is bounded by
+        LLM_CALL_TIMEOUT. On a 429 the model is paused for the server's
+        Retry-After (1s, 2s, ... when absent) and the call is queued again, up
+        to LLM_RATE_LIMIT_RETRIES times.
+        """
+        limiter = llm_rate_limiter.for_model(str(agent.model))
+        estimated_tokens = self._estimate_call_tokens(agent, prompt)
+        for attempt in range(settings.LLM_RATE_LIMIT_RETRIES + 1):
+            async with limiter.reserve(estimated_tokens) as reservation:
+                started = time.monotonic()
+                try:
+                    result = await asyncio.wait_for(Runner.run(agent, prompt), timeout=settings.LLM_CALL_TIMEOUT)
+                except RateLimitError as e:
+                    limiter.pause(retry_after_seconds(e) or float(2 ** attempt))
+                    if attempt == settings.LLM_RATE_LIMIT_RETRIES:
+                        raise
+                    continue
+                except asyncio.TimeoutError:
+                    health.timeouts += 1
+                    logger.error(f"LLM call to {agent.model} timed out after {settings.LLM_CALL_TIMEOUT}s")
+                    raise
+                health.latencies.record(time.monotonic() - started)
+                reservation.settle(result.context_wrapper.usage.total_tokens)
+                token_usage.record(agent.name, str(agent.model), result.context_wrapper.usage)
+                return result
 
 
 # Global AI client instance
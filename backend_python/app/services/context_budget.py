@@ -0,0 +1,146 @@
+"""Token budgets for the candidate context sent with a prompt.
+
+Long profiles (many experiences, dozens of bullets) can push prompts past
+10K tokens, most of it irrelevant to the job. Before prompting, context is
+ranked by relevance to the job description and compacted to a budget:
+
+- bullet lists keep their most relevant bullets (original order preserved),
+- resume items are kept in full while the budget allows, then condensed to
+  their title/organization, then dropped,
+- single entries longer than `CONTEXT_MAX_ENTRY_TOKENS` are truncated.
+
+Relevance is the entry's BM25 score against the job description, over the
+entries being ranked (see `app.services.relevance`). Token counts are
+estimates (see `rate_limiter.estimate_tokens`).
+"""
+
+import logging
+from typing import Any, Dict, List
+
+from app.config.settings import settings
+from app.services.rate_limiter import estimate_tokens
+from app.services.relevance import BM25Index
+
+logger = logging.getLogger(__name__)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut a text to about `max_tokens` tokens at a word boundary."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    cut = text[:max_tokens * 4].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:") + "…"
+
+
+class ContextBudgeter:
+    """Compacts prompt context to token budgets and counts the tokens saved."""
+
+    def __init__(self):
+        self.calls = 0
+        self.compacted_calls = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    def fit_entries(self, entries: List[str], job_description: str, budget_tokens: int, label: str) -> List[str]:
+        """Keep the entries most relevant to the JD that fit in the budget, in their original order.
+
+        Args:
+            entries: Context entries (e.g. bullet points)
+            job_description: Target job description
+            budget_tokens: Max estimated tokens for all kept entries
+            label: Name used in the savings log
+
+        Returns:
+            Kept (possibly truncated) entries
+        """
+        if not settings.CONTEXT_BUDGET_ENABLED or not entries:
+            return entries
+
+        truncated = [truncate_to_tokens(entry, settings.CONTEXT_MAX_ENTRY_TOKENS) for entry in entries]
+        costs = [estimate_tokens(entry) for entry in truncated]
+        before = sum(estimate_tokens(entry) for entry in entries)
+        if sum(costs) <= budget_tokens:
+            self._record(label, before, sum(costs), dropped=0, condensed=0)
+            return truncated
+
+        scores = BM25Index(entries).scores(job_description)
+        ranked = sorted(range(len(entries)), key=lambda i: scores[i], reverse=True)
+        kept, used = set(), 0
+        for i in ranked:
+            if used + costs[i] <= budget_tokens or not kept:
+                kept.add(i)
+                used += costs[i]
+        self._record(label, before, used, dropped=len(entries) - len(kept), condensed=0)
+        return [truncated[i] for i in sorted(kept)]
+
+    def fit_resume_items(self, items: List[Dict[str, Any]], job_description: str, budget_tokens: int, label: str) -> List[Dict[str, Any]]:
+        """Keep the resume items most relevant to the JD within the budget, in their original order.
+
+        The most relevant items keep their (truncated) description; once the
+        budget runs low, items are condensed to title/organization (empty
+        description), and the rest are dropped. Returned items are copies.
+
+        Args:
+            items: Resume items (title, organization, description, ...)
+            job_description: Target job description
+            budget_tokens: Max estimated tokens for the items' rendered text
+            label: Name used in the savings log
+
+        Returns:
+            Kept items
+        """
+        if not settings.CONTEXT_BUDGET_ENABLED or not items:
+            return items
+
+        def header(item: Dict[str, Any]) -> str:
+            return f"{item.get('title', '')} {item.get('organization', '')}"
+
+        descriptions = [truncate_to_tokens(item.get("description") or "", settings.CONTEXT_MAX_ENTRY_TOKENS) for item in items]
+        short_costs = [estimate_tokens(header(item)) for item in items]
+        full_costs = [short + estimate_tokens(description) for short, description in zip(short_costs, descriptions)]
+        before = sum(estimate_tokens(f"{header(item)} {item.get('description') or ''}") for item in items)
+
+        scores = BM25Index([f"{header(item)} {item.get('description') or ''}" for item in items]).scores(job_description)
+        ranked = sorted(range(len(items)), key=lambda i: scores[i], reverse=True)
+        full, condensed, used = set(), set(), 0
+        for i in ranked:
+            if used + full_costs[i] <= budget_tokens or not full:
+                full.add(i)
+                used += full_costs[i]
+            elif used + short_costs[i] <= budget_tokens:
+                condensed.add(i)
+                used += short_costs[i]
+
+        kept = []
+        for i, item in enumerate(items):
+            if i in full:
+                kept.append({**item, "description": descriptions[i]})
+            elif i in condensed:
+                kept.append({**item, "description": ""})
+        self._record(label, before, used, dropped=len(items) - len(kept), condensed=len(condensed))
+        return kept
+
+    def _record(self, label: str, before: int, after: int, dropped: int, condensed: int) -> None:
+        self.calls += 1
+        self.tokens_before += before
+        self.tokens_after += after
+        if after < before:
+            self.compacted_calls += 1
+            logger.info(
+                f"{label}: context compacted from ~{before} to ~{after} tokens "
+                f"({before - after} saved, {condensed} condensed, {dropped} dropped)"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Calls, compacted calls and estimated tokens saved."""
+        return {
+            "calls": self.calls,
+            "compacted_calls": self.compacted_calls,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "tokens_saved": self.tokens_before - self.tokens_after
+        }
+
+
+# Global context budgeter
+context_budgeter = ContextBudgeter()
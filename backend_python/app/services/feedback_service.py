@@ -1,34 +1,97 @@
-"""Feedback service for analyzing resume relevancy to job descriptions."""
+"""Feedback service for analyzing resume relevancy to job descriptions.
 
+Scores are computed locally (`app.services.resume_scoring`); the model, when
+used, only writes the strengths, weaknesses and suggestions.
+"""
+
+import json
 import logging
-from typing import Dict, Any
+import re
+from typing import Any, Dict, List, Optional
+from app.config.settings import settings
 from app.services.client import ai_client
-from app.services.pointer_service import get_user_resume_data
+from app.services.context_budget import context_budgeter
+from app.services.jd_dedup import jd_result_store
+from app.services.model_routing import TASK_ANALYSIS
+from app.services.prompt_templates import RESUME_ANALYSIS_PROMPT
+from app.services.rate_limiter import LLMOverloadedError
+from app.services.resume_scoring import ResumeScores, build_feedback, score_resume
+from app.database.repository import compute_profile_version, get_user_resume_data
 
 logger = logging.getLogger(__name__)
 
+FEEDBACK_KEYS = ("strengths", "weaknesses", "suggestions")
+
+
+def format_scoring_findings(scores: ResumeScores) -> str:
+    """The computed scores and findings, for the model to explain."""
+    categories = scores.category_scores
+    return f"""COMPUTED SCORES: {scores.score}/100 (skills match {categories['skills_match']}/40, experience relevance {categories['experience_relevance']}/30, bullet quality {categories['bullet_quality']}/20, presentation {categories['presentation']}/10)
+Job skills the candidate has: {', '.join(scores.matched_skills) or 'none'}
+Job skills the candidate lacks: {', '.join(scores.missing_skills) or 'none'}
+Job terms missing from the most relevant experience: {', '.join(scores.missing_terms[:10]) or 'none'}
+Bullets with metrics: {scores.bullets_with_metrics}/{scores.bullets}, starting with an action verb: {scores.bullets_with_action_verbs}/{scores.bullets}"""
 
-async def analyze_resume_relevancy(user_id: str, job_description: str) -> Dict[str, Any]:
+
+def parse_feedback(output: str) -> Optional[Dict[str, List[str]]]:
+    """Strengths, weaknesses and suggestions from the model output, or None if it is not usable JSON."""
+    json_match = re.search(r'\{.*\}', output, re.DOTALL)
+    if not json_match:
+        return None
+    try:
+        parsed = json.loads(json_match.group())
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(parsed, dict) or not all(isinstance(parsed.get(key), list) for key in FEEDBACK_KEYS):
+        return None
+    return {key: [str(entry) for entry in parsed[key]] for key in FEEDBACK_KEYS}
+
+
+async def analyze_resume_relevancy(
+    user_id: str, job_description: str, bypass_cache: bool = False, mode: str = "full"
+) -> Dict[str, Any]:
     """
     Analyze how well a resume matches a job description.
     
     Args:
         user_id: User ID
         job_description: Target job description
+        bypass_cache: Skip the LLM response cache (intentional re-analysis)
+        mode: "fast" = local scores and rule-based feedback (no AI call),
+              "full" = local scores and AI-written feedback
         
     Returns:
         Dictionary with score (0-100), feedback, and improvement suggestions
     """
     try:
         # Get user's complete resume data
-        user_data = get_user_resume_data(user_id)
+        user_data = await get_user_resume_data(user_id)
         
         if not user_data or not user_data.get("resume_items"):
             raise Exception("No resume data found for user")
         
+        # Scores are always local and deterministic
+        scores = score_resume(user_data, job_description)
+        analysis = {"score": scores.score, "category_scores": scores.category_scores}
+        if mode == "fast":
+            return {**analysis, **build_feedback(scores)}
+        
+        # Reuse the feedback written for a near-duplicate JD for the same profile version
+        reuse_enabled = settings.JD_DEDUP_ENABLED
+        if reuse_enabled:
+            profile_version = compute_profile_version(user_data)
+            jd_signature = jd_result_store.signature(job_description)
+            if not bypass_cache:
+                reused = jd_result_store.lookup("resume_analysis", user_id, profile_version, jd_signature)
+                if reused is not None:
+                    return {**analysis, **reused}
+        
         user_info = user_data.get("user", {})
-        resume_items = user_data.get("resume_items", [])
         skills = user_data.get("skills", [])
+        # Keep the items most relevant to the JD within budget (lower-ranked ones condensed or dropped)
+        resume_items = context_budgeter.fit_resume_items(
+            user_data.get("resume_items", []), job_description, settings.CONTEXT_BUDGET_RESUME_ITEMS_TOKENS, "resume analysis"
+        )
         
         # Build resume summary
         experiences = [item for item in resume_items if item.get("item_type") == "experience"]
@@ -46,25 +109,19 @@ async def analyze_resume_relevancy(user_id: str, job_description: str) -> Dict[s
         
         skills_text = ", ".join([skill.get("name", "") for skill in skills])
         
-        # Get all existing pointers
-        all_pointers = []
-        for item in resume_items:
-            # Query pointers for this item
-            from app.database.supabase import get_supabase_client
-            supabase = get_supabase_client()
-            pointers_result = supabase.table("resume_item_points").select("content").eq("resume_item_id", item["id"]).execute()
-            pointers = [p["content"] for p in pointers_result.data] if pointers_result.data else []
-            all_pointers.extend(pointers)
+        # Get the most JD-relevant existing pointers within budget (already loaded with the resume items)
+        all_pointers = context_budgeter.fit_entries(
+            [p["content"] for item in resume_items for p in item.get("existing_pointers", [])],
+            job_description,
+            settings.CONTEXT_BUDGET_ANALYSIS_BULLETS_TOKENS,
+            "resume analysis bullets"
+        )
         
         pointers_text = "\n".join([f"• {p}" for p in all_pointers]) if all_pointers else "No bullet points yet"
         
-        # AI prompt for analysis
-        prompt = f"""Analyze how well this resume matches the job description. Give a score out of 100 and detailed feedback.
-
-JOB DESCRIPTION:
-{job_description}
-
-CANDIDATE'S RESUME:
+        # AI prompt for analysis (static instructions first, the JD last)
+        prompt = RESUME_ANALYSIS_PROMPT.render(
+            f"""CANDIDATE'S RESUME:
 
 Skills: {skills_text}
 
@@ -75,82 +132,30 @@ Projects:
 {projects_text}
 
 Current Bullet Points:
-{pointers_text}
-
-YOUR TASK:
-1. Give a relevancy score (0-100) based on:
-   - Skills match (40 points)
-   - Experience relevance (30 points)
-   - Bullet point quality (20 points)
-   - Overall presentation (10 points)
-
-2. Provide specific feedback on:
-   - What's strong (relevant skills, good experience matches)
-   - What's missing (skills/experience the job needs)
-   - Bullet point quality (are they specific? do they have metrics?)
-
-3. Give 2-3 actionable improvement suggestions
-
-Return ONLY valid JSON:
-{{
-  "score": 75,
-  "category_scores": {{
-    "skills_match": 35,
-    "experience_relevance": 25,
-    "bullet_quality": 15,
-    "presentation": 10
-  }},
-  "strengths": [
-    "Strong Python and FastAPI experience matches job requirements",
-    "Good metrics in some bullet points"
-  ],
-  "weaknesses": [
-    "Missing AWS experience mentioned in job description",
-    "Some bullet points lack specific metrics"
-  ],
-  "suggestions": [
-    "Add AWS cloud experience to skills and highlight in projects",
-    "Add metrics to all bullet points (users served, time saved, etc.)",
-    "Focus more on backend/API development experience"
-  ]
-}}"""
-        
-        # Create AI agent for analysis
-        agent = ai_client.create_agent(
-            name="resume-analyzer",
-            model="gpt-4",
-            tools=[],
-            temperature=0.3  # Low temp for consistent scoring
+{pointers_text}""",
+            job_description,
+            f"{format_scoring_findings(scores)}\n\nReturn ONLY valid JSON in the format above:"
         )
         
-        result = await ai_client.run_agent(agent, prompt)
+        # Run the analysis on the model the routing table assigns
+        result = await ai_client.run_task(
+            TASK_ANALYSIS, "resume-analyzer", prompt, cache_namespace="resume_analysis", bypass_cache=bypass_cache
+        )
         output = str(result.final_output) if result.final_output else '{}'
         
         logger.info(f"Resume analysis result: {output[:200]}...")
         
-        # Parse JSON response
-        import json
-        import re
-        
-        json_match = re.search(r'\{.*\}', output, re.DOTALL)
-        if json_match:
-            analysis = json.loads(json_match.group())
-            return analysis
-        else:
-            logger.error("Failed to parse analysis JSON")
-            return {
-                "score": 0,
-                "category_scores": {
-                    "skills_match": 0,
-                    "experience_relevance": 0,
-                    "bullet_quality": 0,
-                    "presentation": 0
-                },
-                "strengths": [],
-                "weaknesses": ["Failed to analyze resume"],
-                "suggestions": ["Please try again"]
-            }
-        
+        feedback = parse_feedback(output)
+        if feedback is None:
+            # Keep the computed scores; fall back to the rule-based feedback
+            logger.error("Failed to parse analysis JSON, using rule-based feedback")
+            return {**analysis, **build_feedback(scores)}
+        if reuse_enabled:
+            jd_result_store.remember("resume_analysis", user_id, profile_version, jd_signature, feedback)
+        return {**analysis, **feedback}
+        
+    except LLMOverloadedError:
+        raise
     except Exception as e:
         logger.error(f"Error analyzing resume relevancy: {e}")
         raise Exception(f"Failed to analyze resume: {str(e)}")
@@ -0,0 +1,183 @@
+"""Near-duplicate job description detection and result reuse.
+
+The same posting copied from different job boards differs in whitespace,
+tracking footers, HTML leftovers and bullet ordering, so an exact prompt hash
+misses it. Here each job description is normalized, split into lines, shingled
+into overlapping word n-grams (within each line, so reordering lines does not
+matter) and summarized as a MinHash signature. Two signatures agreeing on a
+fraction `JD_DEDUP_SIMILARITY_THRESHOLD` of positions are treated as the same
+posting.
+
+Results are only reused for the same endpoint, user and profile version.
+"""
+
+import copy
+import hashlib
+import html
+import logging
+import random
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Lines that are job-board boilerplate rather than part of the posting
+BOILERPLATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r"^(apply|applying)\b.*\b(now|here|today|via|on|at)\b",
+        r"\b(posted|reposted|updated)\s+\d+\s+(minute|hour|day|week|month)s?\s+ago\b",
+        r"\b(job|req(uisition)?|reference|ref)\s*(id|#|no\.?|number)\s*[:#]?\s*[\w-]+",
+        r"\b(share|save|report)\s+this\s+job\b",
+        r"\bequal\s+opportunity\s+employer\b",
+        r"\b(seen|found|via)\s+(on\s+)?(linkedin|indeed|glassdoor|monster|ziprecruiter|jobstreet|wellfound)\b",
+        r"\b\d+\s+(applicants|people clicked apply)\b",
+        r"\butm_[a-z]+=",
+    )
+]
+URL_PATTERN = re.compile(r"(https?://|www\.)\S+", re.IGNORECASE)
+EMAIL_PATTERN = re.compile(r"\S+@\S+\.\S+")
+HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+NON_WORD_PATTERN = re.compile(r"[^a-z0-9+#./ ]+")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Large Mersenne prime for the universal hash family h(x) = (a * x + b) mod P
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize_job_description(text: str) -> List[str]:
+    """Normalize a job description into a list of content lines.
+
+    Strips HTML, URLs, emails and job-board boilerplate lines, lowercases,
+    removes punctuation/bullet glyphs and collapses whitespace. Empty lines
+    are dropped.
+    """
+    text = html.unescape(HTML_TAG_PATTERN.sub("\n", text or ""))
+    lines = []
+    for raw_line in re.split(r"[\r\n]+|(?<=[.!?;])\s+", text):
+        if any(pattern.search(raw_line) for pattern in BOILERPLATE_PATTERNS):
+            continue
+        line = EMAIL_PATTERN.sub(" ", URL_PATTERN.sub(" ", raw_line.lower()))
+        line = WHITESPACE_PATTERN.sub(" ", NON_WORD_PATTERN.sub(" ", line)).strip(" ./")
+        if line:
+            lines.append(line)
+    return lines
+
+
+def shingle_job_description(text: str, size: int = 3) -> set:
+    """Word n-gram shingles of the normalized job description (per line)."""
+    shingles = set()
+    for line in normalize_job_description(text):
+        words = line.split()
+        if len(words) < size:
+            shingles.add(" ".join(words))
+            continue
+        for i in range(len(words) - size + 1):
+            shingles.add(" ".join(words[i:i + size]))
+    return shingles
+
+
+class MinHasher:
+    """MinHash signatures over string shingles."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingles: set) -> Tuple[int, ...]:
+        """MinHash signature of a shingle set (all-max for an empty set)."""
+        if not shingles:
+            return tuple([_MERSENNE_PRIME] * self.num_perm)
+        hashed = [
+            int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+            for shingle in shingles
+        ]
+        return tuple(
+            min((a * x + b) % _MERSENNE_PRIME for x in hashed)
+            for a, b in self._params
+        )
+
+    @staticmethod
+    def similarity(signature_a: Tuple[int, ...], signature_b: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of the underlying shingle sets."""
+        matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+        return matches / len(signature_a)
+
+
+class NearDuplicateResultStore:
+    """Stores results per (namespace, user, profile version) with their JD signature."""
+
+    def __init__(self, num_perm: int, threshold: float, ttl_seconds: float, max_entries: int):
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # (namespace, user_id, profile_version) -> [(signature, expires_at, result)]
+        self._scopes: "OrderedDict[Tuple[str, str, str], List[Tuple[Tuple[int, ...], float, Any]]]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def signature(self, job_description: str) -> Tuple[int, ...]:
+        """MinHash signature of a job description."""
+        return self.hasher.signature(shingle_job_description(job_description))
+
+    def lookup(self, namespace: str, user_id: str, profile_version: str, signature: Tuple[int, ...]) -> Optional[Any]:
+        """Return a copy of a stored result whose JD signature is a near-duplicate, if any."""
+        scope = (namespace, user_id, profile_version)
+        entries = self._scopes.get(scope)
+        if entries:
+            now = time.time()
+            live = [entry for entry in entries if entry[1] > now]
+            self._size -= len(entries) - len(live)
+            self._scopes[scope] = live
+            scored = [(MinHasher.similarity(signature, entry[0]), entry) for entry in live]
+            best_score, best = max(scored, key=lambda pair: pair[0], default=(0.0, None))
+            if best is not None and best_score >= self.threshold:
+                self._scopes.move_to_end(scope)
+                self.hits += 1
+                logger.info(f"Reusing {namespace} result for near-duplicate JD (similarity {best_score:.2f})")
+                return copy.deepcopy(best[2])
+        self.misses += 1
+        return None
+
+    def remember(self, namespace: str, user_id: str, profile_version: str, signature: Tuple[int, ...], result: Any) -> None:
+        """Store a result for later near-duplicate lookups.
+
+        Older results for near-duplicates of the same JD are replaced, so a
+        regeneration becomes the result that later lookups reuse.
+        """
+        scope = (namespace, user_id, profile_version)
+        entries = [
+            entry for entry in self._scopes.get(scope, [])
+            if MinHasher.similarity(signature, entry[0]) < self.threshold
+        ]
+        self._size -= len(self._scopes.get(scope, [])) - len(entries)
+        self._scopes[scope] = entries
+        entries.append((signature, time.time() + self.ttl_seconds, copy.deepcopy(result)))
+        self._scopes.move_to_end(scope)
+        self._size += 1
+        # Evict least-recently-used scopes until under the cap
+        while self._size > self.max_entries and self._scopes:
+            _, evicted = self._scopes.popitem(last=False)
+            self._size -= len(evicted)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for monitoring."""
+        return {"entries": self._size, "hits": self.hits, "misses": self.misses}
+
+
+# Global near-duplicate result store
+jd_result_store = NearDuplicateResultStore(
+    num_perm=settings.JD_DEDUP_NUM_PERM,
+    threshold=settings.JD_DEDUP_SIMILARITY_THRESHOLD,
+    ttl_seconds=settings.JD_DEDUP_TTL_SECONDS,
+    max_entries=settings.JD_DEDUP_MAX_ENTRIES
+)
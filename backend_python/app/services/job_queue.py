@@ -0,0 +1,536 @@
+"""Background job queue for long-running generations.
+
+A submission stores a job and returns its id right away; a bounded pool of
+in-process workers (`JOB_WORKERS`) runs queued jobs through the handler
+registered for their kind, and clients poll the job or subscribe to its
+status changes. This keeps slow model calls from holding an HTTP connection
+(and server capacity) for their whole duration.
+
+Jobs are kept in a pluggable store (`JOB_QUEUE_BACKEND`):
+
+- `memory` (default): jobs live in this process only,
+- `sqlite`: jobs and results are written to `JOB_QUEUE_SQLITE_PATH`, so
+  results can still be fetched after a restart and unfinished jobs are run
+  again (at least once).
+
+A running job is leased to the queue that claimed it (`worker_id`) until
+`lease_expires_at`, and the lease is renewed while the job runs. Other
+queues sharing the SQLite file (more server processes, or a restarted one)
+only take over a running job once its lease has expired, i.e. when its owner
+crashed; a queue that is stopped hands its running jobs back right away.
+
+Finished jobs are dropped after `JOB_RESULT_TTL_SECONDS`.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.config.settings import settings
+from app.database.request_context import request_data_context
+from app.services.rate_limiter import LLMOverloadedError
+
+logger = logging.getLogger(__name__)
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+FINISHED_STATES = (JOB_SUCCEEDED, JOB_FAILED)
+
+# Finished jobs are purged at most this often
+PURGE_INTERVAL_SECONDS = 60.0
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class JobQueueFullError(Exception):
+    """Raised when JOB_QUEUE_MAX_PENDING jobs are already waiting."""
+
+    def __init__(self, pending: int, retry_after: float = 5.0):
+        super().__init__(f"Job queue full ({pending} jobs waiting), retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class Job:
+    """One unit of background work and its outcome."""
+    kind: str
+    payload: Dict[str, Any]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = JOB_QUEUED
+    result: Optional[Dict[str, Any]] = None
+    # {"status": HTTP status, "detail": message[, "retry_after": seconds]}
+    error: Optional[Dict[str, Any]] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # Queue running the job and until when it owns it
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+
+def describe_error(error: Exception) -> Dict[str, Any]:
+    """The error a failed job reports, with the HTTP status the synchronous endpoint would have returned."""
+    if isinstance(error, LLMOverloadedError):
+        return {"status": 503, "detail": str(error), "retry_after": error.retry_after}
+    return {"status": getattr(error, "status_code", 500), "detail": getattr(error, "detail", None) or str(error)}
+
+
+class MemoryJobStore:
+    """Jobs in a dict (lost on restart)."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+
+    async def save(self, job: Job) -> None:
+        self._jobs[job.id] = job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def claim(self, job_id: str, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        """Mark a queued job as running under a lease; None if it is gone or already taken."""
+        job = self._jobs.get(job_id)
+        if job is None or job.status != JOB_QUEUED:
+            return None
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        job.worker_id = worker_id
+        job.lease_expires_at = job.started_at + lease_seconds
+        return job
+
+    async def renew(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend the lease of a job this worker runs; False if it no longer holds it."""
+        job = self._jobs.get(job_id)
+        if job is None or job.status != JOB_RUNNING or job.worker_id != worker_id:
+            return False
+        job.lease_expires_at = time.time() + lease_seconds
+        return True
+
+    async def release(self, job_id: str, worker_id: str) -> bool:
+        """Put a job this worker runs back in the queue (the worker is stopping)."""
+        job = self._jobs.get(job_id)
+        if job is None or job.status != JOB_RUNNING or job.worker_id != worker_id:
+            return False
+        job.status, job.started_at, job.worker_id, job.lease_expires_at = JOB_QUEUED, None, None, None
+        return True
+
+    async def requeue_expired(self, now: float) -> List[str]:
+        """Put running jobs whose lease expired back in the queue; their ids."""
+        expired = [
+            job for job in self._jobs.values()
+            if job.status == JOB_RUNNING and (job.lease_expires_at is None or job.lease_expires_at < now)
+        ]
+        for job in expired:
+            job.status, job.started_at, job.worker_id, job.lease_expires_at = JOB_QUEUED, None, None, None
+        return [job.id for job in expired]
+
+    async def queued(self) -> List[str]:
+        """Ids of queued jobs, oldest first."""
+        return [job.id for job in sorted(self._jobs.values(), key=lambda job: job.created_at) if job.status == JOB_QUEUED]
+
+    async def purge(self, finished_before: float) -> int:
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished and job.finished_at < finished_before]
+        for job_id in expired:
+            del self._jobs[job_id]
+        return len(expired)
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteJobStore:
+    """Jobs in a SQLite file, so queued work and results survive restarts."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+    async def save(self, job: Job) -> None:
+        await asyncio.to_thread(self._save, job)
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return await asyncio.to_thread(self._get, job_id)
+
+    async def claim(self, job_id: str, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        """Mark a queued job as running under a lease; None if it is gone or already taken."""
+        return await asyncio.to_thread(self._claim, job_id, worker_id, lease_seconds)
+
+    async def renew(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend the lease of a job this worker runs; False if it no longer holds it."""
+        return await asyncio.to_thread(self._renew, job_id, worker_id, lease_seconds)
+
+    async def release(self, job_id: str, worker_id: str) -> bool:
+        """Put a job this worker runs back in the queue (the worker is stopping)."""
+        return await asyncio.to_thread(self._release, job_id, worker_id)
+
+    async def requeue_expired(self, now: float) -> List[str]:
+        """Put running jobs whose lease expired back in the queue; their ids."""
+        return await asyncio.to_thread(self._requeue_expired, now)
+
+    async def queued(self) -> List[str]:
+        """Ids of queued jobs, oldest first."""
+        return await asyncio.to_thread(self._queued)
+
+    async def purge(self, finished_before: float) -> int:
+        return await asyncio.to_thread(self._purge, finished_before)
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Other processes may hold the write lock briefly (claims, lease renewals)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, status TEXT NOT NULL, "
+                "result TEXT, error TEXT, created_at REAL NOT NULL, started_at REAL, finished_at REAL, "
+                "worker_id TEXT, lease_expires_at REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)")
+            self._db.commit()
+        return self._db
+
+    @staticmethod
+    def _from_row(row) -> Job:
+        job_id, kind, payload, status, result, error, created_at, started_at, finished_at, worker_id, lease_expires_at = row
+        return Job(
+            kind=kind, payload=json.loads(payload), id=job_id, status=status,
+            result=json.loads(result) if result else None, error=json.loads(error) if error else None,
+            created_at=created_at, started_at=started_at, finished_at=finished_at,
+            worker_id=worker_id, lease_expires_at=lease_expires_at
+        )
+
+    def _save(self, job: Job) -> None:
+        with self._db_lock:
+            db = self._connection()
+            db.execute(
+                "INSERT OR REPLACE INTO jobs (id, kind, payload, status, result, error, created_at, started_at, finished_at, "
+                "worker_id, lease_expires_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id, job.kind, json.dumps(job.payload), job.status,
+                    json.dumps(job.result) if job.result is not None else None,
+                    json.dumps(job.error) if job.error is not None else None,
+                    job.created_at, job.started_at, job.finished_at, job.worker_id, job.lease_expires_at
+                )
+            )
+            db.commit()
+
+    def _get(self, job_id: str) -> Optional[Job]:
+        with self._db_lock:
+            row = self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def _claim(self, job_id: str, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        now = time.time()
+        with self._db_lock:
+            db = self._connection()
+            claimed = db.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, worker_id = ?, lease_expires_at = ? WHERE id = ? AND status = ?",
+                (JOB_RUNNING, now, worker_id, now + lease_seconds, job_id, JOB_QUEUED)
+            ).rowcount
+            db.commit()
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone() if claimed else None
+        return self._from_row(row) if row else None
+
+    def _renew(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        with self._db_lock:
+            db = self._connection()
+            renewed = db.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = ? AND worker_id = ?",
+                (time.time() + lease_seconds, job_id, JOB_RUNNING, worker_id)
+            ).rowcount
+            db.commit()
+        return bool(renewed)
+
+    def _release(self, job_id: str, worker_id: str) -> bool:
+        with self._db_lock:
+            db = self._connection()
+            released = db.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL, worker_id = NULL, lease_expires_at = NULL "
+                "WHERE id = ? AND status = ? AND worker_id = ?",
+                (JOB_QUEUED, job_id, JOB_RUNNING, worker_id)
+            ).rowcount
+            db.commit()
+        return bool(released)
+
+    def _requeue_expired(self, now: float) -> List[str]:
+        expired = "status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)"
+        with self._db_lock:
+            db = self._connection()
+            candidates = [row[0] for row in db.execute(f"SELECT id FROM jobs WHERE {expired}", (JOB_RUNNING, now)).fetchall()]
+            # Re-checked per row: the owner may renew, or another process requeue, in between
+            requeued = [
+                job_id for job_id in candidates
+                if db.execute(
+                    "UPDATE jobs SET status = ?, started_at = NULL, worker_id = NULL, lease_expires_at = NULL "
+                    f"WHERE id = ? AND {expired}",
+                    (JOB_QUEUED, job_id, JOB_RUNNING, now)
+                ).rowcount
+            ]
+            db.commit()
+        return requeued
+
+    def _queued(self) -> List[str]:
+        with self._db_lock:
+            rows = self._connection().execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (JOB_QUEUED,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _purge(self, finished_before: float) -> int:
+        with self._db_lock:
+            db = self._connection()
+            purged = db.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?", (*FINISHED_STATES, finished_before)
+            ).rowcount
+            db.commit()
+        return purged
+
+
+def create_job_store(backend: str):
+    """Job store for a JOB_QUEUE_BACKEND value."""
+    if backend == SQLiteJobStore.name:
+        return SQLiteJobStore(settings.JOB_QUEUE_SQLITE_PATH)
+    if backend != MemoryJobStore.name:
+        logger.warning(f"Unknown JOB_QUEUE_BACKEND {backend!r}, using memory")
+    return MemoryJobStore()
+
+
+class JobQueue:
+    """Bounded worker pool running stored jobs through per-kind handlers."""
+
+    def __init__(self, store, workers: int, max_pending: int, result_ttl_seconds: float, lease_seconds: float = 60.0):
+        self.store = store
+        self.workers = workers
+        self.max_pending = max_pending
+        self.result_ttl_seconds = result_ttl_seconds
+        self.lease_seconds = lease_seconds
+        # Owner of the leases this queue takes (unique per process and queue)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, JobHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._start_lock: Optional[asyncio.Lock] = None
+        # Set (and replaced) whenever a job changes, to wake its subscribers
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._waiters: Dict[str, int] = {}
+        # Jobs this queue's workers are running, handed back on stop
+        self._running_jobs: set = set()
+        self._last_purge = 0.0
+        self.running = 0
+        self.metrics = {"submitted": 0, "rejected": 0, "recovered": 0, "lease_lost": 0, "succeeded": 0, "failed": 0}
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """Set the coroutine that runs jobs of a kind (payload -> JSON-serializable result)."""
+        self._handlers[kind] = handler
+
+    async def start(self) -> None:
+        """Start the workers and queue stored jobs that nobody runs (idempotent).
+
+        Queued jobs are picked up, as are running jobs whose lease expired;
+        jobs another live queue is running are left alone.
+        """
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._queue is not None:
+                return
+            self._queue = asyncio.Queue()
+            reclaimed = await self.store.requeue_expired(time.time())
+            queued = await self.store.queued()
+            for job_id in queued:
+                self._queue.put_nowait(job_id)
+            self.metrics["recovered"] += len(queued)
+            if queued:
+                logger.info(
+                    f"Queued {len(queued)} stored jobs ({len(reclaimed)} with expired leases) from the {self.store.name} job store"
+                )
+            self._worker_tasks = [asyncio.create_task(self._work(i)) for i in range(self.workers)]
+            self._worker_tasks.append(asyncio.create_task(self._reap()))
+
+    async def stop(self) -> None:
+        """Cancel the workers and hand the jobs they were running back to the queue."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+        for job_id in list(self._running_jobs):
+            await self.store.release(job_id, self.worker_id)
+        self._running_jobs.clear()
+        self.store.close()
+
+    async def submit(self, kind: str, payload: Dict[str, Any]) -> Job:
+        """Store a job and queue it for the workers.
+
+        Raises:
+            JobQueueFullError: JOB_QUEUE_MAX_PENDING jobs are already waiting
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind {kind!r}")
+        await self.start()
+        pending = self._queue.qsize()
+        if pending >= self.max_pending:
+            self.metrics["rejected"] += 1
+            raise JobQueueFullError(pending)
+        job = Job(kind=kind, payload=payload)
+        await self.store.save(job)
+        self._queue.put_nowait(job.id)
+        self.metrics["submitted"] += 1
+        await self._purge_expired()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Current state of a job (None if unknown or expired)."""
+        return await self.store.get(job_id)
+
+    async def wait_for_change(self, job_id: str, timeout: float) -> bool:
+        """Wait until the job changes in this process or the timeout passes; True if it changed."""
+        event = self._changed.setdefault(job_id, asyncio.Event())
+        self._waiters[job_id] = self._waiters.get(job_id, 0) + 1
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            # The last subscriber of a job drops its event, so abandoned streams leave nothing behind
+            self._waiters[job_id] -= 1
+            if not self._waiters[job_id]:
+                del self._waiters[job_id]
+                self._changed.pop(job_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend, pool size, queue depth and job outcome counters."""
+        return {
+            "backend": self.store.name,
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            **self.metrics
+        }
+
+    def _notify(self, job_id: str) -> None:
+        event = self._changed.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def _purge_expired(self) -> None:
+        now = time.time()
+        if now - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        purged = await self.store.purge(now - self.result_ttl_seconds)
+        if purged:
+            logger.info(f"Purged {purged} expired jobs")
+
+    async def _reap(self) -> None:
+        """Periodically take over jobs whose owner stopped renewing its lease, and purge old results."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 2)
+            try:
+                reclaimed = await self.store.requeue_expired(time.time())
+                for job_id in reclaimed:
+                    self._queue.put_nowait(job_id)
+                if reclaimed:
+                    self.metrics["recovered"] += len(reclaimed)
+                    logger.warning(f"Re-queued {len(reclaimed)} jobs whose lease expired")
+                await self._purge_expired()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job lease check failed: {e}")
+
+    async def _renew_lease(self, job_id: str) -> None:
+        """Keep renewing a running job's lease until cancelled."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if not await self.store.renew(job_id, self.worker_id, self.lease_seconds):
+                    self.metrics["lease_lost"] += 1
+                    logger.warning(f"Lost the lease on job {job_id}; another worker may run it again")
+                    return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Renewing the lease on job {job_id} failed: {e}")
+
+    async def _work(self, worker_id: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = await self.store.claim(job_id, self.worker_id, self.lease_seconds)
+                if job is not None:
+                    await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {worker_id} failed on job {job_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        self.running += 1
+        self._running_jobs.add(job.id)
+        self._notify(job.id)
+        logger.info(f"Running {job.kind} job {job.id}")
+        heartbeat = asyncio.create_task(self._renew_lease(job.id))
+        try:
+            # Each job gets its own data context, like an HTTP request
+            with request_data_context():
+                job.result = await self._handlers[job.kind](job.payload)
+            job.status = JOB_SUCCEEDED
+            self.metrics["succeeded"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.status = JOB_FAILED
+            job.error = describe_error(e)
+            self.metrics["failed"] += 1
+            logger.warning(f"{job.kind} job {job.id} failed: {job.error['detail']}")
+        finally:
+            heartbeat.cancel()
+            self.running -= 1
+        job.finished_at = time.time()
+        job.worker_id = None
+        job.lease_expires_at = None
+        await self.store.save(job)
+        self._running_jobs.discard(job.id)
+        self._notify(job.id)
+
+
+# Global job queue
+job_queue = JobQueue(
+    store=create_job_store(settings.JOB_QUEUE_BACKEND),
+    workers=settings.JOB_WORKERS,
+    max_pending=settings.JOB_QUEUE_MAX_PENDING,
+    result_ttl_seconds=settings.JOB_RESULT_TTL_SECONDS,
+    lease_seconds=settings.JOB_LEASE_SECONDS
+)
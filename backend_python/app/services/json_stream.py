@@ -0,0 +1,122 @@
+"""Incremental parsing of a JSON object that arrives in text chunks.
+
+Used to surface parts of a model's JSON reply while it is still streaming:
+each top-level field is emitted as soon as its value is complete, and the
+elements of top-level arrays are emitted one by one as they close.
+"""
+
+import json
+import logging
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Event kinds returned by StreamingJSONParser.feed
+FIELD_EVENT = "field"
+ITEM_EVENT = "item"
+
+
+class StreamingJSONParser:
+    """Scan streamed text for completed top-level fields and array elements.
+
+    Text before the first "{" (e.g. a markdown fence) and after the object
+    closes is ignored. Fragments that fail to decode are skipped; callers
+    should still parse the full text at the end.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._pending_key: Optional[str] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._element_start: Optional[int] = None
+        self._value_is_array = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, str, Any]]:
+        """Consume a chunk and return newly completed (kind, key, value) events.
+
+        kind is FIELD_EVENT for a complete top-level field value and
+        ITEM_EVENT for a complete element of a top-level array.
+        """
+        self.text += chunk
+        events = []
+        text = self.text
+        while self._pos < len(text):
+            pos = self._pos
+            ch = text[pos]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._close_string(pos, events)
+                continue
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+            if self._depth == 0:
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif ch in "{[":
+                if self._depth == 1:
+                    self._value_is_array = ch == "["
+                elif self._depth == 2 and self._value_is_array:
+                    self._element_start = pos
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 2 and self._element_start is not None:
+                    self._emit(events, ITEM_EVENT, self._element_start, pos + 1)
+                    self._element_start = None
+                elif self._depth == 1 and self._key is not None:
+                    self._emit(events, FIELD_EVENT, self._value_start, pos + 1)
+                    self._key = None
+                elif self._depth == 0 and self._key is not None:
+                    # Scalar value closed by the end of the object
+                    self._emit(events, FIELD_EVENT, self._value_start, pos)
+                    self._key = None
+            elif self._depth == 1:
+                if ch == ":" and self._pending_key is not None:
+                    self._key, self._pending_key = self._pending_key, None
+                    self._value_start = pos + 1
+                elif ch == "," and self._key is not None:
+                    # Scalar (number/bool/null) value
+                    self._emit(events, FIELD_EVENT, self._value_start, pos)
+                    self._key = None
+        return events
+
+    def _close_string(self, end: int, events: List[Tuple[str, str, Any]]) -> None:
+        if self._depth == 1:
+            if self._key is None:
+                try:
+                    self._pending_key = json.loads(self.text[self._string_start:end + 1])
+                except ValueError:
+                    self._pending_key = None
+            else:
+                self._emit(events, FIELD_EVENT, self._value_start, end + 1)
+                self._key = None
+        elif self._depth == 2 and self._key is not None and self._value_is_array:
+            self._emit(events, ITEM_EVENT, self._string_start, end + 1)
+
+    def _emit(self, events: List[Tuple[str, str, Any]], kind: str, start: int, end: int) -> None:
+        fragment = self.text[start:end].strip()
+        try:
+            events.append((kind, self._key, json.loads(fragment)))
+        except ValueError:
+            logger.debug(f"Skipping undecodable streamed fragment for '{self._key}': {fragment[:80]}")
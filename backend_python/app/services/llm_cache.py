@@ -0,0 +1,193 @@
+"""Content-addressed cache of LLM responses.
+
+Responses are keyed by a SHA-256 of everything that determines the model's
+output (model, model settings, instructions, tools, output schema, prompt).
+There are two tiers:
+
+- an in-memory LRU (always on while the cache is enabled), and
+- an optional SQLite file (`LLM_CACHE_SQLITE_PATH`) that survives restarts.
+
+Caching is opt-in per endpoint: call sites pass a namespace to
+`AIClient.run_agent`, and only namespaces listed in `LLM_CACHE_NAMESPACES`
+are cached.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from agents import Agent
+from agents.usage import Usage
+from pydantic import BaseModel
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedContext:
+    """Stand-in for RunContextWrapper: a cache hit costs no tokens."""
+    usage: Usage = field(default_factory=Usage)
+
+
+@dataclass
+class CachedRunResult:
+    """Minimal RunResult replacement returned on a cache hit."""
+    final_output: Any
+    context_wrapper: CachedContext = field(default_factory=CachedContext)
+    cached: bool = True
+
+
+def make_cache_key(agent: Agent, prompt: str) -> str:
+    """Hash everything that determines the model's output."""
+    output_type = agent.output_type
+    payload = {
+        "model": str(agent.model),
+        "model_settings": repr(agent.model_settings),
+        "instructions": agent.instructions if isinstance(agent.instructions, str) else None,
+        "tools": [repr(tool) for tool in agent.tools],
+        "output_type": f"{output_type.__module__}.{output_type.__qualname__}" if isinstance(output_type, type) else None,
+        "prompt": prompt
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _serialize_output(final_output: Any) -> str:
+    if isinstance(final_output, BaseModel):
+        return json.dumps({"kind": "model", "value": final_output.model_dump_json()})
+    return json.dumps({"kind": "text", "value": str(final_output)})
+
+
+def _deserialize_output(raw: str, agent: Agent) -> Any:
+    data = json.loads(raw)
+    if data["kind"] == "model":
+        return agent.output_type.model_validate_json(data["value"])
+    return data["value"]
+
+
+class LLMResponseCache:
+    """Two-tier (memory LRU + optional SQLite) response cache with TTL and metrics."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, sqlite_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = sqlite_path
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self.metrics: Dict[str, Dict[str, int]] = defaultdict(lambda: {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0, "writes": 0
+        })
+
+    def is_enabled_for(self, namespace: Optional[str]) -> bool:
+        """Whether responses in this namespace (endpoint) should be cached."""
+        return settings.LLM_CACHE_ENABLED and namespace is not None and namespace in settings.LLM_CACHE_NAMESPACES
+
+    def record_bypass(self, namespace: str) -> None:
+        """Count an intentional regeneration that skipped the cache."""
+        self.metrics[namespace]["bypassed"] += 1
+
+    async def get(self, namespace: str, agent: Agent, prompt: str) -> Optional[CachedRunResult]:
+        """Look up a cached response (memory first, then disk)."""
+        key = make_cache_key(agent, prompt)
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, raw = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self.metrics[namespace]["memory_hits"] += 1
+                return CachedRunResult(final_output=_deserialize_output(raw, agent))
+            del self._memory[key]
+
+        if self.sqlite_path:
+            row = await asyncio.to_thread(self._disk_get, key, now)
+            if row is not None:
+                expires_at, raw = row
+                self._remember(key, expires_at, raw)
+                self.metrics[namespace]["disk_hits"] += 1
+                return CachedRunResult(final_output=_deserialize_output(raw, agent))
+
+        self.metrics[namespace]["misses"] += 1
+        return None
+
+    async def set(self, namespace: str, agent: Agent, prompt: str, final_output: Any) -> None:
+        """Store a response in both tiers."""
+        key = make_cache_key(agent, prompt)
+        expires_at = time.time() + self.ttl_seconds
+        raw = _serialize_output(final_output)
+
+        self._remember(key, expires_at, raw)
+        if self.sqlite_path:
+            await asyncio.to_thread(self._disk_set, key, namespace, expires_at, raw)
+        self.metrics[namespace]["writes"] += 1
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory tier (the disk tier is kept)."""
+        self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per namespace plus tier sizes."""
+        return {
+            "memory_entries": len(self._memory),
+            "disk_enabled": bool(self.sqlite_path),
+            "namespaces": {namespace: dict(counters) for namespace, counters in self.metrics.items()}
+        }
+
+    def _remember(self, key: str, expires_at: float, raw: str) -> None:
+        self._memory[key] = (expires_at, raw)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, namespace TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        try:
+            with self._db_lock:
+                row = self._connection().execute(
+                    "SELECT expires_at, value FROM llm_cache WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+            return row
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache disk read failed: {e}")
+            return None
+
+    def _disk_set(self, key: str, namespace: str, expires_at: float, raw: str) -> None:
+        try:
+            with self._db_lock:
+                db = self._connection()
+                db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, namespace, expires_at, value) VALUES (?, ?, ?, ?)",
+                    (key, namespace, expires_at, raw)
+                )
+                db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+                db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache disk write failed: {e}")
+
+
+# Global LLM response cache instance
+llm_cache = LLMResponseCache(
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    sqlite_path=settings.LLM_CACHE_SQLITE_PATH
+)
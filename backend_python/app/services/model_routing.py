@@ -0,0 +1,111 @@
+"""Declarative model routing: which model (and settings) each AI task uses.
+
+Every model call belongs to a task. A task's route names a primary model, a
+faster fallback used when the primary is overloaded or keeps failing, the
+maximum output tokens and the sampling temperature. The defaults below can be
+overridden per task with `LLM_MODEL_ROUTES`, a JSON object such as:
+
+    {"full_resume": {"primary": "gpt-4o", "max_tokens": 1500},
+     "bullet_variant": {"fallback": null}}
+
+Only the given fields change; unknown tasks and fields are logged and ignored.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Optional
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Tasks
+TASK_FULL_RESUME = "full_resume"              # select experiences/projects (and skills, as a fallback) and write their bullets
+TASK_BULLET_VARIANT = "bullet_variant"        # one tailored bullet per call (pointer chunks)
+TASK_BULLET_REWRITE = "bullet_rewrite"        # reword an existing bullet / single or legacy bullets
+TASK_BULLET_BATCH = "bullet_batch"            # several bullets in one schema-enforced call
+TASK_SELECTION = "selection"                  # pick the most relevant bullets or experiences
+TASK_ANALYSIS = "analysis"                    # score a resume against a job description
+TASK_SUMMARY = "summary"                      # summary keywords/phrases
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """Model and generation settings for one task."""
+    primary: str
+    fallback: Optional[str] = None
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+
+
+# Defaults keep the models and temperatures the call sites used before routing;
+# fallbacks are faster models of the same family
+DEFAULT_ROUTES: Dict[str, ModelRoute] = {
+    TASK_FULL_RESUME: ModelRoute(primary="gpt-4", fallback="gpt-4o", max_tokens=2000, temperature=0.5),
+    TASK_BULLET_VARIANT: ModelRoute(primary="gpt-4", fallback="gpt-4o", max_tokens=200, temperature=0.5),
+    TASK_BULLET_REWRITE: ModelRoute(primary="gpt-4o", fallback="gpt-4o-mini", max_tokens=200, temperature=0.4),
+    # Must support json_schema structured output
+    TASK_BULLET_BATCH: ModelRoute(primary=settings.STRUCTURED_OUTPUT_MODEL, fallback="gpt-4o-mini", max_tokens=800, temperature=0.5),
+    TASK_SELECTION: ModelRoute(primary="gpt-4o", fallback="gpt-4o-mini", max_tokens=400, temperature=0.3),
+    TASK_ANALYSIS: ModelRoute(primary="gpt-4", fallback="gpt-4o", max_tokens=1000, temperature=0.3),
+    TASK_SUMMARY: ModelRoute(primary="gpt-4o", fallback="gpt-4o-mini", max_tokens=200, temperature=0.4),
+}
+
+
+def parse_route_overrides(raw: str) -> Dict[str, Dict[str, Any]]:
+    """Parse the LLM_MODEL_ROUTES JSON into {task: {field: value}}."""
+    if not raw.strip():
+        return {}
+    try:
+        overrides = json.loads(raw)
+    except ValueError as e:
+        logger.warning(f"Ignoring invalid LLM_MODEL_ROUTES: {e}")
+        return {}
+    if not isinstance(overrides, dict):
+        logger.warning("Ignoring LLM_MODEL_ROUTES: expected a JSON object of tasks")
+        return {}
+    return overrides
+
+
+def build_routes(raw_overrides: str) -> Dict[str, ModelRoute]:
+    """Apply LLM_MODEL_ROUTES overrides on top of DEFAULT_ROUTES."""
+    routes = dict(DEFAULT_ROUTES)
+    known_fields = {f.name for f in fields(ModelRoute)}
+    for task, override in parse_route_overrides(raw_overrides).items():
+        if task not in routes or not isinstance(override, dict):
+            logger.warning(f"Ignoring LLM_MODEL_ROUTES entry for unknown task {task!r}")
+            continue
+        unknown = set(override) - known_fields
+        if unknown:
+            logger.warning(f"Ignoring unknown LLM_MODEL_ROUTES fields for {task}: {sorted(unknown)}")
+        routes[task] = replace(routes[task], **{k: v for k, v in override.items() if k in known_fields})
+    return routes
+
+
+class ModelRouter:
+    """Routing table, built lazily from settings."""
+
+    def __init__(self):
+        self._routes: Optional[Dict[str, ModelRoute]] = None
+
+    def route(self, task: str) -> ModelRoute:
+        """Route of a task (KeyError for unknown tasks)."""
+        if self._routes is None:
+            self._routes = build_routes(settings.LLM_MODEL_ROUTES)
+        return self._routes[task]
+
+    def reset(self) -> None:
+        """Rebuild the table from the current settings on next use."""
+        self._routes = None
+
+    def table(self) -> Dict[str, Dict[str, Any]]:
+        """All routes as plain dicts."""
+        return {
+            task: {f.name: getattr(self.route(task), f.name) for f in fields(ModelRoute)}
+            for task in DEFAULT_ROUTES
+        }
+
+
+# Global routing table
+model_router = ModelRouter()
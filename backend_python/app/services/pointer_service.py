@@ -1,109 +1,334 @@
 """Service for generating resume bullet points using AI."""
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional, Sequence, Tuple
+from pydantic import BaseModel
+from app.config.settings import settings
+from app.services.bullet_dedup import BulletFilter, bullet_dedup_meter
 from app.services.client import ai_client
-from app.database.supabase import get_supabase_client
+from app.services.context_budget import context_budgeter
+from app.services.jd_dedup import jd_result_store
+from app.services.json_stream import FIELD_EVENT, ITEM_EVENT, StreamingJSONParser
+from app.services.model_routing import (
+    TASK_BULLET_BATCH,
+    TASK_BULLET_REWRITE,
+    TASK_BULLET_VARIANT,
+    TASK_FULL_RESUME,
+    TASK_SELECTION,
+    TASK_SUMMARY
+)
+from app.services.prompt_templates import (
+    FULL_RESUME_PICK_SKILLS_REQUEST,
+    FULL_RESUME_PROMPT,
+    FULL_RESUME_SELECTED_SKILLS_REQUEST,
+    POINTER_CHUNK_PROMPT,
+    POINTER_CHUNKS_BATCH_PROMPT
+)
+from app.services.rate_limiter import LLMOverloadedError, estimate_tokens
+from app.services.skill_index import skill_index_for
+from app.services.relevance import BM25Index, rank_resume_items, resume_item_text, shortlist_items, to_percent
+from app.database.repository import (
+    compute_profile_version,
+    get_user_resume_data,
+    get_resume_item_with_pointers
+)
 
 logger = logging.getLogger(__name__)
 
+# Bullet generation modes
+BULLET_MODE_PARALLEL = "parallel"
+BULLET_MODE_SINGLE_CALL = "single_call"
 
-def get_user_resume_data(user_id: str) -> Dict[str, Any]:
-    """Get all resume data for a user from the database."""
-    supabase = get_supabase_client()
-    if not supabase:
-        logger.warning("Supabase client not available")
-        return {}
+# LLM cache / near-duplicate reuse namespace of the full resume endpoint
+FULL_RESUME_NAMESPACE = "full_resume"
+
+
+class BulletVariants(BaseModel):
+    """Structured output schema for single-call multi-bullet generation."""
+    bullets: List[str]
+
+
+async def generate_bullets_as_completed(prompts: List[str], agent_name: str, task: str, bypass_cache: bool = False) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Run one model call per prompt concurrently and yield each bullet as soon as it is ready.
     
-    try:
-        # Get user info
-        user_data = supabase.table("users").select("*").eq("id", user_id).execute()
-        user = user_data.data[0] if user_data.data else None
-        
-        # Get resume items (experiences, projects, etc.)
-        resume_items = supabase.table("resume_items").select("*").eq("user_id", user_id).execute()
-        
-        # Get existing pointers for each resume item
-        resume_items_with_pointers = []
-        for item in resume_items.data:
-            pointers = supabase.table("resume_item_points").select("*").eq("resume_item_id", item["id"]).order("display_order").execute()
-            item["existing_pointers"] = pointers.data
-            resume_items_with_pointers.append(item)
-        
-        # Get skills
-        skills = supabase.table("skills").select("*").eq("user_id", user_id).execute()
-        
-        # Get education
-        education = supabase.table("education").select("*").eq("user_id", user_id).execute()
-        
-        return {
-            "user": user,
-            "resume_items": resume_items_with_pointers,
-            "skills": skills.data,
-            "education": education.data
-        }
+    Calls are bounded by BULLET_GENERATION_CONCURRENCY. A failed or empty
+    generation is logged and skipped so the other bullets are still returned;
+    the first error is only raised if every call failed. Calls still running
+    when the consumer stops iterating are cancelled.
+    
+    Args:
+        prompts: One prompt per bullet to generate
+        agent_name: Agent name (shared by all bullets, so the agent is reused)
+        task: Routing table task that picks the model and temperature
+        bypass_cache: Skip the LLM response cache (intentional regeneration)
         
-    except Exception as e:
-        logger.error(f"Error fetching user resume data: {e}")
-        return {}
+    Yields:
+        (index of the prompt, generated bullet) in completion order
+    """
+    semaphore = asyncio.Semaphore(settings.BULLET_GENERATION_CONCURRENCY)
+    
+    async def generate(i: int, prompt: str) -> Tuple[int, str]:
+        async with semaphore:
+            result = await ai_client.run_task(task, agent_name, prompt, cache_namespace="bullets", bypass_cache=bypass_cache)
+            return i, str(result.final_output).strip() if result.final_output else ''
+    
+    tasks = [asyncio.ensure_future(generate(i, prompt)) for i, prompt in enumerate(prompts)]
+    yielded = 0
+    errors = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                i, bullet = await next_done
+            except Exception as e:
+                logger.error(f"{agent_name} bullet failed: {e}")
+                errors.append(e)
+                continue
+            if bullet:
+                logger.info(f"{agent_name} bullet {i+1}: {bullet}")
+                yielded += 1
+                yield i, bullet
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    if not yielded and errors:
+        raise errors[0]
 
 
-def get_resume_item_with_pointers(resume_item_id: str) -> Optional[Dict[str, Any]]:
-    """Get a specific resume item with its existing pointers."""
-    supabase = get_supabase_client()
-    if not supabase:
-        return None
+async def generate_bullets_concurrently(prompts: List[str], agent_name: str, task: str, bypass_cache: bool = False) -> List[str]:
+    """
+    Run one model call per prompt concurrently and collect the bullets in prompt order.
     
-    try:
-        # Get resume item
-        resume_item = supabase.table("resume_items").select("*").eq("id", resume_item_id).execute()
-        if not resume_item.data:
-            return None
-        
-        item = resume_item.data[0]
-        
-        # Get existing pointers
-        pointers = supabase.table("resume_item_points").select("*").eq("resume_item_id", resume_item_id).order("display_order").execute()
-        item["existing_pointers"] = pointers.data
-        
-        return item
+    See `generate_bullets_as_completed` for concurrency and error handling.
+    
+    Args:
+        prompts: One prompt per bullet to generate
+        agent_name: Agent name (shared by all bullets, so the agent is reused)
+        task: Routing table task that picks the model and temperature
+        bypass_cache: Skip the LLM response cache (intentional regeneration)
         
-    except Exception as e:
-        logger.error(f"Error fetching resume item: {e}")
-        return None
+    Returns:
+        Generated bullet points, in the order of `prompts`
+    """
+    completed = [
+        pair async for pair in generate_bullets_as_completed(prompts, agent_name, task, bypass_cache)
+    ]
+    return [bullet for _, bullet in sorted(completed)]
 
 
-def save_new_pointers(resume_item_id: str, user_id: str, new_pointers: List[str]) -> bool:
-    """Save new generated pointers to the database."""
-    supabase = get_supabase_client()
-    if not supabase:
-        return False
+async def generate_bullets_single_call(prompt: str, count: int, agent_name: str, bypass_cache: bool = False) -> List[str]:
+    """
+    Generate several distinct bullets with ONE schema-enforced model call.
     
-    try:
-        # Get current max display order
-        existing_pointers = supabase.table("resume_item_points").select("display_order").eq("resume_item_id", resume_item_id).order("display_order", desc=True).execute()
-        max_order = existing_pointers.data[0]["display_order"] if existing_pointers.data else 0
-        
-        # Insert new pointers
-        pointer_data = []
-        for i, pointer_content in enumerate(new_pointers):
-            pointer_data.append({
-                "resume_item_id": resume_item_id,
-                "user_id": user_id,
-                "content": pointer_content,
-                "display_order": max_order + i + 1,
-                "usage_count": 0
-            })
+    The shared context is sent once instead of once per bullet, and the model
+    returns a JSON object validated against `BulletVariants`. Exact duplicates
+    are dropped and the list is capped at `count`.
+    
+    Args:
+        prompt: Prompt asking for `count` distinct bullets
+        count: Number of bullets wanted
+        agent_name: Agent name
+        bypass_cache: Skip the LLM response cache (intentional regeneration)
         
-        result = supabase.table("resume_item_points").insert(pointer_data).execute()
-        return len(result.data) == len(new_pointers)
+    Returns:
+        Up to `count` generated bullet points
+    """
+    result = await ai_client.run_task(
+        TASK_BULLET_BATCH, agent_name, prompt, output_type=BulletVariants, cache_namespace="bullets", bypass_cache=bypass_cache
+    )
+    variants = result.final_output.bullets if result.final_output else []
+    
+    bullets = []
+    seen = set()
+    for bullet in variants:
+        bullet = bullet.strip()
+        if bullet and bullet.lower() not in seen:
+            seen.add(bullet.lower())
+            bullets.append(bullet)
+            logger.info(f"{agent_name} bullet {len(bullets)}: {bullet}")
+    
+    if len(bullets) < count:
+        logger.warning(f"{agent_name} returned {len(bullets)} distinct bullets, expected {count}")
+    
+    return bullets[:count]
+
+
+def format_avoid_list(bullets: Sequence[str]) -> str:
+    """Prompt note listing bullets a regeneration must not repeat (empty when there are none)."""
+    if not bullets:
+        return ""
+    listed = "\n".join(f"- {bullet}" for bullet in bullets)
+    return f"ALREADY WRITTEN (do not repeat or rephrase these):\n{listed}\n\n"
+
+
+async def generate_distinct_bullets_as_completed(
+    build_prompt: Callable[[int, List[str]], str],
+    count: int,
+    existing: List[str],
+    agent_name: str,
+    task: str,
+    bypass_cache: bool = False
+) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Generate `count` bullets with one model call each, dropping near-duplicates and regenerating only their slots.
+    
+    Bullets that near-duplicate `existing` or an already accepted bullet (see
+    `app.services.bullet_dedup`) are dropped. Only the dropped slots are
+    generated again, at most BULLET_DEDUP_MAX_REGENERATIONS times, with the
+    bullets to avoid passed to `build_prompt` and the response cache bypassed
+    (a cached response would be the same duplicate). Slots that are still
+    duplicates after the last attempt are left out.
+    
+    Args:
+        build_prompt: (slot index, bullets to avoid) -> prompt for that slot
+        count: Number of bullets wanted
+        existing: The item's current bullets (all of them, not only those in the prompt)
+        agent_name: Agent name (shared by all bullets, so the agent is reused)
+        task: Routing table task that picks the model and temperature
+        bypass_cache: Skip the LLM response cache (intentional regeneration)
+        
+    Yields:
+        (slot index, accepted bullet) in completion order
+    """
+    bullet_filter = BulletFilter(existing, agent_name)
+    slots = list(range(count))
+    attempt = 0
+    while True:
+        avoid = bullet_filter.accepted + bullet_filter.rejected if attempt else []
+        duplicated = []
+        filled = 0
+        try:
+            async for i, bullet in generate_bullets_as_completed(
+                [build_prompt(slot, avoid) for slot in slots], agent_name, task, bypass_cache or attempt > 0
+            ):
+                if bullet_filter.accept(bullet):
+                    filled += 1
+                    yield slots[i], bullet
+                else:
+                    duplicated.append(slots[i])
+        except Exception as e:
+            if not attempt:
+                raise
+            # Keep the bullets accepted so far (already returned) and give up on the rest
+            logger.warning(f"{agent_name}: regenerating {len(slots)} duplicate slot(s) failed: {e}")
+            bullet_dedup_meter.record_unfilled(agent_name, len(slots) - filled)
+            return
+        if not duplicated:
+            return
+        if attempt >= settings.BULLET_DEDUP_MAX_REGENERATIONS:
+            logger.warning(f"{agent_name}: {len(duplicated)} of {count} bullets left out as near-duplicates")
+            bullet_dedup_meter.record_unfilled(agent_name, len(duplicated))
+            return
+        attempt += 1
+        bullet_dedup_meter.record_regenerated(agent_name, len(duplicated))
+        slots = sorted(duplicated)
+
+
+async def generate_distinct_bullets_concurrently(
+    build_prompt: Callable[[int, List[str]], str],
+    count: int,
+    existing: List[str],
+    agent_name: str,
+    task: str,
+    bypass_cache: bool = False
+) -> List[str]:
+    """
+    Like `generate_distinct_bullets_as_completed`, collecting the bullets in slot order.
+    
+    Returns:
+        Up to `count` bullets that are not near-duplicates of `existing` or of each other
+    """
+    completed = [
+        pair async for pair in generate_distinct_bullets_as_completed(build_prompt, count, existing, agent_name, task, bypass_cache)
+    ]
+    return [bullet for _, bullet in sorted(completed)]
+
+
+async def generate_distinct_bullets_single_call(
+    build_prompt: Callable[[int, List[str]], str],
+    count: int,
+    existing: List[str],
+    agent_name: str,
+    bypass_cache: bool = False
+) -> List[str]:
+    """
+    Generate `count` bullets with one schema-enforced call, regenerating only as many as were near-duplicates.
+    
+    See `generate_distinct_bullets_as_completed` for the filtering; here each
+    regeneration is one call asking for the missing number of bullets.
+    
+    Args:
+        build_prompt: (number of bullets, bullets to avoid) -> prompt
+        count: Number of bullets wanted
+        existing: The item's current bullets (all of them, not only those in the prompt)
+        agent_name: Agent name
+        bypass_cache: Skip the LLM response cache (intentional regeneration)
         
-    except Exception as e:
-        logger.error(f"Error saving new pointers: {e}")
-        return False
+    Returns:
+        Up to `count` bullets that are not near-duplicates of `existing` or of each other
+    """
+    bullet_filter = BulletFilter(existing, agent_name)
+    wanted = count
+    for attempt in range(settings.BULLET_DEDUP_MAX_REGENERATIONS + 1):
+        avoid = bullet_filter.accepted + bullet_filter.rejected if attempt else []
+        try:
+            bullets = await generate_bullets_single_call(build_prompt(wanted, avoid), wanted, agent_name, bypass_cache or attempt > 0)
+        except Exception as e:
+            if not attempt:
+                raise
+            logger.warning(f"{agent_name}: regenerating {wanted} duplicate bullet(s) failed: {e}")
+            bullet_dedup_meter.record_unfilled(agent_name, wanted)
+            break
+        duplicates = sum(not bullet_filter.accept(bullet) for bullet in bullets)
+        wanted = count - len(bullet_filter.accepted)
+        if not duplicates or wanted <= 0:
+            break
+        if attempt == settings.BULLET_DEDUP_MAX_REGENERATIONS:
+            logger.warning(f"{agent_name}: {wanted} of {count} bullets left out as near-duplicates")
+            bullet_dedup_meter.record_unfilled(agent_name, wanted)
+            break
+        bullet_dedup_meter.record_regenerated(agent_name, wanted)
+    return bullet_filter.accepted
+
+
+def budget_pointers_text(pointers: List[str], job_description: str, label: str) -> str:
+    """Join the bullets most relevant to the JD that fit CONTEXT_BUDGET_BULLETS_TOKENS, one per line."""
+    return "\n".join(context_budgeter.fit_entries(pointers, job_description, settings.CONTEXT_BUDGET_BULLETS_TOKENS, label))
+
+
+def build_experience_context(resume_item: Dict[str, Any], existing_pointers_text: str) -> str:
+    """Experience and existing bullets section of the bullet prompts (the same for every bullet and JD)."""
+    return f"""EXPERIENCE:
+Title: {resume_item.get('title', '')}
+Company: {resume_item.get('organization', '')}
+Description: {resume_item.get('description', '')}
+
+EXISTING BULLETS (make yours different):
+{existing_pointers_text if existing_pointers_text else 'None yet'}"""
+
+
+def build_pointer_chunk_prompt(resume_item: Dict[str, Any], job_description: str, existing_pointers_text: str, index: int, count: int, avoid: Sequence[str] = ()) -> str:
+    """Prompt for ONE bullet of a multi-bullet request (parallel mode); `avoid` lists bullets a regeneration must not repeat."""
+    # The bullet number varies per call, so it goes last to keep the prompt prefix shared
+    return POINTER_CHUNK_PROMPT.render(
+        build_experience_context(resume_item, existing_pointers_text),
+        job_description,
+        f"{format_avoid_list(avoid)}This is bullet point #{index+1} of {count}: focus on a different achievement than the other bullets.\n\nReturn only the bullet point:"
+    )
+
 
+def build_pointer_chunks_batch_prompt(resume_item: Dict[str, Any], job_description: str, existing_pointers_text: str, count: int, avoid: Sequence[str] = ()) -> str:
+    """Prompt for ALL bullets of a multi-bullet request in one call (single-call mode); `avoid` as above."""
+    return POINTER_CHUNKS_BATCH_PROMPT.render(
+        build_experience_context(resume_item, existing_pointers_text),
+        job_description,
+        f'{format_avoid_list(avoid)}Return exactly {count} bullets in the "bullets" array.'
+    )
 
-async def generate_pointer_variations(pointer_id: str, resume_item_id: str, user_id: str, job_description: str, count: int = 3) -> List[str]:
+
+async def generate_pointer_variations(pointer_id: str, resume_item_id: str, user_id: str, job_description: str, count: int = 3, mode: Optional[str] = None, bypass_cache: bool = False) -> List[str]:
     """
     Generate variations of a specific pointer.
     
@@ -116,13 +341,15 @@ async def generate_pointer_variations(pointer_id: str, resume_item_id: str, user
         user_id: User ID
         job_description: Target job description
         count: Number of variations to generate
+        mode: "parallel" or "single_call" (defaults to BULLET_GENERATION_MODE)
+        bypass_cache: Skip the LLM response cache (intentional regeneration)
         
     Returns:
         List of pointer variations
     """
     try:
         # Get resume item with existing pointers
-        resume_item = get_resume_item_with_pointers(resume_item_id)
+        resume_item = await get_resume_item_with_pointers(resume_item_id)
         if not resume_item:
             raise Exception(f"Resume item {resume_item_id} not found")
         
@@ -139,17 +366,13 @@ async def generate_pointer_variations(pointer_id: str, resume_item_id: str, user
         if not original_pointer:
             raise Exception(f"Pointer {pointer_id} not found")
         
-        # Get user's full resume data for context
-        user_data = get_user_resume_data(user_id)
-        
         # Build context
-        other_pointers_text = "\n".join(other_pointers) if other_pointers else "No other pointers"
+        other_pointers_text = budget_pointers_text(other_pointers, job_description, "pointer variations") or "No other pointers"
         
-        variations = []
-        
-        for i in range(count):
-            prompt = f"""
-            You are a resume optimization expert. Generate variation #{i+1} of this bullet point.
+        if (mode or settings.BULLET_GENERATION_MODE) == BULLET_MODE_SINGLE_CALL:
+            def build_batch_prompt(n: int, avoid: List[str]) -> str:
+                return f"""
+            You are a resume optimization expert. Generate {n} distinct variations of this bullet point.
             
             Original Pointer to Improve:
             "{original_pointer['content']}"
@@ -169,26 +392,58 @@ async def generate_pointer_variations(pointer_id: str, resume_item_id: str, user
             - Keep the core achievement/skill from the original pointer
             - Tailor the wording to match the job description
             - Make it more impactful and specific
-            - Be different from other pointers in this experience
+            - Be different from other pointers in this experience and from each other
             - Include quantifiable metrics if possible
-            - Return ONLY the bullet point text
             
-            Generate variation #{i+1}:
+            {format_avoid_list(avoid)}Return exactly {n} variations in the "bullets" array.
             """
             
-            agent = ai_client.create_agent(
-                name=f"pointer-variation-{i+1}",
-                model="gpt-4o",
-                tools=[],
-                temperature=0.4
+            return await generate_distinct_bullets_single_call(
+                build_prompt=build_batch_prompt,
+                count=count,
+                existing=other_pointers,
+                agent_name="pointer-variation",
+                bypass_cache=bypass_cache
             )
+        
+        def build_prompt(i: int, avoid: List[str]) -> str:
+            return f"""
+            You are a resume optimization expert. Generate variation #{i+1} of this bullet point.
+            
+            Original Pointer to Improve:
+            "{original_pointer['content']}"
+            
+            Current Experience Details:
+            Title: {resume_item.get('title', '')}
+            Organization: {resume_item.get('organization', '')}
+            Description: {resume_item.get('description', '')}
+            
+            Other Pointers in this Experience (for context, avoid duplication):
+            {other_pointers_text}
             
-            result = await ai_client.run_agent(agent, prompt)
-            variation = str(result.final_output).strip() if result.final_output else ''
+            Target Job Description:
+            {job_description}
             
-            if variation:
-                variations.append(variation)
-                logger.info(f"Generated pointer variation {i+1}: {variation[:80]}...")
+            Requirements:
+            - Keep the core achievement/skill from the original pointer
+            - Tailor the wording to match the job description
+            - Make it more impactful and specific
+            - Be different from other pointers in this experience
+            - Include quantifiable metrics if possible
+            - Return ONLY the bullet point text
+            
+            {format_avoid_list(avoid)}Generate variation #{i+1}:
+            """
+        
+        # Variations rephrase the original, so only the other pointers and each other count as duplicates
+        variations = await generate_distinct_bullets_concurrently(
+            build_prompt=build_prompt,
+            count=count,
+            existing=other_pointers,
+            agent_name="pointer-variation",
+            task=TASK_BULLET_REWRITE,
+            bypass_cache=bypass_cache
+        )
         
         return variations
         
@@ -211,20 +466,23 @@ async def generate_single_pointer_with_context(resume_item_id: str, user_id: str
     """
     try:
         # Get resume item with existing pointers
-        resume_item = get_resume_item_with_pointers(resume_item_id)
+        resume_item = await get_resume_item_with_pointers(resume_item_id)
         if not resume_item:
             raise Exception(f"Resume item {resume_item_id} not found")
         
         # Get user's full resume data for context
-        user_data = get_user_resume_data(user_id)
+        user_data = await get_user_resume_data(user_id)
         
-        # Build context from existing pointers and other experiences
-        existing_pointers_text = "\n".join([p["content"] for p in resume_item.get("existing_pointers", [])])
+        # Build context from existing pointers and other experiences (the most JD-relevant within budget)
+        existing_pointers_text = budget_pointers_text(
+            [p["content"] for p in resume_item.get("existing_pointers", [])], job_description, "single pointer existing bullets"
+        )
         other_experiences = [item for item in user_data.get("resume_items", []) if item["id"] != resume_item_id]
-        other_pointers_text = "\n".join([
-            p["content"] for item in other_experiences 
-            for p in item.get("existing_pointers", [])
-        ])
+        other_pointers_text = budget_pointers_text(
+            [p["content"] for item in other_experiences for p in item.get("existing_pointers", [])],
+            job_description,
+            "single pointer other bullets"
+        )
         
         # Create a comprehensive prompt
         prompt = f"""
@@ -257,16 +515,8 @@ async def generate_single_pointer_with_context(resume_item_id: str, user_id: str
         Generate the bullet point:
         """
         
-        # Create agent for pointer generation
-        agent = ai_client.create_agent(
-            name="contextual-pointer-generator",
-            model="gpt-4o",
-            tools=[],
-            temperature=0.4
-        )
-        
-        # Run the agent
-        result = await ai_client.run_agent(agent, prompt)
+        # Run the agent (model and temperature come from the routing table)
+        result = await ai_client.run_task(TASK_BULLET_REWRITE, "contextual-pointer-generator", prompt)
         
         # Extract the generated pointer
         pointer = str(result.final_output).strip() if result.final_output else ''
@@ -279,107 +529,154 @@ async def generate_single_pointer_with_context(resume_item_id: str, user_id: str
         raise Exception(f"Failed to generate pointer: {str(e)}")
 
 
-async def generate_pointer_chunks_with_context(resume_item_id: str, user_id: str, job_description: str, count: int = 3) -> List[str]:
+async def generate_pointer_chunks_with_context(resume_item_id: str, user_id: str, job_description: str, count: int = 3, mode: Optional[str] = None, bypass_cache: bool = False) -> List[str]:
     """
     Generate multiple distinct bullet points for an experience using database context.
     
+    Near-duplicates of the item's bullets or of each other are dropped and only
+    their slots regenerated (see `generate_distinct_bullets_as_completed`).
+    
     Args:
         resume_item_id: ID of the resume item
-        user_id: User ID
+        user_id: User ID (the prompt only uses this item's own bullets)
         job_description: Target job description
         count: Number of pointers to generate (default 3)
+        mode: "parallel" or "single_call" (defaults to BULLET_GENERATION_MODE)
+        bypass_cache: Skip the LLM response cache (intentional regeneration)
         
     Returns:
         List of generated bullet points
     """
     try:
         # Get resume item with existing pointers
-        resume_item = get_resume_item_with_pointers(resume_item_id)
+        resume_item = await get_resume_item_with_pointers(resume_item_id)
         if not resume_item:
             raise Exception(f"Resume item {resume_item_id} not found")
         
-        # Get user's full resume data for context
-        user_data = get_user_resume_data(user_id)
-        
-        # Build context
-        existing_pointers_text = "\n".join([p["content"] for p in resume_item.get("existing_pointers", [])])
-        other_experiences = [item for item in user_data.get("resume_items", []) if item["id"] != resume_item_id]
-        other_pointers_text = "\n".join([
-            p["content"] for item in other_experiences 
-            for p in item.get("existing_pointers", [])
-        ])
-        
-        pointers = []
-        
-        for i in range(count):
-            # Add variation to each prompt to get distinct pointers
-            variation_prompt = f"""Write bullet point #{i+1} of {count} for this experience, optimized for the job description.
-
-EXPERIENCE:
-Title: {resume_item.get('title', '')}
-Company: {resume_item.get('organization', '')}
-Description: {resume_item.get('description', '')}
-
-JOB DESCRIPTION:
-{job_description}
-
-EXISTING BULLETS (make yours different):
-{existing_pointers_text if existing_pointers_text else 'None yet'}
-
-IMPORTANT: Tailor this bullet to the job description above. Include numbers where possible.
-
-RULES:
-- Highlight tech mentioned in the job description
-- Include numbers/metrics when possible (users, %, time, services, count)
-- Use specific tech stacks (Python/FastAPI, Docker, AWS, etc.)
-- Make it different from existing bullets above
-- Show concrete impact
-
-GOOD: "Built full-stack API using Python/FastAPI and PostgreSQL serving 10K+ users"
-GOOD: "Reduced deployment time by 35% through Docker containerization of 4 services"
-GOOD: "Collaborated with teams to design AWS infrastructure handling 5K+ requests/day"
-BAD: "Developed applications using various technologies" (vague, no metrics, not job-specific)
-
-Return only the bullet point:"""
-            
-            agent = ai_client.create_agent(
-                name=f"contextual-pointer-generator-{i+1}",
-                model="gpt-4",
-                tools=[],
-                temperature=0.5  # Balanced for good bullets with metrics
+        # Only this item's bullets go into the prompt (the most JD-relevant within budget);
+        # new bullets are checked for near-duplicates against all of them
+        existing = [p["content"] for p in resume_item.get("existing_pointers", [])]
+        existing_pointers_text = budget_pointers_text(existing, job_description, "pointer chunks")
+        
+        if (mode or settings.BULLET_GENERATION_MODE) == BULLET_MODE_SINGLE_CALL:
+            return await generate_distinct_bullets_single_call(
+                build_prompt=lambda n, avoid: build_pointer_chunks_batch_prompt(resume_item, job_description, existing_pointers_text, n, avoid),
+                count=count,
+                existing=existing,
+                agent_name="contextual-pointer-generator",
+                bypass_cache=bypass_cache
             )
-            
-            result = await ai_client.run_agent(agent, variation_prompt)
-            pointer = str(result.final_output).strip() if result.final_output else ''
-            
-            if pointer:
-                pointers.append(pointer)
-                logger.info(f"Generated contextual pointer {i+1}: {pointer}")
+        
+        pointers = await generate_distinct_bullets_concurrently(
+            build_prompt=lambda i, avoid: build_pointer_chunk_prompt(resume_item, job_description, existing_pointers_text, i, count, avoid),
+            count=count,
+            existing=existing,
+            agent_name="contextual-pointer-generator",
+            task=TASK_BULLET_VARIANT,
+            bypass_cache=bypass_cache
+        )
         
         return pointers
         
+    except LLMOverloadedError:
+        raise
     except Exception as e:
         logger.error(f"Error generating contextual pointer chunks: {e}")
         raise Exception(f"Failed to generate pointer chunks: {str(e)}")
 
 
-async def generate_full_resume_with_single_call(user_data: Dict[str, Any], job_description: str) -> Dict[str, Any]:
+async def stream_pointer_chunks_with_context(resume_item_id: str, job_description: str, count: int = 3, mode: Optional[str] = None, bypass_cache: bool = False) -> AsyncIterator[str]:
     """
-    Generate complete optimized resume with a SINGLE AI call using structured output.
+    Streaming variant of `generate_pointer_chunks_with_context`.
+    
+    In parallel mode each bullet is yielded as soon as its model call finishes
+    (so the first one arrives after the fastest call, not the slowest). In
+    single_call mode all bullets come from one call and are yielded together.
+    Near-duplicates are never yielded; their slots are regenerated and follow
+    (see `generate_distinct_bullets_as_completed`).
     
     Args:
-        user_data: Complete user resume data from database
+        resume_item_id: ID of the resume item
         job_description: Target job description
+        count: Number of pointers to generate (default 3)
+        mode: "parallel" or "single_call" (defaults to BULLET_GENERATION_MODE)
+        bypass_cache: Skip the LLM response cache (intentional regeneration)
         
-    Returns:
-        Complete resume structure ready for frontend
+    Yields:
+        Generated bullet points in completion order
     """
-    try:
-        # Build comprehensive context
-        user_info = user_data.get("user", {})
-        resume_items = user_data.get("resume_items", [])
-        skills = user_data.get("skills", [])
-        
+    resume_item = await get_resume_item_with_pointers(resume_item_id)
+    if not resume_item:
+        raise Exception(f"Resume item {resume_item_id} not found")
+    
+    existing = [p["content"] for p in resume_item.get("existing_pointers", [])]
+    existing_pointers_text = budget_pointers_text(existing, job_description, "pointer chunks")
+    
+    if (mode or settings.BULLET_GENERATION_MODE) == BULLET_MODE_SINGLE_CALL:
+        bullets = await generate_distinct_bullets_single_call(
+            build_prompt=lambda n, avoid: build_pointer_chunks_batch_prompt(resume_item, job_description, existing_pointers_text, n, avoid),
+            count=count,
+            existing=existing,
+            agent_name="contextual-pointer-generator",
+            bypass_cache=bypass_cache
+        )
+        for bullet in bullets:
+            yield bullet
+        return
+    
+    async for _, bullet in generate_distinct_bullets_as_completed(
+        build_prompt=lambda i, avoid: build_pointer_chunk_prompt(resume_item, job_description, existing_pointers_text, i, count, avoid),
+        count=count,
+        existing=existing,
+        agent_name="contextual-pointer-generator",
+        task=TASK_BULLET_VARIANT,
+        bypass_cache=bypass_cache
+    ):
+        yield bullet
+
+
+def empty_full_resume() -> Dict[str, Any]:
+    """Full resume result with no selections (used when the AI output is unusable)."""
+    return {"selected_skills": [], "selected_experiences": [], "selected_projects": []}
+
+
+class CandidateSection:
+    """
+    Candidate part of the full resume prompt, built once per profile.
+    
+    The skills text and the relevance index over the items are built once.
+    A profile whose items fit CONTEXT_BUDGET_RESUME_ITEMS_TOKENS is sent
+    whole, so its text is the same for every JD and stays in the provider's
+    cached prompt prefix (see `prompt_templates`); shortlisting a few of its
+    items would save fewer tokens than the cache does. Larger profiles are
+    shortlisted and fitted to the budget per JD; their text is rendered per
+    distinct selection and reused for every other JD that keeps the same items.
+    """
+    
+    def __init__(self, user_data: Dict[str, Any]):
+        self.resume_items = user_data.get("resume_items", [])
+        self.skills_text = ", ".join([skill.get("name", "") for skill in user_data.get("skills", [])])
+        self._index = BM25Index([resume_item_text(item) for item in self.resume_items])
+        self._rendered: Dict[Tuple, str] = {}
+        self._fits_budget = estimate_tokens(self._render(self.resume_items)) <= settings.CONTEXT_BUDGET_RESUME_ITEMS_TOKENS
+    
+    def for_job(self, job_description: str) -> str:
+        """Skills, experiences and projects text for one job description."""
+        if self._fits_budget:
+            shortlist = self.resume_items
+        else:
+            # Only the items ranked most relevant locally go to the model
+            shortlist = shortlist_items(self.resume_items, job_description, settings.FULL_RESUME_SHORTLIST_SIZE, self._index)
+        # Keep the items most relevant to the JD within budget (lower-ranked ones condensed or dropped)
+        resume_items = context_budgeter.fit_resume_items(
+            shortlist, job_description, settings.CONTEXT_BUDGET_RESUME_ITEMS_TOKENS, "full resume"
+        )
+        key = tuple((item.get("id"), item.get("description")) for item in resume_items)
+        if key not in self._rendered:
+            self._rendered[key] = self._render(resume_items)
+        return self._rendered[key]
+    
+    def _render(self, resume_items: List[Dict[str, Any]]) -> str:
         # Separate experiences and projects
         experiences = [item for item in resume_items if item.get("item_type") == "experience"]
         projects = [item for item in resume_items if item.get("item_type") == "project"]
@@ -395,122 +692,253 @@ async def generate_full_resume_with_single_call(user_data: Dict[str, Any], job_d
             for item in projects
         ])
         
-        skills_list = [skill.get("name", "") for skill in skills]
-        skills_text = ", ".join(skills_list)
+        return f"""Skills: {self.skills_text}
+Experiences: {experiences_text}
+Projects: {projects_text}"""
+
+
+def build_full_resume_prompt(user_data: Dict[str, Any], job_description: str, candidate: Optional[CandidateSection] = None, local_skills: Optional[List[str]] = None) -> str:
+    """
+    Build the single-call full resume prompt from the user's profile.
+    
+    Args:
+        user_data: Complete user resume data from database
+        job_description: Target job description
+        candidate: Prebuilt candidate section to reuse across job descriptions
+        local_skills: Skills already picked locally (see `select_skills_locally`);
+            None asks the model to pick them as well
         
-        # ULTRA-SIMPLE PROMPT - Less is more
-        prompt = f"""Create a resume optimized for this job. Use the candidate's actual data.
+    Returns:
+        Prompt asking for selected experiences and projects (and skills, without
+        `local_skills`) as JSON
+    """
+    candidate_text = (candidate or CandidateSection(user_data)).for_job(job_description)
+    if local_skills is None:
+        request = FULL_RESUME_PICK_SKILLS_REQUEST
+    else:
+        request = FULL_RESUME_SELECTED_SKILLS_REQUEST.format(skills=", ".join(local_skills))
+    return FULL_RESUME_PROMPT.render(f"CANDIDATE:\n{candidate_text}", job_description, request)
 
-JOB:
-{job_description}
 
-CANDIDATE:
-Skills: {skills_text}
-Experiences: {experiences_text}
-Projects: {projects_text}
-
-YOUR TASK:
-1. Pick 4-8 relevant skills from candidate's list (don't invent new ones)
-2. Select 1-2 best experiences or projects
-3. Write 3-4 strong bullet points for each
-
-IMPORTANT: Match bullets to the job description. Highlight relevant tech and include numbers where possible.
-
-BULLET POINT FORMAT:
-[Action verb] + [what you built/did] + using [relevant tech from job] + [metric/number] + [impact]
-
-RULES:
-- Focus on tech mentioned in the job description
-- Include numbers/metrics in MOST bullets (users, %, time, services, count)
-- Use specific tech stacks (Python/FastAPI, Docker, AWS, etc.)
-- Show concrete impact and results
-
-GOOD EXAMPLES:
-✅ "Built full-stack API using Python/FastAPI and PostgreSQL serving 10K+ users"
-✅ "Reduced deployment time by 35% through Docker containerization of 4 services"
-✅ "Optimized database queries improving response from 500ms to 150ms"
-✅ "Collaborated with product teams to design AWS infrastructure handling 5K+ requests/day"
-
-BAD EXAMPLES:
-❌ "Developed applications using various technologies" (vague, no metrics, not job-specific)
-❌ "Improved system performance" (no tech, no numbers)
-
-Return JSON:
-{{
-  "selected_skills": ["Python", "Docker", ...],
-  "selected_experiences": [
-    {{"title": "...", "company": "...", "points": ["...", "...", "..."]}}
-  ],
-  "selected_projects": [
-    {{"title": "...", "points": ["...", "...", "..."]}}
-  ]
-}}"""
-        
-        agent = ai_client.create_agent(
-            name="resume-optimizer",
-            model="gpt-4",  # Using GPT-4 for better quality
-            tools=[],
-            temperature=0.5  # Balanced - enough creativity for good bullets, still grounded
-        )
+def get_full_resume_agent():
+    """Agent used for single-call full resume generation (primary model of the full_resume route)."""
+    return ai_client.agent_for_task("resume-optimizer", TASK_FULL_RESUME)
+
+
+def validate_selected_skills(selected_skills: List[str], skills_list: List[str]) -> List[str]:
+    """
+    STRICT validation: selected skills must exist in the candidate's skills.
+    
+    Skills are matched by name or alias ("Postgres" -> "PostgreSQL", "JS" ->
+    "JavaScript", see `app.services.skill_index`), case-insensitively.
+    
+    Args:
+        selected_skills: Skills chosen by the AI
+        skills_list: Skill names from the database
         
-        result = await ai_client.run_agent(agent, prompt)
+    Returns:
+        The selected skills that exist, using the database spelling (without duplicates)
+    """
+    index = skill_index_for(skills_list)
+    valid_skills = []
+    removed = []
+    for ai_skill in selected_skills:
+        db_skill = index.resolve(ai_skill) if isinstance(ai_skill, str) else None
+        if db_skill is None:
+            removed.append(ai_skill)
+        elif db_skill not in valid_skills:
+            valid_skills.append(db_skill)
+    
+    if removed:
+        logger.warning(f"Removed {len(removed)} skills not in the candidate's profile: {removed}")
+    logger.info(f"Skill validation: {len(valid_skills)}/{len(selected_skills)} skills kept")
+    return valid_skills
+
+
+def select_skills_locally(skills_list: List[str], job_description: str) -> Optional[List[str]]:
+    """
+    Pick the candidate's skills that the JD mentions (aliases included), most mentioned first.
+    
+    Returns:
+        Up to LOCAL_SKILL_SELECTION_MAX skills, or None when local selection is
+        disabled or fewer than LOCAL_SKILL_SELECTION_MIN skills match (the
+        model is then asked to pick them, see FULL_RESUME_PICK_SKILLS_REQUEST)
+    """
+    if not settings.LOCAL_SKILL_SELECTION_ENABLED:
+        return None
+    matches = skill_index_for(skills_list).matching_skills(job_description, limit=settings.LOCAL_SKILL_SELECTION_MAX)
+    if len(matches) < settings.LOCAL_SKILL_SELECTION_MIN:
+        return None
+    return matches
+
+
+def parse_full_resume_output(output: str, skills_list: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Parse and validate the model's full resume JSON.
+    
+    Args:
+        output: Raw model output
+        skills_list: Skill names from the database
+        
+    Returns:
+        Parsed resume sections, or None if no JSON could be extracted
+    """
+    import json
+    import re
+    
+    # Extract JSON from response (in case AI adds extra text)
+    json_match = re.search(r'\{.*\}', output, re.DOTALL)
+    if not json_match:
+        logger.error("Failed to parse JSON from AI response")
+        return None
+    parsed = json.loads(json_match.group())
+    
+    # STRIP any extra fields the AI might have added (education, contactInfo, etc.)
+    allowed_fields = {"selected_skills", "selected_experiences", "selected_projects"}
+    extra_fields = set(parsed.keys()) - allowed_fields
+    if extra_fields:
+        logger.warning(f"AI returned extra fields (removing): {extra_fields}")
+        for field in extra_fields:
+            del parsed[field]
+    
+    if "selected_skills" in parsed:
+        parsed["selected_skills"] = validate_selected_skills(parsed["selected_skills"], skills_list)
+    
+    return parsed
+
+
+def find_reusable_full_resume(user_data: Dict[str, Any], job_description: str, bypass_cache: bool):
+    """
+    Look up a stored full resume for a near-duplicate JD (same user and profile version).
+    
+    Returns:
+        (reused result or None, scope to pass to `jd_result_store.remember` or None)
+    """
+    # The profile's user can be None (not just missing), so don't rely on a .get default
+    user_id = (user_data.get("user") or {}).get("id")
+    if not settings.JD_DEDUP_ENABLED or not user_id:
+        return None, None
+    scope = (FULL_RESUME_NAMESPACE, user_id, compute_profile_version(user_data), jd_result_store.signature(job_description))
+    if bypass_cache:
+        return None, scope
+    return jd_result_store.lookup(*scope), scope
+
+
+async def generate_full_resume_with_single_call(user_data: Dict[str, Any], job_description: str, bypass_cache: bool = False, candidate: Optional[CandidateSection] = None) -> Dict[str, Any]:
+    """
+    Generate complete optimized resume with a SINGLE AI call using structured output.
+    
+    Args:
+        user_data: Complete user resume data from database
+        job_description: Target job description
+        bypass_cache: Skip the LLM response cache (intentional regeneration)
+        candidate: Prebuilt candidate section (batch generation for many JDs)
+        
+    Returns:
+        Complete resume structure ready for frontend
+    """
+    try:
+        skills_list = [skill.get("name", "") for skill in user_data.get("skills", [])]
+        
+        # Reuse the result of a near-duplicate JD for the same profile version
+        reused, reuse_scope = find_reusable_full_resume(user_data, job_description, bypass_cache)
+        if reused is not None:
+            return reused
+        
+        local_skills = select_skills_locally(skills_list, job_description)
+        prompt = build_full_resume_prompt(user_data, job_description, candidate, local_skills)
+        result = await ai_client.run_task(
+            TASK_FULL_RESUME, "resume-optimizer", prompt, cache_namespace=FULL_RESUME_NAMESPACE, bypass_cache=bypass_cache
+        )
         output = str(result.final_output) if result.final_output else '{}'
         
         logger.info(f"AI Response: {output[:200]}...")
         
-        # Parse the JSON response
-        import json
-        import re
-        
-        # Extract JSON from response (in case AI adds extra text)
-        json_match = re.search(r'\{.*\}', output, re.DOTALL)
-        if json_match:
-            parsed = json.loads(json_match.group())
-            
-            # STRIP any extra fields the AI might have added (education, contactInfo, etc.)
-            allowed_fields = {"selected_skills", "selected_experiences", "selected_projects"}
-            extra_fields = set(parsed.keys()) - allowed_fields
-            if extra_fields:
-                logger.warning(f"AI returned extra fields (removing): {extra_fields}")
-                for field in extra_fields:
-                    del parsed[field]
-            
-            # STRICT validation: selected_skills must exist in candidate's skills (case-insensitive)
-            if "selected_skills" in parsed:
-                ai_selected_count = len(parsed["selected_skills"])
-                skills_lower_map = {s.lower(): s for s in skills_list}
-                valid_skills = []
-                
-                logger.info(f"Validating skills. Database has: {skills_list}")
-                logger.info(f"AI selected: {parsed['selected_skills']}")
-                
-                for ai_skill in parsed["selected_skills"]:
-                    # Try exact match first
-                    if ai_skill in skills_list:
-                        valid_skills.append(ai_skill)
-                        logger.info(f"  ✓ '{ai_skill}' - exact match")
-                    # Try case-insensitive match
-                    elif ai_skill.lower() in skills_lower_map:
-                        # Use the actual skill name from DB
-                        db_skill = skills_lower_map[ai_skill.lower()]
-                        valid_skills.append(db_skill)
-                        logger.warning(f"  ~ '{ai_skill}' case mismatch - using DB version '{db_skill}'")
-                    else:
-                        logger.error(f"  ✗ '{ai_skill}' HALLUCINATED - NOT in database [{', '.join(skills_list)}]. REMOVING.")
-                
-                parsed["selected_skills"] = valid_skills
-                logger.info(f"Validation complete: {len(valid_skills)}/{ai_selected_count} skills kept, {ai_selected_count - len(valid_skills)} removed")
+        parsed = parse_full_resume_output(output, skills_list)
+        if parsed is None:
+            parsed = empty_full_resume()
         else:
-            logger.error("Failed to parse JSON from AI response")
-            parsed = {"selected_skills": [], "selected_experiences": [], "selected_projects": []}
+            if local_skills is not None:
+                parsed["selected_skills"] = local_skills
+            if reuse_scope is not None:
+                jd_result_store.remember(*reuse_scope, parsed)
         
         logger.info(f"Generated resume with {len(parsed.get('selected_skills', []))} skills, {len(parsed.get('selected_experiences', []))} experiences and {len(parsed.get('selected_projects', []))} projects")
         
         return parsed
         
+    except LLMOverloadedError:
+        raise
     except Exception as e:
         logger.error(f"Error generating full resume with single call: {e}")
-        return {"selected_skills": [], "selected_experiences": [], "selected_projects": []}
+        return empty_full_resume()
+
+
+async def stream_full_resume_with_single_call(user_data: Dict[str, Any], job_description: str, bypass_cache: bool = False) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Streaming variant of `generate_full_resume_with_single_call`.
+    
+    Sections are yielded as soon as the model's JSON contains them:
+    ("skills", validated skill list), then one ("experience", dict) or
+    ("project", dict) per selected item, and finally ("result", parsed) with
+    the complete validated result (the same shape the blocking call returns).
+    Skills picked locally (see `select_skills_locally`) are yielded before
+    the model call starts.
+    
+    Args:
+        user_data: Complete user resume data from database
+        job_description: Target job description
+        bypass_cache: Skip the LLM response cache (intentional regeneration)
+        
+    Yields:
+        (section, value) tuples
+    """
+    skills_list = [skill.get("name", "") for skill in user_data.get("skills", [])]
+    
+    reused, reuse_scope = find_reusable_full_resume(user_data, job_description, bypass_cache)
+    if reused is not None:
+        yield "skills", reused.get("selected_skills", [])
+        for experience in reused.get("selected_experiences", []):
+            yield "experience", experience
+        for project in reused.get("selected_projects", []):
+            yield "project", project
+        yield "result", reused
+        return
+    
+    # Skills picked locally are sent before the model call starts
+    local_skills = select_skills_locally(skills_list, job_description)
+    if local_skills is not None:
+        yield "skills", local_skills
+    
+    prompt = build_full_resume_prompt(user_data, job_description, local_skills=local_skills)
+    agent = get_full_resume_agent()
+    parser = StreamingJSONParser()
+    streamed_sections = {"selected_experiences": "experience", "selected_projects": "project"}
+    
+    async for delta in ai_client.stream_agent_text(agent, prompt, cache_namespace=FULL_RESUME_NAMESPACE, bypass_cache=bypass_cache):
+        for kind, key, value in parser.feed(delta):
+            if kind == FIELD_EVENT and key == "selected_skills" and isinstance(value, list):
+                if local_skills is None:
+                    yield "skills", validate_selected_skills(value, skills_list)
+            elif kind == ITEM_EVENT and key in streamed_sections and isinstance(value, dict):
+                yield streamed_sections[key], value
+    
+    # Bad model output ends the stream with an empty result, like the blocking call
+    try:
+        parsed = parse_full_resume_output(parser.text, skills_list)
+    except ValueError as e:  # includes json.JSONDecodeError
+        logger.error(f"Error parsing streamed full resume: {e}")
+        parsed = None
+    if parsed is None:
+        parsed = empty_full_resume()
+    else:
+        if local_skills is not None:
+            parsed["selected_skills"] = local_skills
+        if reuse_scope is not None:
+            jd_result_store.remember(*reuse_scope, parsed)
+    
+    logger.info(f"Streamed resume with {len(parsed.get('selected_skills', []))} skills, {len(parsed.get('selected_experiences', []))} experiences and {len(parsed.get('selected_projects', []))} projects")
+    yield "result", parsed
 
 
 async def select_best_pointers(all_pointers: List[str], job_description: str, limit: int = 3) -> List[str]:
@@ -550,14 +978,7 @@ async def select_best_pointers(all_pointers: List[str], job_description: str, li
         Selected bullet point numbers:
         """
         
-        agent = ai_client.create_agent(
-            name="pointer-selector",
-            model="gpt-4o",
-            tools=[],
-            temperature=0.3
-        )
-        
-        result = await ai_client.run_agent(agent, prompt)
+        result = await ai_client.run_task(TASK_SELECTION, "pointer-selector", prompt)
         output = str(result.final_output) if result.final_output else ''
         
         # Parse the selected indices
@@ -585,77 +1006,31 @@ async def select_relevant_experiences_with_context(user_data: Dict[str, Any], jo
     """
     Select and rank relevant experiences using database context.
     
+    Items are ranked locally with BM25 against the job description (see
+    `app.services.relevance`); no model call is made.
+    
     Args:
         user_data: User's complete resume data from database
         job_description: Target job description
+        limit: Max experiences to return (default 5)
         
     Returns:
-        List of selected experiences with scores and reasons
+        List of selected experiences with scores (0-100, relative to the best match) and reasons
     """
     try:
-        resume_items = user_data.get("resume_items", [])
-        if not resume_items:
-            return []
-        
-        # Build context for AI selection
-        experiences_text = "\n".join([
-            f"Experience {i+1}: {item.get('title', '')} at {item.get('organization', '')} - {item.get('description', '')}"
-            for i, item in enumerate(resume_items)
-        ])
-        
-        prompt = f"""
-        You are a resume optimization expert. Analyze these experiences and select the top 3-5 most relevant for this job.
-        
-        Available Experiences:
-        {experiences_text}
-        
-        Target Job Description:
-        {job_description}
+        ranked = rank_resume_items(user_data.get("resume_items", []), job_description)
         
-        Requirements:
-        - Select 3-5 most relevant experiences
-        - Rank them by relevance (0-100 score)
-        - Provide clear reasoning for each selection
-        - Focus on experiences that match job requirements
-        
-        Return in this format:
-        - Experience 1: [score: X, reason: "...", id: "resume_item_id"]
-        - Experience 2: [score: Y, reason: "...", id: "resume_item_id"]
-        - etc.
-        """
-        
-        agent = ai_client.create_agent(
-            name="experience-selector",
-            model="gpt-4o",
-            tools=[],
-            temperature=0.3
-        )
-        
-        result = await ai_client.run_agent(agent, prompt)
-        output = str(result.final_output) if result.final_output else ''
-        
-        # Parse the AI response to extract selected experiences
-        selected_experiences = []
-        
-        # Simple parsing - in production, you might want more robust parsing
-        for item in resume_items:
-            # For now, include all experiences with a basic relevance score
-            # In production, you'd parse the AI response more carefully
-            selected_experiences.append({
+        selected_experiences = [
+            {
                 "id": item["id"],
-                "score": 85,  # Placeholder score
-                "reason": f"Relevant experience in {item.get('title', '')}",
+                "score": score,
+                "reason": f"Matches job terms: {', '.join(terms)}" if terms else "No job terms matched",
                 "data": item
-            })
-        
-        # Sort by score and return top experiences
-        selected_experiences.sort(key=lambda x: x["score"], reverse=True)
-        
-        # Apply limit if specified
-        if limit:
-            return selected_experiences[:limit]
+            }
+            for item, score, terms in ranked
+        ]
         
-        return selected_experiences[:5]  # Default: Return top 5
+        return selected_experiences[:limit or 5]
         
     except Exception as e:
         logger.error(f"Error selecting relevant experiences: {e}")
@@ -700,14 +1075,7 @@ async def generate_summary_pointers(user_data: Dict[str, Any], job_description:
         Return each phrase on a separate line.
         """
         
-        agent = ai_client.create_agent(
-            name="summary-generator",
-            model="gpt-4o",
-            tools=[],
-            temperature=0.4
-        )
-        
-        result = await ai_client.run_agent(agent, prompt)
+        result = await ai_client.run_task(TASK_SUMMARY, "summary-generator", prompt)
         output = str(result.final_output) if result.final_output else ''
         
         # Split into lines and clean up
@@ -761,16 +1129,8 @@ async def generate_single_pointer(experience: Dict[str, Any], job_description: s
         Generate the bullet point:
         """
         
-        # Create agent for pointer generation
-        agent = ai_client.create_agent(
-            name="pointer-generator",
-            model="gpt-4o",
-            tools=[],
-            temperature=0.4
-        )
-        
-        # Run the agent
-        result = await ai_client.run_agent(agent, prompt)
+        # Run the agent (model and temperature come from the routing table)
+        result = await ai_client.run_task(TASK_BULLET_REWRITE, "pointer-generator", prompt)
         
         # Extract the generated pointer
         pointer = str(result.final_output).strip() if result.final_output else ''
@@ -796,11 +1156,9 @@ async def generate_pointer_array(experience: Dict[str, Any], job_description: st
         List of generated bullet points
     """
     try:
-        pointers = []
-        
-        for i in range(count):
+        def build_prompt(i: int) -> str:
             # Add variation to each prompt to get distinct pointers
-            variation_prompt = f"""
+            return f"""
             Generate bullet point #{i+1} of {count} for this experience.
             Make it different from the previous ones and focus on different aspects.
             
@@ -810,20 +1168,12 @@ async def generate_pointer_array(experience: Dict[str, Any], job_description: st
             Focus on different achievements, skills, or impacts for this pointer.
             Return ONLY the bullet point text.
             """
-            
-            agent = ai_client.create_agent(
-                name=f"pointer-generator-{i+1}",
-                model="gpt-4o",
-                tools=[],
-                temperature=0.4
-            )
-            
-            result = await ai_client.run_agent(agent, variation_prompt)
-            pointer = str(result.final_output).strip() if result.final_output else ''
-            
-            if pointer:
-                pointers.append(pointer)
-                logger.info(f"Generated pointer {i+1}: {pointer}")
+        
+        pointers = await generate_bullets_concurrently(
+            prompts=[build_prompt(i) for i in range(count)],
+            agent_name="pointer-generator",
+            task=TASK_BULLET_REWRITE
+        )
         
         return pointers
         
@@ -834,7 +1184,10 @@ async def generate_pointer_array(experience: Dict[str, Any], job_description: st
 
 async def select_relevant_experiences(resume_data: Dict[str, List[Dict[str, Any]]], job_description: str) -> List[Dict[str, Any]]:
     """
-    Use AI to select and rank the most relevant experiences for the job.
+    Select and rank the most relevant experiences for the job.
+    
+    Experiences are ranked locally with BM25 against the job description
+    (see `app.services.relevance`); no model call is made.
     
     Args:
         resume_data: Resume data containing projects and roles
@@ -852,49 +1205,19 @@ async def select_relevant_experiences(resume_data: Dict[str, List[Dict[str, Any]
         if not all_experiences:
             return []
         
-        prompt = f"""
-        You are an AI resume optimization expert. Analyze these experiences and select the top 3-5 most relevant ones for the job description.
-        
-        Available Experiences:
-        {all_experiences}
+        index = BM25Index([" ".join(str(value) for value in experience.values()) for experience in all_experiences])
+        scores = index.scores(job_description)
+        percents = to_percent(scores)
+        ranked = sorted(range(len(all_experiences)), key=lambda i: -scores[i])[:5]  # Top 5
         
-        Target Job Description:
-        {job_description}
-        
-        For each selected experience, provide:
-        1. relevance_score (0-100)
-        2. selection_reason (brief explanation)
-        3. the original experience data
-        
-        Return your analysis in this format:
-        RELEVANT_EXPERIENCES:
-        - Experience 1: [score: X, reason: "...", data: {...}]
-        - Experience 2: [score: Y, reason: "...", data: {...}]
-        - etc.
-        """
-        
-        agent = ai_client.create_agent(
-            name="experience-selector",
-            model="gpt-4o",
-            tools=[],
-            temperature=0.3
-        )
-        
-        result = await ai_client.run_agent(agent, prompt)
-        output = str(result.final_output) if result.final_output else ''
-        
-        # Parse the AI response to extract selected experiences
-        # This is a simplified parser - you might want to make it more robust
         selected_experiences = []
-        
-        # For now, return all experiences with dummy scores
-        # In a production system, you'd parse the AI response properly
-        for i, experience in enumerate(all_experiences[:5]):  # Top 5
+        for i in ranked:
+            terms = index.matched_terms(i, job_description)
             selected_experiences.append({
                 'id': f"experience_{i}",
-                'relevance_score': 95 - (i * 10),  # Decreasing scores
-                'selection_reason': f"Relevant to job requirements based on AI analysis",
-                'data': experience
+                'relevance_score': percents[i],
+                'selection_reason': f"Matches job terms: {', '.join(terms)}" if terms else "No job terms matched",
+                'data': all_experiences[i]
             })
         
         logger.info(f"Selected {len(selected_experiences)} relevant experiences")
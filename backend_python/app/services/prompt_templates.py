@@ -0,0 +1,158 @@
+"""Prompt templates laid out for provider-side prompt caching.
+
+OpenAI caches prompt prefixes automatically: once a prompt of at least 1024
+tokens has been seen, a later prompt that starts with the same tokens is
+billed at a discount for that prefix and starts faster. Only a byte-identical
+beginning counts, so every template renders its parts from most to least
+stable:
+
+1. static instructions (task, rules, examples, output format), the same for
+   every call,
+2. the candidate context, the same for every job a profile (or resume item)
+   is tailored to,
+3. the job description,
+4. the per-call request (e.g. which of several bullets to write).
+
+How often the prefix is actually served from cache is reported per agent in
+`GET /health/llm` (see `app.services.token_usage`).
+
+The pointer prompts get little from this. Their instructions are about 200
+tokens, and with one item and its bullets the part shared between jobs stays
+under the 1024-token minimum, so nothing is cached across jobs. Within one
+request, the parallel calls for the same item differ only in the final
+request line, so they are cached when the job description is long enough to
+carry the shared part past 1024 tokens (roughly 600+ tokens of JD). Padding
+the instructions up to the minimum would add tokens to every call to get a
+discount on part of them, so they are kept short.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """Static instructions followed by context, job description and request, in that order."""
+    instructions: str
+
+    def render(self, context: str, job_description: str, request: str) -> str:
+        """Prompt for one call.
+
+        Args:
+            context: Candidate data (includes its own section headings)
+            job_description: Target job description
+            request: Per-call ask, placed last
+        """
+        return f"{self.instructions}\n\n{context}\n\nJOB DESCRIPTION:\n{job_description}\n\n{request}"
+
+
+# One template whether or not skills were picked locally (see
+# `pointer_service.select_skills_locally`), so the instruction prefix is the same
+# for every job; the skills instruction goes in the request, after the job description
+FULL_RESUME_PROMPT = PromptTemplate("""Create a resume optimized for the job description below. Use the candidate's actual data.
+
+YOUR TASK:
+1. Select 1-2 best experiences or projects
+2. Write 3-4 strong bullet points for each
+3. Follow the skills instruction at the end
+
+IMPORTANT: Match bullets to the job description. Highlight relevant tech and include numbers where possible.
+
+BULLET POINT FORMAT:
+[Action verb] + [what you built/did] + using [relevant tech from job] + [metric/number] + [impact]
+
+RULES:
+- Focus on tech mentioned in the job description
+- Include numbers/metrics in MOST bullets (users, %, time, services, count)
+- Use specific tech stacks (Python/FastAPI, Docker, AWS, etc.)
+- Show concrete impact and results
+
+GOOD EXAMPLES:
+✅ "Built full-stack API using Python/FastAPI and PostgreSQL serving 10K+ users"
+✅ "Reduced deployment time by 35% through Docker containerization of 4 services"
+✅ "Optimized database queries improving response from 500ms to 150ms"
+✅ "Collaborated with product teams to design AWS infrastructure handling 5K+ requests/day"
+
+BAD EXAMPLES:
+❌ "Developed applications using various technologies" (vague, no metrics, not job-specific)
+❌ "Improved system performance" (no tech, no numbers)
+
+Return JSON:
+{
+  "selected_experiences": [
+    {"title": "...", "company": "...", "points": ["...", "...", "..."]}
+  ],
+  "selected_projects": [
+    {"title": "...", "points": ["...", "...", "..."]}
+  ]
+}""")
+
+# Full resume requests: skills picked locally, or (too few matched) picked by the model
+FULL_RESUME_SELECTED_SKILLS_REQUEST = """SKILLS: Already selected for this job: {skills}. Do not return skills.
+
+Return the JSON for this job:"""
+
+FULL_RESUME_PICK_SKILLS_REQUEST = """SKILLS: Pick 4-8 relevant skills from the candidate's list (don't invent new ones) and add them to the JSON as "selected_skills": ["Python", "Docker", ...].
+
+Return the JSON for this job:"""
+
+RESUME_ANALYSIS_PROMPT = PromptTemplate("""Give feedback on how well the candidate's resume below matches the job description at the end.
+
+The resume has already been scored (skills match /40, experience relevance /30, bullet quality /20,
+presentation /10); the scores and the findings behind them come after the job description.
+Do not re-score. Explain the scores to the candidate:
+
+1. What's strong (relevant skills, good experience matches)
+2. What's missing (skills/experience the job needs)
+3. Bullet point quality (are they specific? do they have metrics?)
+4. 2-3 actionable improvement suggestions
+
+Return ONLY valid JSON:
+{
+  "strengths": [
+    "Strong Python and FastAPI experience matches job requirements",
+    "Good metrics in some bullet points"
+  ],
+  "weaknesses": [
+    "Missing AWS experience mentioned in job description",
+    "Some bullet points lack specific metrics"
+  ],
+  "suggestions": [
+    "Add AWS cloud experience to skills and highlight in projects",
+    "Add metrics to all bullet points (users served, time saved, etc.)",
+    "Focus more on backend/API development experience"
+  ]
+}""")
+
+# Pointer prompts are only cached with long job descriptions (see the module docstring)
+POINTER_CHUNK_PROMPT = PromptTemplate("""Write one bullet point for the experience below, optimized for the job description at the end.
+
+IMPORTANT: Tailor the bullet to the job description. Include numbers where possible.
+
+RULES:
+- Highlight tech mentioned in the job description
+- Include numbers/metrics when possible (users, %, time, services, count)
+- Use specific tech stacks (Python/FastAPI, Docker, AWS, etc.)
+- Make it different from the existing bullets
+- Show concrete impact
+
+GOOD: "Built full-stack API using Python/FastAPI and PostgreSQL serving 10K+ users"
+GOOD: "Reduced deployment time by 35% through Docker containerization of 4 services"
+GOOD: "Collaborated with teams to design AWS infrastructure handling 5K+ requests/day"
+BAD: "Developed applications using various technologies" (vague, no metrics, not job-specific)""")
+
+POINTER_CHUNKS_BATCH_PROMPT = PromptTemplate("""Write distinct bullet points for the experience below, optimized for the job description at the end.
+
+IMPORTANT: Tailor every bullet to the job description. Include numbers where possible.
+
+RULES:
+- Highlight tech mentioned in the job description
+- Include numbers/metrics when possible (users, %, time, services, count)
+- Use specific tech stacks (Python/FastAPI, Docker, AWS, etc.)
+- Make them different from the existing bullets AND from each other
+- Each bullet should focus on a different achievement, skill or impact
+- Show concrete impact
+
+GOOD: "Built full-stack API using Python/FastAPI and PostgreSQL serving 10K+ users"
+GOOD: "Reduced deployment time by 35% through Docker containerization of 4 services"
+GOOD: "Collaborated with teams to design AWS infrastructure handling 5K+ requests/day"
+BAD: "Developed applications using various technologies" (vague, no metrics, not job-specific)""")
@@ -0,0 +1,264 @@
+"""Process-wide limiter for outbound LLM calls.
+
+Every model call made through `AIClient` first reserves a slot on the limiter
+of its model. A model limiter combines:
+
+- a concurrency cap (max calls in flight),
+- a token bucket refilled at the model's tokens-per-minute budget (each call
+  reserves an estimate up front and is settled with its real usage), and
+- a pause that is set from the Retry-After of a 429 so queued calls wait it
+  out instead of hitting the API again.
+
+Calls that cannot get a slot wait in FIFO order. When the queue is full or a
+call waits longer than `LLM_QUEUE_TIMEOUT`, `LLMOverloadedError` is raised so
+the API can shed load (503 + Retry-After) instead of piling up requests.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMOverloadedError(Exception):
+    """Raised when a model's call queue is full or a call waited too long for a slot."""
+
+    def __init__(self, model: str, retry_after: float):
+        super().__init__(f"LLM capacity for {model} exhausted, retry after {retry_after:.0f}s")
+        self.model = model
+        self.retry_after = retry_after
+
+
+def parse_model_limits(raw: str) -> Dict[str, Tuple[int, int]]:
+    """Parse "model=concurrency/tokens_per_minute,..." into {model: (concurrency, tpm)}."""
+    limits = {}
+    for entry in raw.split(","):
+        if "=" not in entry:
+            continue
+        model, _, values = entry.partition("=")
+        concurrency, _, tokens_per_minute = values.partition("/")
+        try:
+            limits[model.strip()] = (
+                int(concurrency) if concurrency.strip() else settings.LLM_MAX_CONCURRENT_REQUESTS,
+                int(tokens_per_minute) if tokens_per_minute.strip() else settings.LLM_TOKENS_PER_MINUTE
+            )
+        except ValueError:
+            logger.warning(f"Ignoring invalid LLM_MODEL_LIMITS entry: {entry!r}")
+    return limits
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the Retry-After delay from an OpenAI API error's response headers, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `tokens_per_minute / 60` per second."""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until_available(self, tokens: float) -> float:
+        """Seconds until `tokens` can be taken (requests above capacity wait for a full bucket)."""
+        self._refill()
+        needed = min(tokens, self.capacity) - self.tokens
+        return max(0.0, needed / self.rate)
+
+    def consume(self, tokens: float) -> None:
+        """Take tokens (may go negative when settling a call that used more than reserved)."""
+        self._refill()
+        self.tokens -= tokens
+
+    def refund(self, tokens: float) -> None:
+        """Return tokens reserved but not used."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + tokens)
+
+
+class Reservation:
+    """A granted slot; settle it with the call's real token usage."""
+
+    def __init__(self, limiter: "ModelLimiter", reserved_tokens: int):
+        self._limiter = limiter
+        self.reserved_tokens = reserved_tokens
+
+    def settle(self, used_tokens: int) -> None:
+        """Correct the token bucket once the call's usage is known."""
+        if self._limiter.bucket is None or not used_tokens:
+            return
+        difference = used_tokens - self.reserved_tokens
+        if difference > 0:
+            self._limiter.bucket.consume(difference)
+        else:
+            self._limiter.bucket.refund(-difference)
+        self.reserved_tokens = used_tokens
+
+
+class ModelLimiter:
+    """Concurrency cap + token bucket + Retry-After pause for one model."""
+
+    def __init__(self, model: str, max_concurrency: int, tokens_per_minute: int, max_queue: int, queue_timeout: float):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Serializes waiting for tokens so queued calls are admitted in FIFO order
+        self._admission = asyncio.Lock()
+        self._paused_until = 0.0
+        self.in_flight = 0
+        self.queued = 0
+        self.calls = 0
+        self.rejected = 0
+        self.rate_limited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def pause(self, seconds: float) -> None:
+        """Hold back new calls for `seconds` (e.g. the Retry-After of a 429)."""
+        now = time.monotonic()
+        if self._paused_until <= now:
+            logger.warning(f"LLM calls to {self.model} paused for {seconds:.1f}s after a rate limit response")
+        self._paused_until = max(self._paused_until, now + seconds)
+        self.rate_limited += 1
+
+    @asynccontextmanager
+    async def reserve(self, estimated_tokens: int) -> AsyncIterator[Reservation]:
+        """Wait for a slot (and tokens), hold it for the duration of the block."""
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise LLMOverloadedError(self.model, self._suggested_retry_after())
+
+        started = time.monotonic()
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._admit(estimated_tokens), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise LLMOverloadedError(self.model, self._suggested_retry_after())
+        finally:
+            self.queued -= 1
+
+        waited = time.monotonic() - started
+        self.calls += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        if waited > 1:
+            logger.info(f"LLM call to {self.model} waited {waited:.2f}s for capacity")
+
+        self.in_flight += 1
+        try:
+            yield Reservation(self, estimated_tokens)
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def _admit(self, estimated_tokens: int) -> None:
+        await self._semaphore.acquire()
+        try:
+            async with self._admission:
+                while True:
+                    delay = self._paused_until - time.monotonic()
+                    if self.bucket is not None:
+                        delay = max(delay, self.bucket.time_until_available(estimated_tokens))
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+                if self.bucket is not None:
+                    self.bucket.consume(estimated_tokens)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    def _suggested_retry_after(self) -> float:
+        return max(1.0, self._paused_until - time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, in-flight calls and wait times."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "tokens_per_minute": int(self.bucket.capacity) if self.bucket else None,
+            "tokens_available": int(self.bucket.tokens) if self.bucket else None,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "rate_limited": self.rate_limited,
+            "avg_wait_ms": round(self.total_wait / self.calls * 1000, 1) if self.calls else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "paused_for_s": round(max(0.0, self._paused_until - time.monotonic()), 2)
+        }
+
+
+class LLMRateLimiter:
+    """Registry of per-model limiters, created on first use from settings."""
+
+    def __init__(self):
+        self._limiters: Dict[str, ModelLimiter] = {}
+
+    def for_model(self, model: str) -> ModelLimiter:
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            max_concurrency, tokens_per_minute = parse_model_limits(settings.LLM_MODEL_LIMITS).get(
+                model, (settings.LLM_MAX_CONCURRENT_REQUESTS, settings.LLM_TOKENS_PER_MINUTE)
+            )
+            limiter = ModelLimiter(
+                model=model,
+                max_concurrency=max_concurrency,
+                tokens_per_minute=tokens_per_minute,
+                max_queue=settings.LLM_MAX_QUEUE_SIZE,
+                queue_timeout=settings.LLM_QUEUE_TIMEOUT
+            )
+            self._limiters[model] = limiter
+        return limiter
+
+    def reset(self) -> None:
+        """Drop all limiters (they are rebuilt from the current settings)."""
+        self._limiters.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Stats per model."""
+        return {model: limiter.stats() for model, limiter in self._limiters.items()}
+
+
+# Global outbound LLM limiter
+llm_rate_limiter = LLMRateLimiter()
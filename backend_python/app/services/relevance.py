@@ -0,0 +1,109 @@
+"""Local relevance ranking of resume content against a job description.
+
+Resume items and bullets are scored with Okapi BM25: the JD's terms are the
+query and the user's own items (or bullets) are the corpus, so a term shared
+by every item counts for little and a JD skill that only one item mentions
+counts for a lot. Scoring is deterministic and takes well under a
+millisecond per item, so it can rank and shortlist context before any prompt
+is built instead of asking a model to do it.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+TERM_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the this to we will with you your "
+    "who what when where which while about into over under using used use work working experience team".split()
+)
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def extract_terms(text: str) -> List[str]:
+    """Lowercase terms of a text without stopwords (keeps tokens like c++, c#, node.js)."""
+    return [term.rstrip(".") for term in TERM_PATTERN.findall(text.lower()) if term.rstrip(".") not in STOPWORDS]
+
+
+def resume_item_text(item: Dict[str, Any]) -> str:
+    """Text of a resume item used for ranking: title, organization, description and bullets."""
+    bullets = " ".join(p.get("content", "") for p in item.get("existing_pointers", []))
+    return f"{item.get('title', '')} {item.get('organization') or ''} {item.get('description') or ''} {bullets}"
+
+
+class BM25Index:
+    """BM25 index over a small corpus (one user's items or bullets), built once and queried per JD."""
+
+    def __init__(self, documents: Sequence[str]):
+        self.term_counts = [Counter(extract_terms(document)) for document in documents]
+        self.lengths = [sum(counts.values()) for counts in self.term_counts]
+        self.average_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        document_frequency = Counter(term for counts in self.term_counts for term in counts)
+        n = len(documents)
+        # BM25+ style IDF: never negative, so terms in most documents still count a little
+        self.idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()}
+
+    def scores(self, query: str) -> List[float]:
+        """BM25 score of every document for the query.
+
+        Query terms are weighted by 1 + log(count), so skills the JD repeats
+        weigh more without letting one term dominate.
+        """
+        query_weights = {term: 1 + math.log(count) for term, count in Counter(extract_terms(query)).items() if term in self.idf}
+        results = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / self.average_length) if self.average_length else BM25_K1
+            score = 0.0
+            for term, weight in query_weights.items():
+                tf = counts.get(term)
+                if tf:
+                    score += weight * self.idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+            results.append(score)
+        return results
+
+    def matched_terms(self, index: int, query: str, limit: int = 5) -> List[str]:
+        """The query terms found in a document, most informative (highest IDF) first."""
+        counts = self.term_counts[index]
+        matched = {term for term in extract_terms(query) if term in counts}
+        return sorted(matched, key=lambda term: (-self.idf[term], term))[:limit]
+
+
+def to_percent(scores: List[float]) -> List[int]:
+    """Scale scores to 0-100 relative to the best one (0 for all when nothing matches)."""
+    best = max(scores, default=0.0)
+    return [round(100 * score / best) if best > 0 else 0 for score in scores]
+
+
+def rank_resume_items(items: List[Dict[str, Any]], job_description: str) -> List[Tuple[Dict[str, Any], int, List[str]]]:
+    """Rank resume items by relevance to the JD.
+
+    Returns:
+        (item, score 0-100, matched JD terms) tuples, best first; ties keep the original order
+    """
+    if not items:
+        return []
+    index = BM25Index([resume_item_text(item) for item in items])
+    scores = index.scores(job_description)
+    percents = to_percent(scores)
+    order = sorted(range(len(items)), key=lambda i: -scores[i])
+    return [(items[i], percents[i], index.matched_terms(i, job_description)) for i in order]
+
+
+def shortlist_items(items: List[Dict[str, Any]], job_description: str, limit: int, index: Optional[BM25Index] = None) -> List[Dict[str, Any]]:
+    """Keep the `limit` items most relevant to the JD, in their original order (all of them when limit <= 0).
+
+    Args:
+        items: Resume items
+        job_description: Target job description
+        limit: Max items to keep
+        index: Prebuilt index over `resume_item_text` of the same items (reused across JDs)
+    """
+    if limit <= 0 or len(items) <= limit:
+        return items
+    scores = (index or BM25Index([resume_item_text(item) for item in items])).scores(job_description)
+    kept = sorted(sorted(range(len(items)), key=lambda i: -scores[i])[:limit])
+    return [items[i] for i in kept]
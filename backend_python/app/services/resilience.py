@@ -0,0 +1,192 @@
+"""Failure handling for outbound LLM calls: retries, circuit breaker and hedging.
+
+`AIClient.run_agent` bounds every model call with `LLM_CALL_TIMEOUT` and
+retries transient failures (timeouts, connection errors, 5xx) with full-jitter
+exponential backoff. Each model has:
+
+- a circuit breaker that opens after `LLM_CIRCUIT_FAILURE_THRESHOLD`
+  consecutive transient failures, fails calls fast (503 + Retry-After) for
+  `LLM_CIRCUIT_RESET_SECONDS`, then lets one probe call through, and
+- a window of recent call latencies; for namespaces in `LLM_HEDGE_NAMESPACES`
+  a second (hedge) call is started when the first is slower than the window's
+  `LLM_HEDGE_PERCENTILE`, and whichever finishes first is used.
+
+Rate limit responses (429) are not handled here; see `rate_limiter`.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from openai import APIConnectionError, APIStatusError, RateLimitError
+
+from app.config.settings import settings
+from app.services.rate_limiter import LLMOverloadedError
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying besides 5xx (request timeout, conflict)
+RETRYABLE_STATUS_CODES = {408, 409}
+
+
+class CircuitOpenError(LLMOverloadedError):
+    """Raised instead of calling a model whose circuit breaker is open."""
+
+    def __init__(self, model: str, retry_after: float):
+        super().__init__(model, retry_after)
+        self.args = (f"LLM calls to {model} are failing, circuit open for {retry_after:.0f}s",)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether a failed model call is worth retrying (and counts against the circuit)."""
+    if isinstance(error, RateLimitError):
+        return False
+    if isinstance(error, (asyncio.TimeoutError, APIConnectionError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code >= 500 or error.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open probe -> closed."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, model: str, failure_threshold: int, reset_seconds: float):
+        self.model = model
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the call must not be made right now."""
+        if self.state == self.CLOSED:
+            return
+        remaining = self._opened_at + self.reset_seconds - time.monotonic()
+        if self.state == self.OPEN and remaining <= 0:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            # Let a single probe call through
+            self._probe_in_flight = True
+            return
+        raise CircuitOpenError(self.model, max(1.0, remaining))
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.model} closed after a successful probe")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(
+                    f"Circuit for {self.model} opened after {self.consecutive_failures} consecutive failures, "
+                    f"failing fast for {self.reset_seconds:.0f}s"
+                )
+                self.opened += 1
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Free the half-open probe slot when the probe ended without a verdict (e.g. 4xx, cancel)."""
+        self._probe_in_flight = False
+
+
+class LatencyWindow:
+    """Latencies of the last `size` successful calls."""
+
+    def __init__(self, size: int):
+        self._samples = deque(maxlen=size)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ModelHealth:
+    """Circuit breaker, latency window and retry/hedge counters for one model."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.breaker = CircuitBreaker(model, settings.LLM_CIRCUIT_FAILURE_THRESHOLD, settings.LLM_CIRCUIT_RESET_SECONDS)
+        self.latencies = LatencyWindow(settings.LLM_LATENCY_WINDOW)
+        self.timeouts = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None until enough latencies are known."""
+        if len(self.latencies) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return max(settings.LLM_HEDGE_MIN_DELAY, self.latencies.percentile(settings.LLM_HEDGE_PERCENTILE))
+
+    def stats(self) -> Dict[str, Any]:
+        """Circuit state, latency percentiles and counters."""
+        p50 = self.latencies.percentile(0.5)
+        p95 = self.latencies.percentile(0.95)
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "circuit_opened": self.breaker.opened,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins
+        }
+
+
+class LLMHealthRegistry:
+    """Registry of per-model health, created on first use from settings."""
+
+    def __init__(self):
+        self._models: Dict[str, ModelHealth] = {}
+
+    def for_model(self, model: str) -> ModelHealth:
+        health = self._models.get(model)
+        if health is None:
+            health = ModelHealth(model)
+            self._models[model] = health
+        return health
+
+    def reset(self) -> None:
+        """Drop all state (rebuilt from the current settings)."""
+        self._models.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Stats per model."""
+        return {model: health.stats() for model, health in self._models.items()}
+
+
+# Global per-model LLM health
+llm_health = LLMHealthRegistry()
@@ -0,0 +1,209 @@
+"""Deterministic resume-to-job scoring.
+
+Computes the analysis category scores locally in a few milliseconds:
+
+- skills_match (40): share of the skills the JD mentions (weighted by how
+  often it mentions them) that the candidate lists, aliases included,
+- experience_relevance (30): share of the JD's key terms (weighted by
+  frequency) covered by the few experiences/projects that together cover the
+  most of them (what a tailored resume would show),
+- bullet_quality (20): bullets with a metric, an action verb opening and a
+  readable length,
+- presentation (10): profile completeness (contact, skills, items with
+  descriptions, education).
+
+`build_feedback` turns the findings into rule-based strengths, weaknesses and
+suggestions for the fast analysis mode.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from app.services.relevance import extract_terms, resume_item_text
+from app.services.skill_index import skill_index_for
+
+# Max points per category (they add up to 100)
+SKILLS_MATCH_POINTS = 40
+EXPERIENCE_RELEVANCE_POINTS = 30
+BULLET_QUALITY_POINTS = 20
+PRESENTATION_POINTS = 10
+
+# JD terms considered for experience relevance, and items allowed to cover them
+JD_KEY_TERMS = 25
+RELEVANT_ITEMS = 3
+
+METRIC_PATTERN = re.compile(r"\d|%|\$|\b(?:one|two|three|four|five|six|seven|eight|nine|ten|dozens?|hundreds?|thousands?|millions?)\b", re.IGNORECASE)
+ACTION_VERBS = frozenset(
+    "achieved analyzed architected automated built collaborated configured created cut decreased defined delivered "
+    "deployed designed developed drove eliminated engineered established expanded grew implemented improved "
+    "increased integrated launched led maintained managed mentored migrated modernized optimized orchestrated "
+    "owned partnered piloted prototyped rebuilt redesigned reduced refactored resolved scaled shipped simplified "
+    "spearheaded streamlined tested trained transformed wrote".split()
+)
+BULLET_MIN_WORDS = 8
+BULLET_MAX_WORDS = 30
+
+
+@dataclass
+class ResumeScores:
+    """Category scores and the findings behind them."""
+    category_scores: Dict[str, int]
+    matched_skills: List[str] = field(default_factory=list)
+    missing_skills: List[str] = field(default_factory=list)
+    covered_terms: List[str] = field(default_factory=list)
+    missing_terms: List[str] = field(default_factory=list)
+    top_items: List[str] = field(default_factory=list)
+    bullets: int = 0
+    bullets_with_metrics: int = 0
+    bullets_with_action_verbs: int = 0
+    bullets_too_long: int = 0
+    bullets_too_short: int = 0
+
+    @property
+    def score(self) -> int:
+        return sum(self.category_scores.values())
+
+
+def _jd_key_terms(job_description: str) -> Dict[str, float]:
+    counts = Counter(extract_terms(job_description))
+    return {term: 1 + math.log(count) for term, count in counts.most_common(JD_KEY_TERMS)}
+
+
+def select_covering_items(term_sets: List[set], key_terms: Dict[str, float], limit: int) -> List[int]:
+    """Greedily pick up to `limit` items adding the most uncovered key-term weight each (none if nothing matches)."""
+    picked, covered = [], set()
+    for _ in range(limit):
+        gains = [
+            (sum(weight for term, weight in key_terms.items() if term in terms and term not in covered), -i)
+            for i, terms in enumerate(term_sets) if i not in picked
+        ]
+        best_gain, negative_index = max(gains, default=(0, 0))
+        if best_gain <= 0:
+            break
+        picked.append(-negative_index)
+        covered |= term_sets[-negative_index]
+    return picked
+
+
+def score_bullet(bullet: str) -> Dict[str, bool]:
+    """Quality checks of one bullet: has a metric, opens with an action verb, readable length."""
+    words = bullet.split()
+    first = words[0].lower().strip(",.:;") if words else ""
+    return {
+        "metric": bool(METRIC_PATTERN.search(bullet)),
+        "action_verb": first in ACTION_VERBS,
+        "too_short": len(words) < BULLET_MIN_WORDS,
+        "too_long": len(words) > BULLET_MAX_WORDS,
+    }
+
+
+def score_resume(user_data: Dict[str, Any], job_description: str) -> ResumeScores:
+    """
+    Score how well a profile matches a job description, without a model call.
+
+    Args:
+        user_data: Complete user resume data from database
+        job_description: Target job description
+
+    Returns:
+        Category scores (same keys as the analysis response) and findings
+    """
+    resume_items = user_data.get("resume_items", [])
+    skill_names = [skill.get("name", "") for skill in user_data.get("skills", [])]
+
+    # Skills: JD skill mentions covered by the candidate's skills (aliases included)
+    index = skill_index_for(skill_names)
+    jd_skills = index.extract(job_description)
+    matched = [canonical for canonical in jd_skills if canonical in index.user_skills]
+    missing = [canonical for canonical in jd_skills if canonical not in index.user_skills]
+    if jd_skills:
+        skills_ratio = sum(jd_skills[canonical] for canonical in matched) / sum(jd_skills.values())
+    else:
+        # No known skill in the JD: fall back to its key terms found among the skill names
+        key_terms = _jd_key_terms(job_description)
+        skill_terms = set(extract_terms(" ".join(skill_names)))
+        skills_ratio = sum(w for t, w in key_terms.items() if t in skill_terms) / sum(key_terms.values()) if key_terms else 0.0
+
+    # Experience: JD key terms covered by the best few items together
+    key_terms = _jd_key_terms(job_description)
+    term_sets = [set(extract_terms(resume_item_text(item))) for item in resume_items]
+    picked = select_covering_items(term_sets, key_terms, RELEVANT_ITEMS)
+    item_terms = set().union(*(term_sets[i] for i in picked))
+    covered = [term for term in key_terms if term in item_terms]
+    experience_ratio = sum(key_terms[term] for term in covered) / sum(key_terms.values()) if key_terms else 0.0
+
+    # Bullets: metric, action verb, length
+    checks = [score_bullet(p.get("content", "")) for item in resume_items for p in item.get("existing_pointers", [])]
+    if checks:
+        bullet_ratio = sum(
+            0.4 * check["metric"] + 0.35 * check["action_verb"] + 0.25 * (not check["too_short"] and not check["too_long"])
+            for check in checks
+        ) / len(checks)
+    else:
+        bullet_ratio = 0.0
+
+    # Presentation: profile completeness
+    user_info = user_data.get("user") or {}
+    presentation_checks = [
+        bool(user_info.get("name")) and bool(user_info.get("email")),
+        len(skill_names) >= 5,
+        len(resume_items) >= 2,
+        bool(resume_items) and all(item.get("description") for item in resume_items),
+        bool(user_data.get("education")),
+    ]
+    presentation_ratio = sum(presentation_checks) / len(presentation_checks)
+
+    return ResumeScores(
+        category_scores={
+            "skills_match": round(SKILLS_MATCH_POINTS * skills_ratio),
+            "experience_relevance": round(EXPERIENCE_RELEVANCE_POINTS * experience_ratio),
+            "bullet_quality": round(BULLET_QUALITY_POINTS * bullet_ratio),
+            "presentation": round(PRESENTATION_POINTS * presentation_ratio),
+        },
+        matched_skills=[index.user_skills[canonical] for canonical in matched],
+        missing_skills=missing,
+        covered_terms=covered,
+        missing_terms=[term for term in key_terms if term not in item_terms],
+        top_items=[resume_items[i].get("title", "") for i in picked],
+        bullets=len(checks),
+        bullets_with_metrics=sum(check["metric"] for check in checks),
+        bullets_with_action_verbs=sum(check["action_verb"] for check in checks),
+        bullets_too_long=sum(check["too_long"] for check in checks),
+        bullets_too_short=sum(check["too_short"] for check in checks),
+    )
+
+
+def build_feedback(scores: ResumeScores) -> Dict[str, List[str]]:
+    """Rule-based strengths, weaknesses and suggestions from the scoring findings."""
+    strengths, weaknesses, suggestions = [], [], []
+
+    if scores.matched_skills:
+        strengths.append(f"Skills the job asks for: {', '.join(scores.matched_skills[:6])}")
+    if scores.missing_skills:
+        weaknesses.append(f"Skills in the job description missing from the resume: {', '.join(scores.missing_skills[:6])}")
+        suggestions.append(f"Add {', '.join(scores.missing_skills[:3])} to your skills if you have used them, and show where in your bullets")
+
+    if scores.top_items and scores.covered_terms:
+        strengths.append(f"Most relevant experience: {', '.join(scores.top_items)} (covers {', '.join(scores.covered_terms[:5])})")
+    if scores.missing_terms:
+        weaknesses.append(f"Job requirements not reflected in your experience: {', '.join(scores.missing_terms[:5])}")
+
+    if scores.bullets:
+        without_metrics = scores.bullets - scores.bullets_with_metrics
+        if scores.bullets_with_metrics >= scores.bullets / 2:
+            strengths.append(f"{scores.bullets_with_metrics} of {scores.bullets} bullet points include metrics")
+        if without_metrics:
+            weaknesses.append(f"{without_metrics} of {scores.bullets} bullet points lack specific metrics")
+            suggestions.append("Add numbers to your bullet points (users served, % improvement, time saved, scale)")
+        if scores.bullets_with_action_verbs < scores.bullets:
+            suggestions.append("Start every bullet point with a strong action verb (built, led, reduced, designed)")
+        if scores.bullets_too_long or scores.bullets_too_short:
+            suggestions.append(f"Keep bullet points between {BULLET_MIN_WORDS} and {BULLET_MAX_WORDS} words")
+    else:
+        weaknesses.append("No bullet points yet")
+        suggestions.append("Add 3-4 bullet points with metrics to each experience")
+
+    return {"strengths": strengths, "weaknesses": weaknesses, "suggestions": suggestions[:3]}
@@ -0,0 +1,118 @@
+"""In-flight deduplication ("singleflight") of identical requests.
+
+When the frontend double-submits or a user has two tabs open, the same
+request arrives while the first is still running. Instead of running the
+whole LLM pipeline twice, the second caller waits for the first call's
+result. Only calls that overlap in time are shared; finished results are
+the caches' job.
+
+The shared computation runs in its own task, so one caller disconnecting
+does not cancel it for the others; it is cancelled only when every caller
+has gone away.
+"""
+
+import asyncio
+import functools
+import hashlib
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def text_digest(text: str) -> str:
+    """Short stable digest of a (possibly long) text for use in keys."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+class _Call:
+    """A shared in-flight computation and the number of callers waiting for it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Share one in-flight computation between concurrent callers with the same key."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: {"calls": 0, "coalesced": 0, "abandoned": 0})
+
+    async def do(self, namespace: str, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `fn()` unless an identical call is in flight, then wait for that one's result.
+
+        All callers receive the same result object (or exception), so it must
+        not be mutated.
+
+        Args:
+            namespace: Endpoint name (metrics are kept per namespace)
+            key: Identifies identical calls within the namespace
+            fn: Starts the computation
+
+        Returns:
+            The computation's result
+        """
+        if not settings.SINGLEFLIGHT_ENABLED:
+            return await fn()
+
+        counters = self._counters[namespace]
+        full_key = (namespace, key)
+        call = self._calls.get(full_key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[full_key] = call
+            call.task.add_done_callback(lambda _: self._forget(full_key, call))
+            counters["calls"] += 1
+        else:
+            counters["coalesced"] += 1
+            logger.info(f"{namespace}: joined an identical in-flight request ({call.waiters} already waiting)")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done() and call.waiters == 1:
+                # Last caller gone: nobody needs the result any more
+                counters["abandoned"] += 1
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, full_key: Hashable, call: _Call) -> None:
+        if self._calls.get(full_key) is call:
+            del self._calls[full_key]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per namespace: computations started, requests coalesced onto one, abandoned computations, in flight now."""
+        in_flight = defaultdict(int)
+        for namespace, _ in self._calls:
+            in_flight[namespace] += 1
+        return {
+            namespace: {**counters, "in_flight": in_flight[namespace]}
+            for namespace, counters in self._counters.items()
+        }
+
+
+def coalesced(namespace: str, key: Callable[..., Hashable]):
+    """Decorate an async route handler so concurrent identical requests share one execution.
+
+    Args:
+        namespace: Endpoint name for metrics
+        key: Called with the handler's arguments; returns the key identifying identical requests
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(*args, **kwargs):
+            return await request_coalescer.do(namespace, key(*args, **kwargs), lambda: handler(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+# Global in-flight request coalescer
+request_coalescer = SingleFlight()
@@ -0,0 +1,211 @@
+"""Skill matching with an alias taxonomy and a compiled multi-pattern matcher.
+
+Skill names are normalized and mapped to a canonical form through
+`SKILL_ALIASES` ("Postgres" and "PostgreSQL", "JS" and "JavaScript", "k8s"
+and "Kubernetes" are the same skill). A `SkillIndex` compiles every surface
+form of a user's skills (plus the taxonomy, to recognize skills the user does
+not list) into an Aho-Corasick automaton, so all skills in a job description
+are found in one pass over its text.
+
+Used to validate the skills a model selects (matching aliases instead of
+dropping them as hallucinations) and to pre-select the user's skills that the
+job description asks for without a model call.
+"""
+
+import logging
+import re
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Canonical skill -> other names it goes by (all lowercase)
+SKILL_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "javascript": ("js", "ecmascript", "es6"),
+    "typescript": ("ts",),
+    "python": ("python3",),
+    "golang": ("go", "go lang"),
+    "c#": ("csharp", "c sharp"),
+    "c++": ("cpp", "cplusplus"),
+    "node.js": ("node", "nodejs", "node js"),
+    "react": ("react.js", "reactjs", "react js"),
+    "vue.js": ("vue", "vuejs"),
+    "angular": ("angular.js", "angularjs"),
+    "next.js": ("next", "nextjs"),
+    "express": ("express.js", "expressjs"),
+    "django": ("django rest framework", "drf"),
+    "fastapi": ("fast api",),
+    "postgresql": ("postgres", "psql", "pg"),
+    "mysql": ("my sql",),
+    "mongodb": ("mongo",),
+    "redis": (),
+    "elasticsearch": ("elastic search", "elastic"),
+    "kafka": ("apache kafka",),
+    "spark": ("apache spark", "pyspark"),
+    "aws": ("amazon web services",),
+    "gcp": ("google cloud", "google cloud platform"),
+    "azure": ("microsoft azure",),
+    "docker": (),
+    "kubernetes": ("k8s",),
+    "terraform": (),
+    "ci/cd": ("cicd", "ci cd", "continuous integration", "continuous delivery", "continuous deployment"),
+    "github actions": ("gh actions",),
+    "graphql": ("graph ql",),
+    "rest": ("rest api", "rest apis", "restful", "restful apis"),
+    "machine learning": ("ml",),
+    "deep learning": ("dl",),
+    "natural language processing": ("nlp",),
+    "scikit-learn": ("sklearn", "scikit learn"),
+    "tensorflow": ("tf",),
+    "pytorch": ("torch",),
+    "sql": (),
+    "linux": (),
+    "git": (),
+    "html": ("html5",),
+    "css": ("css3",),
+    "tailwind css": ("tailwind", "tailwindcss"),
+}
+
+# Names that are also common English words: resolved when given as a skill,
+# but not searched for in job description text (one-letter names are only
+# matched between separators, see `SHORT_NAME_LENGTH`)
+AMBIGUOUS_IN_TEXT = frozenset({"go", "next", "express", "elastic", "pg", "tf", "dl", "ts", "torch", "node", "rest"})
+
+ALIAS_TO_CANONICAL: Dict[str, str] = {
+    alias: canonical for canonical, aliases in SKILL_ALIASES.items() for alias in (canonical, *aliases)
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_skill(name: str) -> str:
+    """Lowercase, trim and collapse whitespace."""
+    return _WHITESPACE.sub(" ", name.strip().lower())
+
+
+def canonical_skill(name: str) -> str:
+    """Canonical form of a skill name (the normalized name itself when it is not in the taxonomy)."""
+    normalized = normalize_skill(name)
+    return ALIAS_TO_CANONICAL.get(normalized, normalized)
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: every occurrence of every pattern in one pass over the text."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = list(dict.fromkeys(pattern for pattern in patterns if pattern))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        for pattern_id, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[node][char] = child
+                node = child
+            self._output[node].append(pattern_id)
+
+        # Failure links, breadth first: the longest proper suffix that is also a trie path
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, pattern index) for every match, by end position."""
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for pattern_id in self._output[node]:
+                yield i + 1 - len(self.patterns[pattern_id]), i + 1, pattern_id
+
+
+# Names shorter than this ("R", "C") are only matched between separators: a
+# plain word boundary would find them in "R&D" or "C-level"
+SHORT_NAME_LENGTH = 2
+_SEPARATORS = frozenset(" ,/;")
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+
+
+def _is_separated(text: str, start: int, end: int) -> bool:
+    before_ok = start == 0 or text[start - 1] in _SEPARATORS
+    # A full stop ends a sentence ("Python or R."), but not when a word follows directly
+    after = text[end:end + 2]
+    after_ok = not after or after[0] in _SEPARATORS or (after[0] == "." and (len(after) == 1 or after[1] == " "))
+    return before_ok and after_ok
+
+
+class SkillIndex:
+    """A user's skills compiled for alias-aware lookups and one-pass extraction from text."""
+
+    def __init__(self, skill_names: Iterable[str]):
+        # Canonical skill -> the user's spelling (first row wins)
+        self.user_skills: Dict[str, str] = {}
+        for name in skill_names:
+            if name and name.strip():
+                self.user_skills.setdefault(canonical_skill(name), name)
+
+        surface_forms = dict(ALIAS_TO_CANONICAL)
+        for canonical, name in self.user_skills.items():
+            surface_forms.setdefault(normalize_skill(name), canonical)
+            surface_forms.setdefault(canonical, canonical)
+        self._matcher = AhoCorasick(form for form in surface_forms if form not in AMBIGUOUS_IN_TEXT)
+        self._canonical_of = [surface_forms[pattern] for pattern in self._matcher.patterns]
+
+    def resolve(self, name: str) -> Optional[str]:
+        """The user's spelling of a skill given by any of its names, or None if the user does not have it."""
+        return self.user_skills.get(canonical_skill(name))
+
+    def extract(self, text: str) -> Counter:
+        """Canonical skills mentioned in a text (whole words, longest match wins), with their mention counts."""
+        normalized = _WHITESPACE.sub(" ", text.lower())
+        matches = sorted(
+            (start, -end, pattern_id)
+            for start, end, pattern_id in self._matcher.finditer(normalized)
+            if _is_whole_word(normalized, start, end)
+            and (end - start >= SHORT_NAME_LENGTH or _is_separated(normalized, start, end))
+        )
+        # Leftmost-longest: "node.js" is one mention of Node.js, not also one of "js"
+        found = Counter()
+        covered = 0
+        for start, negative_end, pattern_id in matches:
+            if start >= covered:
+                found[self._canonical_of[pattern_id]] += 1
+                covered = -negative_end
+        return found
+
+    def matching_skills(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """The user's skills (their spelling) that a text mentions, most mentioned first."""
+        mentioned = self.extract(text)
+        matches = [(count, self.user_skills[canonical]) for canonical, count in mentioned.items() if canonical in self.user_skills]
+        # Counter keeps first-mention order, and sorted() is stable, so ties stay in JD order
+        ranked = [name for _, name in sorted(matches, key=lambda match: -match[0])]
+        return ranked[:limit] if limit else ranked
+
+
+@lru_cache(maxsize=1024)
+def _compiled_index(skill_names: Tuple[str, ...]) -> SkillIndex:
+    return SkillIndex(skill_names)
+
+
+def skill_index_for(skill_names: Iterable[str]) -> SkillIndex:
+    """Compiled index for a set of skill names, reused while the user's skills do not change."""
+    return _compiled_index(tuple(skill_names))
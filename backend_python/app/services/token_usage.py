@@ -0,0 +1,51 @@
+"""Token usage per agent, including input tokens served from the provider's prompt cache.
+
+Every completed model call records the usage the API reported. The
+`cached_tokens` share of input tokens shows how well the prompt layout (see
+`app.services.prompt_templates`) hits OpenAI's automatic prefix caching.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any, Dict
+
+from agents.usage import Usage
+
+logger = logging.getLogger(__name__)
+
+
+class TokenUsageMeter:
+    """Running input, cached input and output token totals per agent."""
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "input_tokens": 0, "cached_tokens": 0, "output_tokens": 0}
+        )
+
+    def record(self, agent_name: str, model: str, usage: Usage) -> None:
+        """Add one call's usage to the agent's totals."""
+        cached = usage.input_tokens_details.cached_tokens if usage.input_tokens_details else 0
+        totals = self._totals[agent_name]
+        totals["calls"] += 1
+        totals["input_tokens"] += usage.input_tokens
+        totals["cached_tokens"] += cached or 0
+        totals["output_tokens"] += usage.output_tokens
+        logger.debug(f"{agent_name} ({model}): {cached}/{usage.input_tokens} input tokens from the prompt cache")
+
+    def reset(self) -> None:
+        """Forget all totals."""
+        self._totals.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per agent: calls, token totals and the share of input tokens served from the prompt cache."""
+        return {
+            agent_name: {
+                **totals,
+                "cached_ratio": round(totals["cached_tokens"] / totals["input_tokens"], 3) if totals["input_tokens"] else 0.0
+            }
+            for agent_name, totals in self._totals.items()
+        }
+
+
+# Global token usage meter
+token_usage = TokenUsageMeter()
@@ -0,0 +1,148 @@
+"""Benchmark: sequential vs. parallel vs. single-call bullet generation.
+
+Reports model calls, input/output tokens and wall time for
+`generate_pointer_chunks_with_context` in each mode, plus time to the first
+and last bullet for `stream_pointer_chunks_with_context` (what the streaming
+endpoint sends).
+
+By default the model is simulated (latency = base + per-token cost, tokens
+estimated as chars/4, each call scaled by a random jitter factor). Pass --live to call OpenAI for real (needs
+OPENAI_API_KEY; token counts then come from the API's usage data).
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_bullet_generation --count 3
+    uv run python -m benchmarks.bench_bullet_generation --count 3 --live
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from app.config.settings import settings  # noqa: E402
+from app.database import repository  # noqa: E402
+from app.services import pointer_service  # noqa: E402
+from app.services.client import ai_client  # noqa: E402
+from benchmarks.fake_supabase import FakeSupabase, make_profile_tables  # noqa: E402
+
+USER_ID = "bench-user"
+JOB_DESCRIPTION = """Senior Backend Engineer - Payments Platform
+
+We are looking for a backend engineer with strong Python and FastAPI experience
+to build high-throughput payment APIs on AWS. You will own PostgreSQL schema
+design, Docker/Kubernetes deployments and observability for services handling
+millions of requests per day. Experience with Kafka, Redis and CI/CD is a plus.
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def make_simulated_run_agent(base_latency: float, input_token_cost: float, output_token_cost: float, count: int, jitter: float = 0.0):
+    rng = random.Random(3)
+
+    async def run_agent(agent, prompt, **kwargs):
+        if agent.output_type is pointer_service.BulletVariants:
+            bullets = [f"Built payment API #{i + 1} with Python/FastAPI on AWS serving {i + 2}M requests/day" for i in range(count)]
+            output = pointer_service.BulletVariants(bullets=bullets)
+            output_tokens = estimate_tokens(output.model_dump_json())
+        else:
+            output = "Built payment API with Python/FastAPI on AWS serving 2M requests/day"
+            output_tokens = estimate_tokens(output)
+        input_tokens = estimate_tokens(prompt)
+        latency = base_latency + input_tokens * input_token_cost + output_tokens * output_token_cost
+        await asyncio.sleep(latency * (1 + rng.uniform(-jitter, jitter)))
+        usage = SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens)
+        return SimpleNamespace(final_output=output, context_wrapper=SimpleNamespace(usage=usage))
+    return run_agent
+
+
+def record_usage(run_agent, totals):
+    async def recording_run_agent(agent, prompt, **kwargs):
+        result = await run_agent(agent, prompt, **kwargs)
+        usage = result.context_wrapper.usage
+        totals["calls"] += 1
+        totals["input_tokens"] += usage.input_tokens
+        totals["output_tokens"] += usage.output_tokens
+        return result
+    return recording_run_agent
+
+
+async def run_mode(label, mode, concurrency, resume_item_id, count, base_run_agent):
+    totals = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+    ai_client.run_agent = record_usage(base_run_agent, totals)
+    settings.BULLET_GENERATION_CONCURRENCY = concurrency
+
+    start = time.perf_counter()
+    bullets = await pointer_service.generate_pointer_chunks_with_context(
+        resume_item_id=resume_item_id,
+        user_id=USER_ID,
+        job_description=JOB_DESCRIPTION,
+        count=count,
+        mode=mode
+    )
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{label:<12} calls: {totals['calls']:>2}   input tokens: {totals['input_tokens']:>6}   "
+        f"output tokens: {totals['output_tokens']:>5}   wall time: {elapsed * 1000:8.1f} ms   bullets: {len(bullets)}"
+    )
+
+
+async def run_streamed(label, resume_item_id, count, base_run_agent):
+    totals = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+    ai_client.run_agent = record_usage(base_run_agent, totals)
+    settings.BULLET_GENERATION_CONCURRENCY = count
+
+    start = time.perf_counter()
+    arrivals = []
+    async for _ in pointer_service.stream_pointer_chunks_with_context(
+        resume_item_id=resume_item_id,
+        job_description=JOB_DESCRIPTION,
+        count=count,
+        mode=pointer_service.BULLET_MODE_PARALLEL
+    ):
+        arrivals.append((time.perf_counter() - start) * 1000)
+
+    print(
+        f"{label:<12} calls: {totals['calls']:>2}   first bullet: {arrivals[0]:8.1f} ms   "
+        f"last bullet: {arrivals[-1]:8.1f} ms   bullets: {len(arrivals)}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=3)
+    parser.add_argument("--live", action="store_true", help="Call OpenAI instead of the simulated model")
+    parser.add_argument("--base-latency", type=float, default=0.4, help="Simulated seconds per call")
+    parser.add_argument("--input-token-cost", type=float, default=0.0002, help="Simulated seconds per input token")
+    parser.add_argument("--output-token-cost", type=float, default=0.02, help="Simulated seconds per output token")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Simulated latency varies by +/- this fraction per call")
+    args = parser.parse_args()
+
+    tables = make_profile_tables(USER_ID, num_items=10)
+    repository.get_supabase_client = lambda: FakeSupabase(tables, latency=0)
+    settings.PROFILE_CACHE_ENABLED = False
+    # The simulated bullets are near-copies of each other; this benchmark measures generation modes only
+    # (see bench_bullet_dedup for the near-duplicate filter)
+    settings.BULLET_DEDUP_ENABLED = False
+    resume_item_id = tables["resume_items"][1]["id"]
+
+    if args.live:
+        base_run_agent = ai_client.run_agent
+    else:
+        base_run_agent = make_simulated_run_agent(args.base_latency, args.input_token_cost, args.output_token_cost, args.count, args.jitter)
+
+    await run_mode("sequential", pointer_service.BULLET_MODE_PARALLEL, 1, resume_item_id, args.count, base_run_agent)
+    await run_mode("parallel", pointer_service.BULLET_MODE_PARALLEL, args.count, resume_item_id, args.count, base_run_agent)
+    await run_mode("single_call", pointer_service.BULLET_MODE_SINGLE_CALL, 1, resume_item_id, args.count, base_run_agent)
+    await run_streamed("streamed", resume_item_id, args.count, base_run_agent)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+"""Benchmark: prompt size with and without the context token budget.
+
+Builds a "veteran" profile (many experiences and projects across unrelated
+domains, long descriptions, many bullets each) in the fake Supabase client and
+captures the prompts sent by the full resume, resume analysis, pointer chunk
+and single pointer services, with CONTEXT_BUDGET_ENABLED off and on. Reports
+estimated prompt tokens and the service call time with the budget on (the
+model is not called, so this is the cost of building and compacting prompts).
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_context_budget
+    uv run python -m benchmarks.bench_context_budget --items 60 --points 10
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+import uuid
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from agents.usage import Usage  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.database import repository  # noqa: E402
+from app.database.request_context import request_data_context  # noqa: E402
+from app.services import feedback_service, pointer_service  # noqa: E402
+from app.services.client import ai_client  # noqa: E402
+from app.services.rate_limiter import estimate_tokens  # noqa: E402
+from benchmarks.fake_supabase import FakeSupabase  # noqa: E402
+
+USER_ID = "bench-veteran"
+JOB_DESCRIPTION = """Senior Backend Engineer - Payments Platform
+
+Build high-throughput payment APIs in Python and FastAPI on AWS. Own PostgreSQL
+schema design, Kafka event pipelines and Docker/Kubernetes deployments for
+services handling millions of transactions per day. Redis and CI/CD a plus.
+"""
+
+DOMAINS = [
+    ("Backend Engineer", "payment APIs in Python/FastAPI with PostgreSQL and Kafka on AWS", "transactions"),
+    ("Frontend Engineer", "React and TypeScript dashboards with Storybook design systems", "page views"),
+    ("Data Scientist", "churn models in R and scikit-learn with Tableau reporting", "predictions"),
+    ("Mobile Engineer", "Swift and Kotlin apps with offline sync", "installs"),
+    ("QA Lead", "Selenium and Cypress regression suites", "test cases"),
+    ("DevOps Engineer", "Docker/Kubernetes clusters and Terraform on AWS with CI/CD pipelines", "deployments"),
+    ("Game Developer", "Unity C# gameplay systems and shaders", "players"),
+    ("Embedded Engineer", "C firmware for ARM microcontrollers and CAN bus", "devices"),
+]
+
+
+def make_veteran_tables(num_items, points_per_item, seed=11):
+    rng = random.Random(seed)
+    items, points = [], []
+    for i in range(num_items):
+        title, stack, unit = DOMAINS[i % len(DOMAINS)]
+        item_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        items.append({
+            "id": item_id, "user_id": USER_ID, "item_type": "experience" if i % 3 else "project",
+            "title": f"{title} {i}", "organization": f"Company {i}",
+            "description": " ".join(
+                f"Worked on {stack}, collaborating with product and design on roadmap item {j}." for j in range(6)
+            ),
+            "start_date": f"20{10 + i % 14:02d}-01-01", "end_date": None, "is_current": False,
+            "updated_at": f"2025-01-{1 + i % 28:02d}T00:00:00+00:00",
+        })
+        for order in range(points_per_item):
+            points.append({
+                "id": str(uuid.UUID(int=rng.getrandbits(128))), "resume_item_id": item_id, "user_id": USER_ID,
+                "content": f"Delivered {stack} feature {order}, growing {unit} by {rng.randint(5, 60)}% across {rng.randint(2, 9)} teams",
+                "display_order": order, "usage_count": 0, "updated_at": "2025-01-01T00:00:00+00:00",
+            })
+    skills = ["Python", "FastAPI", "PostgreSQL", "Kafka", "Docker", "Kubernetes", "AWS", "React", "Swift", "Unity", "R"]
+    return {
+        "users": [{"id": USER_ID, "name": "Veteran User", "email": "vet@example.com", "phone": None}],
+        "resume_items": items,
+        "resume_item_points": points,
+        "skills": [{"id": str(i), "user_id": USER_ID, "name": name} for i, name in enumerate(skills)],
+        "education": [],
+    }
+
+
+def capture_prompts(prompts):
+    async def run_agent(agent, prompt, **kwargs):
+        prompts.append(prompt)
+        return SimpleNamespace(final_output="{}", context_wrapper=SimpleNamespace(usage=Usage()))
+    ai_client.run_agent = run_agent
+
+
+async def prompt_tokens(label, call):
+    prompts = []
+    capture_prompts(prompts)
+    start = time.perf_counter()
+    with request_data_context():
+        await call()
+    elapsed = (time.perf_counter() - start) * 1000
+    return label, sum(estimate_tokens(p) for p in prompts), len(prompts), elapsed
+
+
+async def measure_all(user_data, item_id):
+    return [
+        await prompt_tokens("full resume", lambda: pointer_service.generate_full_resume_with_single_call(
+            user_data, JOB_DESCRIPTION)),
+        await prompt_tokens("resume analysis", lambda: feedback_service.analyze_resume_relevancy(USER_ID, JOB_DESCRIPTION)),
+        await prompt_tokens("pointer chunks", lambda: pointer_service.generate_pointer_chunks_with_context(
+            item_id, USER_ID, JOB_DESCRIPTION, count=3, mode="parallel")),
+        await prompt_tokens("single pointer", lambda: pointer_service.generate_single_pointer_with_context(
+            item_id, USER_ID, JOB_DESCRIPTION)),
+    ]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=40, help="Experiences + projects in the profile")
+    parser.add_argument("--points", type=int, default=8, help="Bullets per item")
+    args = parser.parse_args()
+
+    tables = make_veteran_tables(args.items, args.points)
+    repository.get_supabase_client = lambda: FakeSupabase(tables, latency=0.0)
+    settings.PROFILE_CACHE_ENABLED = False
+    settings.LLM_CACHE_ENABLED = False
+    settings.JD_DEDUP_ENABLED = False
+    with request_data_context():
+        user_data = await repository.get_user_resume_data(USER_ID)
+    item_id = tables["resume_items"][1]["id"]
+
+    results = {}
+    for enabled in (False, True):
+        settings.CONTEXT_BUDGET_ENABLED = enabled
+        results[enabled] = await measure_all(user_data, item_id)
+
+    print(f"profile: {args.items} items x {args.points} bullets")
+    print(f"{'prompt':<18} {'calls':>5} {'tokens (no budget)':>19} {'tokens (budget)':>16} {'saved':>7} {'call time':>10}")
+    for off, on in zip(results[False], results[True]):
+        label, tokens_off, calls, _ = off
+        _, tokens_on, _, elapsed = on
+        saved = 1 - tokens_on / tokens_off if tokens_off else 0.0
+        print(f"{label:<18} {calls:>5} {tokens_off:>19} {tokens_on:>16} {saved:>6.0%} {elapsed:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
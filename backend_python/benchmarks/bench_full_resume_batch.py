@@ -0,0 +1,140 @@
+"""Benchmark: tailoring one profile to many jobs, one request per job vs one batch.
+
+Runs N job descriptions through /api/generate-full-resume (one request each,
+as the frontend does today, `--parallel` requests at a time) and through
+/api/generate-full-resume/batch, against the fake Supabase client and a
+simulated model. Reports Supabase round trips, time spent building prompts,
+wall time and time to the first result.
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_full_resume_batch
+    uv run python -m benchmarks.bench_full_resume_batch --jobs 50 --model-latency 1.0 --parallel 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from agents.usage import Usage  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.database import repository  # noqa: E402
+from app.database.request_context import request_data_context  # noqa: E402
+from app.models import GenerateFullResumeBatchRequest, GenerateFullResumeRequest  # noqa: E402
+from app.routes import resume  # noqa: E402
+from app.services import pointer_service  # noqa: E402
+from app.services.client import ai_client  # noqa: E402
+from benchmarks.fake_supabase import FakeSupabase, make_profile_tables  # noqa: E402
+
+USER_ID = "bench-user"
+FULL_RESUME_REPLY = json.dumps({
+    "selected_skills": ["Python", "FastAPI"],
+    "selected_experiences": [{"title": "Role 1", "company": "Company 1", "points": ["Built payment API serving 2M requests/day"]}],
+    "selected_projects": []
+})
+
+
+def install_simulated_model(latency):
+    async def run_agent(agent, prompt, **kwargs):
+        await asyncio.sleep(latency)
+        return SimpleNamespace(final_output=FULL_RESUME_REPLY, context_wrapper=SimpleNamespace(usage=Usage()))
+
+    ai_client.run_agent = run_agent
+
+
+def time_prompt_building(timings):
+    """Wrap the prompt builder to accumulate the time spent in it."""
+    build = pointer_service.build_full_resume_prompt
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return build(*args, **kwargs)
+        finally:
+            timings["prompt_ms"] += (time.perf_counter() - start) * 1000
+
+    pointer_service.build_full_resume_prompt = timed
+
+
+def make_job_descriptions(count):
+    stacks = ["Python, FastAPI and PostgreSQL", "React and TypeScript", "Kafka and AWS", "Docker and Kubernetes"]
+    return [
+        f"Engineer #{i} at Company {i}: build services with {stacks[i % len(stacks)]}. "
+        f"You will own design, on-call and mentoring for team {i}."
+        for i in range(count)
+    ]
+
+
+async def one_request_per_job(job_descriptions, parallel):
+    semaphore = asyncio.Semaphore(parallel)
+    first = []
+    start = time.perf_counter()
+
+    async def call(job_description):
+        async with semaphore:
+            # Every HTTP request gets its own data context (see the middleware in app.main)
+            with request_data_context():
+                await resume.generate_full_resume(
+                    request=GenerateFullResumeRequest(user_id=USER_ID, job_description=job_description)
+                )
+        if not first:
+            first.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(call(job_description) for job_description in job_descriptions))
+    return time.perf_counter() - start, first[0]
+
+
+async def one_batch(job_descriptions):
+    start = time.perf_counter()
+    with request_data_context():
+        response = await resume.generate_full_resume_batch(
+            request=GenerateFullResumeBatchRequest(user_id=USER_ID, job_descriptions=job_descriptions)
+        )
+    first = None
+    async for line in response.body_iterator:
+        if first is None and json.loads(line)["event"] == "result":
+            first = time.perf_counter() - start
+    return time.perf_counter() - start, first
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=30, help="Job descriptions to tailor the profile to")
+    parser.add_argument("--items", type=int, default=20, help="Resume items in the profile")
+    parser.add_argument("--model-latency", type=float, default=0.5, help="Simulated seconds per model call")
+    parser.add_argument("--parallel", type=int, default=4, help="Concurrent single requests (matches BATCH_CONCURRENCY)")
+    args = parser.parse_args()
+
+    tables = make_profile_tables(USER_ID, num_items=args.items)
+    client = FakeSupabase(tables, latency=0.02)
+    repository.get_supabase_client = lambda: client
+    settings.LLM_CACHE_ENABLED = False
+    settings.JD_DEDUP_ENABLED = False
+    settings.SINGLEFLIGHT_ENABLED = False
+    settings.BATCH_CONCURRENCY = args.parallel
+    install_simulated_model(args.model_latency)
+    timings = {"prompt_ms": 0.0}
+    time_prompt_building(timings)
+    job_descriptions = make_job_descriptions(args.jobs)
+
+    print(f"{args.jobs} jobs, {args.items} resume items, {args.model_latency}s per model call, {args.parallel} at a time")
+    print(f"{'strategy':<28} {'round trips':>11} {'prompt build':>13} {'first result':>13} {'wall':>8}")
+    for label, profile_cache_enabled, run in (
+        ("one request per job", False, lambda: one_request_per_job(job_descriptions, args.parallel)),
+        ("one request per job+cache", True, lambda: one_request_per_job(job_descriptions, args.parallel)),
+        ("batch", False, lambda: one_batch(job_descriptions)),
+    ):
+        settings.PROFILE_CACHE_ENABLED = profile_cache_enabled
+        client.round_trips = 0
+        timings["prompt_ms"] = 0.0
+        elapsed, first = await run()
+        print(f"{label:<28} {client.round_trips:>11} {timings['prompt_ms']:>11.1f}ms {first:>12.2f}s {elapsed:>7.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
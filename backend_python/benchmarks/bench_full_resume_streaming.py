@@ -0,0 +1,110 @@
+"""Benchmark: time-to-first-useful-byte of blocking vs. streaming full resume.
+
+Calls the /api/generate-full-resume handler and its SSE variant
+(/api/generate-full-resume/stream) against the fake Supabase client and a
+simulated model that emits its JSON reply token by token (first-token
+latency + per-token latency). Reports when each part of the resume reaches
+the client.
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_full_resume_streaming
+    uv run python -m benchmarks.bench_full_resume_streaming --first-token 0.8 --per-token 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from app.config.settings import settings  # noqa: E402
+from app.database import repository  # noqa: E402
+from app.models import GenerateFullResumeRequest  # noqa: E402
+from app.routes import resume  # noqa: E402
+from app.services.client import ai_client  # noqa: E402
+from benchmarks.fake_supabase import FakeSupabase, make_profile_tables  # noqa: E402
+
+USER_ID = "bench-user"
+JOB_DESCRIPTION = "Senior Backend Engineer: Python, FastAPI, PostgreSQL, Docker and AWS."
+
+MODEL_REPLY = json.dumps({
+    "selected_skills": ["Python", "FastAPI", "PostgreSQL", "Docker", "AWS"],
+    "selected_experiences": [
+        {"title": f"Role {i}", "company": f"Company {i}", "points": [
+            f"Built payment API {j} with Python/FastAPI on AWS serving {j + 2}M requests/day, cutting p99 latency by 40%"
+            for j in range(4)
+        ]}
+        for i in (1, 2)
+    ],
+    "selected_projects": [
+        {"title": "Role 3", "points": [
+            f"Containerized service {j} with Docker, reducing deploy time by 35% across 4 environments"
+            for j in range(3)
+        ]}
+    ]
+}, indent=2)
+
+
+def reply_chunks():
+    # Roughly one token per 4 characters
+    return [MODEL_REPLY[i:i + 4] for i in range(0, len(MODEL_REPLY), 4)]
+
+
+def install_simulated_model(first_token: float, per_token: float):
+    async def run_agent(agent, prompt, **kwargs):
+        await asyncio.sleep(first_token + per_token * len(reply_chunks()))
+        return SimpleNamespace(final_output=MODEL_REPLY)
+
+    async def stream_agent_text(agent, prompt, **kwargs):
+        await asyncio.sleep(first_token)
+        for chunk in reply_chunks():
+            await asyncio.sleep(per_token)
+            yield chunk
+
+    ai_client.run_agent = run_agent
+    ai_client.stream_agent_text = stream_agent_text
+
+
+async def bench_blocking(request):
+    start = time.perf_counter()
+    response = await resume.generate_full_resume(request)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"blocking   first byte (whole response): {elapsed:8.1f} ms   "
+          f"skills: {len(response.skills)}  experiences: {len(response.experiences)}  projects: {len(response.projects)}")
+
+
+async def bench_streaming(request):
+    start = time.perf_counter()
+    response = await resume.generate_full_resume_stream(request)
+    first_seen = {}
+    async for raw_event in response.body_iterator:
+        event = raw_event.split("\n", 1)[0].removeprefix("event: ")
+        first_seen.setdefault(event, (time.perf_counter() - start) * 1000)
+    timeline = "   ".join(f"{event}: {elapsed:7.1f} ms" for event, elapsed in first_seen.items())
+    print(f"streaming  {timeline}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--first-token", type=float, default=0.6, help="Simulated seconds to the first token")
+    parser.add_argument("--per-token", type=float, default=0.01, help="Simulated seconds per output token")
+    args = parser.parse_args()
+
+    tables = make_profile_tables(USER_ID, num_items=10)
+    repository.get_supabase_client = lambda: FakeSupabase(tables, latency=0.02)
+    settings.PROFILE_CACHE_ENABLED = False
+    settings.LLM_CACHE_ENABLED = False
+    settings.JD_DEDUP_ENABLED = False
+    install_simulated_model(args.first_token, args.per_token)
+
+    print(f"simulated model: {len(reply_chunks())} output tokens, {args.first_token}s to first token, {args.per_token}s per token")
+    request = GenerateFullResumeRequest(user_id=USER_ID, job_description=JOB_DESCRIPTION)
+    await bench_blocking(request)
+    await bench_streaming(request)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,192 @@
+"""Benchmark: near-duplicate job description detection.
+
+Builds a corpus of base postings and variants of each (re-wrapped whitespace,
+job-board tracking footers, reordered bullets, HTML leftovers, different
+bullet glyphs), plus hard negatives (other roles from the same company that
+share its boilerplate, and the same team's posting for another level and
+stack). Reports, per similarity threshold:
+
+- precision/recall of "same posting" decisions over all pairs, and
+- how many model calls a stream of requests needs with exact prompt hashing
+  (the LLM response cache) vs. near-duplicate reuse.
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_jd_near_duplicates
+    uv run python -m benchmarks.bench_jd_near_duplicates --variants 8 --thresholds 0.8,0.85,0.9,0.95
+"""
+
+import argparse
+import hashlib
+import itertools
+import os
+import random
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from app.services.jd_dedup import MinHasher, shingle_job_description  # noqa: E402
+
+ACME_ABOUT = """About Acme Payments
+Acme Payments moves billions of dollars for small businesses across Southeast Asia.
+We are a remote-first team of 200 engineers who care about reliability and craft."""
+
+BASE_POSTINGS = {
+    "acme-backend": ACME_ABOUT + """
+
+Senior Backend Engineer
+- Build high-throughput payment APIs in Python and FastAPI
+- Own PostgreSQL schema design and query performance
+- Run services on AWS with Docker and Kubernetes
+- Improve observability with tracing, metrics and alerting
+- 5+ years of backend experience; Kafka and Redis a plus""",
+    "acme-frontend": ACME_ABOUT + """
+
+Frontend Engineer
+- Build merchant dashboards in React and TypeScript
+- Work with designers on an accessible component library
+- Optimize bundle size and Core Web Vitals
+- Write end-to-end tests with Playwright
+- 3+ years of frontend experience""",
+    "acme-data": ACME_ABOUT + """
+
+Data Engineer
+- Build batch and streaming pipelines with Spark and Kafka
+- Model the payments warehouse in dbt and Snowflake
+- Own data quality checks and lineage
+- Partner with analysts on fraud and risk metrics
+- Strong SQL and Python""",
+    # Hard negative: the same team's posting for a different level and stack
+    "acme-backend-go": ACME_ABOUT + """
+
+Backend Engineer
+- Build high-throughput payment APIs in Go and gRPC
+- Own PostgreSQL schema design and query performance
+- Run services on AWS with Docker and Kubernetes
+- Improve observability with tracing, metrics and alerting
+- 2+ years of backend experience""",
+    "globex-ml": """Globex is hiring a Machine Learning Engineer to ship ranking models to production.
+- Train and evaluate recommendation models with PyTorch
+- Build feature pipelines on GCP with BigQuery and Dataflow
+- Serve models with low latency using Triton and Kubernetes
+- Run A/B experiments and analyze results
+- MSc or equivalent experience in machine learning""",
+    "initech-devops": """Initech Site Reliability Engineer
+- Operate a fleet of Linux hosts and Kubernetes clusters on Azure
+- Automate infrastructure with Terraform and Ansible
+- Lead incident response and blameless postmortems
+- Build CI/CD pipelines in GitHub Actions
+- On-call rotation one week in six""",
+    "umbrella-fullstack": """Umbrella Health - Full Stack Developer
+- Develop patient portal features with Node.js, Express and React
+- Design REST and GraphQL APIs backed by MongoDB
+- Ensure HIPAA compliance and secure handling of PHI
+- Mentor junior developers and review code
+- 4+ years of full stack experience""",
+}
+
+FOOTERS = [
+    "Apply now at https://jobs.example.com/r/8812?utm_source=linkedin&utm_medium=job",
+    "Posted 3 days ago · 127 applicants",
+    "Job ID: R-20391",
+    "Seen on LinkedIn. Share this job",
+    "Acme is an equal opportunity employer.",
+    "Questions? Email careers@example.com",
+]
+
+
+def rewrap_whitespace(text: str, rng: random.Random) -> str:
+    lines = []
+    for line in text.splitlines():
+        words = line.split()
+        lines.append(("  " if rng.random() < 0.5 else "") + "   ".join(words) + " " * rng.randint(0, 3))
+    return "\n\n".join(lines)
+
+
+def add_footers(text: str, rng: random.Random) -> str:
+    return text + "\n\n" + "\n".join(rng.sample(FOOTERS, k=rng.randint(2, 4)))
+
+
+def reorder_bullets(text: str, rng: random.Random) -> str:
+    lines = text.splitlines()
+    bullet_positions = [i for i, line in enumerate(lines) if line.startswith("- ")]
+    bullets = [lines[i] for i in bullet_positions]
+    rng.shuffle(bullets)
+    for position, bullet in zip(bullet_positions, bullets):
+        lines[position] = bullet
+    return "\n".join(lines)
+
+
+def add_html(text: str, rng: random.Random) -> str:
+    lines = []
+    for line in text.splitlines():
+        if line.startswith("- "):
+            lines.append(f"<li>{line[2:].replace('&', '&amp;')}</li>")
+        elif line:
+            lines.append(f"<p>{line}</p>")
+    return "<div>" + "".join(lines) + "</div>"
+
+
+def swap_bullet_glyphs(text: str, rng: random.Random) -> str:
+    glyph = rng.choice(["•", "*", "–", "▪"])
+    return "\n".join(glyph + line[1:] if line.startswith("- ") else line for line in text.splitlines())
+
+
+TRANSFORMS = [rewrap_whitespace, add_footers, reorder_bullets, add_html, swap_bullet_glyphs]
+
+
+def make_corpus(variants_per_posting: int, seed: int = 11):
+    """Return [(posting_id, text)] with the base postings and their variants."""
+    rng = random.Random(seed)
+    corpus = []
+    for posting_id, text in BASE_POSTINGS.items():
+        corpus.append((posting_id, text))
+        for _ in range(variants_per_posting):
+            variant = text
+            for transform in rng.sample(TRANSFORMS, k=rng.randint(1, len(TRANSFORMS))):
+                variant = transform(variant, rng)
+            corpus.append((posting_id, variant))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--variants", type=int, default=6, help="variants generated per base posting")
+    parser.add_argument("--num-perm", type=int, default=128)
+    parser.add_argument("--thresholds", default="0.5,0.6,0.7,0.8,0.9")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.variants)
+    hasher = MinHasher(num_perm=args.num_perm)
+
+    started = time.perf_counter()
+    signatures = [hasher.signature(shingle_job_description(text)) for _, text in corpus]
+    signature_ms = (time.perf_counter() - started) * 1000 / len(corpus)
+
+    pairs = [
+        (corpus[i][0] == corpus[j][0], MinHasher.similarity(signatures[i], signatures[j]))
+        for i, j in itertools.combinations(range(len(corpus)), 2)
+    ]
+    exact_calls = len({hashlib.sha256(text.encode("utf-8")).hexdigest() for _, text in corpus})
+
+    print(f"corpus: {len(BASE_POSTINGS)} postings x {args.variants + 1} versions = {len(corpus)} JDs, {len(pairs)} pairs")
+    print(f"signature: {signature_ms:.2f} ms/JD ({args.num_perm} permutations)")
+    print(f"lowest same-posting similarity: {min(score for same, score in pairs if same):.2f}, "
+          f"highest different-posting similarity: {max(score for same, score in pairs if not same):.2f}")
+    print(f"{'threshold':>9} {'precision':>9} {'recall':>7} {'model calls (exact hash)':>25} {'model calls (near-dup)':>23}")
+    for threshold in (float(t) for t in args.thresholds.split(",")):
+        true_positives = sum(1 for same, score in pairs if same and score >= threshold)
+        false_positives = sum(1 for same, score in pairs if not same and score >= threshold)
+        positives = sum(1 for same, _ in pairs if same)
+        precision = true_positives / (true_positives + false_positives) if true_positives + false_positives else 1.0
+
+        # Replay the corpus as a request stream: a call is needed unless a stored JD is similar enough
+        stored, calls = [], 0
+        for signature in signatures:
+            if not any(MinHasher.similarity(signature, other) >= threshold for other in stored):
+                calls += 1
+                stored.append(signature)
+        print(f"{threshold:>9.2f} {precision:>9.3f} {true_positives / positives:>7.3f} {exact_calls:>25} {calls:>23}")
+
+
+if __name__ == "__main__":
+    main()
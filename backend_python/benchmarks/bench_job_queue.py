@@ -0,0 +1,225 @@
+"""Benchmark: synchronous full resume requests vs background jobs.
+
+Sends --requests full resume requests (distinct job descriptions) against the
+fake Supabase client and a simulated model that takes --model-latency
+seconds per call:
+
+- sync: every request waits for its result (holds its HTTP connection and a
+  server slot for the whole model call),
+- jobs + polling: POST /api/generate-full-resume/jobs, then GET
+  /api/jobs/{id} every --poll-interval seconds until it finished,
+- jobs + SSE: POST, then GET /api/jobs/{id}/events until the final event.
+
+Reports time per submission, time to the result and the total time spent
+inside request handlers (connection-seconds a server worker is busy; an SSE
+stream is held open but idle). Finally checks the sqlite backend:
+
+- restart: jobs are submitted, the workers are stopped mid-way, and a new
+  queue on the same file finishes them,
+- shared file: a second queue starts on the file while the first is still
+  running jobs; it must not run them again (their leases are being renewed),
+- crash: a queue's workers die without handing their jobs back; another
+  queue takes them over once their leases expire.
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_job_queue
+    uv run python -m benchmarks.bench_job_queue --requests 40 --model-latency 2 --workers 4
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from app.config.settings import settings  # noqa: E402
+from app.database import repository  # noqa: E402
+from app.database.request_context import request_data_context  # noqa: E402
+from app.models import GenerateFullResumeRequest  # noqa: E402
+from app.routes import jobs, resume  # noqa: E402
+from app.services.job_queue import JobQueue, SQLiteJobStore, job_queue  # noqa: E402
+from benchmarks.bench_full_resume_batch import USER_ID, install_simulated_model, make_job_descriptions  # noqa: E402
+from benchmarks.fake_supabase import FakeSupabase, make_profile_tables  # noqa: E402
+
+
+async def timed(coro, busy):
+    """Await a handler call, adding its duration to the busy total."""
+    start = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        busy["seconds"] += time.perf_counter() - start
+
+
+async def run_sync(job_descriptions):
+    busy = {"seconds": 0.0}
+    latencies = []
+
+    async def call(job_description):
+        start = time.perf_counter()
+        with request_data_context():
+            await timed(resume.generate_full_resume(GenerateFullResumeRequest(user_id=USER_ID, job_description=job_description)), busy)
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(call(jd) for jd in job_descriptions))
+    return {"submit": latencies, "result": latencies, "busy": busy["seconds"], "requests": len(latencies)}
+
+
+async def run_jobs(job_descriptions, poll_interval, use_sse):
+    busy = {"seconds": 0.0}
+    submits, results = [], []
+    calls = {"count": 0}
+
+    async def client(job_description):
+        start = time.perf_counter()
+        submitted = await timed(jobs.submit_full_resume_job(GenerateFullResumeRequest(user_id=USER_ID, job_description=job_description)), busy)
+        submits.append(time.perf_counter() - start)
+        calls["count"] += 1
+        if use_sse:
+            response = await jobs.job_events(submitted.job_id)
+            calls["count"] += 1
+            async for _ in response.body_iterator:
+                pass
+        else:
+            while True:
+                await asyncio.sleep(poll_interval)
+                status = await timed(jobs.get_job(submitted.job_id), busy)
+                calls["count"] += 1
+                if status.status in ("succeeded", "failed"):
+                    break
+        results.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(client(jd) for jd in job_descriptions))
+    return {"submit": submits, "result": results, "busy": busy["seconds"], "requests": calls["count"]}
+
+
+def make_queue(path, size, workers, runs, lease_seconds=60.0):
+    """Queue on a SQLite file whose full resume handler counts its runs per job description."""
+    queue = JobQueue(SQLiteJobStore(path), workers=workers, max_pending=size, result_ttl_seconds=3600, lease_seconds=lease_seconds)
+
+    async def handler(payload):
+        runs[payload["job_description"]] = runs.get(payload["job_description"], 0) + 1
+        return await jobs.run_full_resume_job(payload)
+
+    queue.register(jobs.JOB_FULL_RESUME, handler)
+    return queue
+
+
+async def submit_all(queue, job_descriptions):
+    return [
+        await queue.submit(jobs.JOB_FULL_RESUME, {"user_id": USER_ID, "job_description": jd, "regenerate": False})
+        for jd in job_descriptions
+    ]
+
+
+async def wait_finished(queue, submitted):
+    while True:
+        states = [await queue.get(job.id) for job in submitted]
+        if all(job.finished for job in states):
+            return sum(job.status == "succeeded" for job in states)
+        await asyncio.sleep(0.05)
+
+
+async def check_restart(job_descriptions, workers, model_latency):
+    runs = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "jobs.sqlite3")
+        first = make_queue(path, len(job_descriptions), workers, runs)
+        submitted = await submit_all(first, job_descriptions)
+        # Stop after the first round of jobs, while the second is running
+        await asyncio.sleep(model_latency * 1.5)
+        await first.stop()
+
+        second = make_queue(path, len(job_descriptions), workers, runs)
+        await second.start()
+        succeeded = await wait_finished(second, submitted)
+        await second.stop()
+        return first.stats()["succeeded"], second.stats()["recovered"], succeeded
+
+
+async def check_shared_file(job_descriptions, workers, model_latency):
+    runs = {}
+    lease_seconds = model_latency / 2
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "jobs.sqlite3")
+        first = make_queue(path, len(job_descriptions), workers, runs, lease_seconds)
+        submitted = await submit_all(first, job_descriptions)
+        # Let the first queue's leases outlive several renewals before the second one starts
+        await asyncio.sleep(lease_seconds * 1.5)
+        second = make_queue(path, len(job_descriptions), workers, runs, lease_seconds)
+        await second.start()
+        succeeded = await wait_finished(first, submitted)
+        await asyncio.gather(first.stop(), second.stop())
+        return sum(count - 1 for count in runs.values()), succeeded
+
+
+async def check_crash(job_descriptions, workers, model_latency):
+    runs = {}
+    lease_seconds = model_latency / 2
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "jobs.sqlite3")
+        crashed = make_queue(path, len(job_descriptions), workers, runs, lease_seconds)
+        submitted = await submit_all(crashed, job_descriptions)
+        await asyncio.sleep(model_latency / 4)
+        # Kill the workers without handing their jobs back, like a killed process
+        for task in crashed._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*crashed._worker_tasks, return_exceptions=True)
+        crashed.store.close()
+
+        survivor = make_queue(path, len(job_descriptions), workers, runs, lease_seconds)
+        start = time.perf_counter()
+        await survivor.start()
+        taken_at_start = survivor.stats()["recovered"]
+        succeeded = await wait_finished(survivor, submitted)
+        elapsed = time.perf_counter() - start
+        await survivor.stop()
+        return taken_at_start, survivor.stats()["recovered"], succeeded, elapsed
+
+
+def summarize(label, outcome):
+    submit_ms = statistics.median(outcome["submit"]) * 1000
+    result_p50 = statistics.median(outcome["result"])
+    result_max = max(outcome["result"])
+    print(f"{label:<16} {outcome['requests']:>9} {submit_ms:>12.1f}ms {result_p50:>10.2f}s {result_max:>10.2f}s {outcome['busy'] * 1000:>11.0f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20, help="Full resume requests (distinct JDs)")
+    parser.add_argument("--model-latency", type=float, default=1.0, help="Simulated model seconds per call")
+    parser.add_argument("--workers", type=int, default=4, help="JOB_WORKERS")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between status polls")
+    args = parser.parse_args()
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    tables = make_profile_tables(USER_ID, num_items=12)
+    repository.get_supabase_client = lambda: FakeSupabase(tables, latency=0.002)
+    settings.LLM_CACHE_ENABLED = False
+    settings.JD_DEDUP_ENABLED = False
+    install_simulated_model(args.model_latency)
+    job_queue.workers = args.workers
+
+    print(f"{args.requests} full resume requests, simulated model {args.model_latency:.1f}s, {args.workers} job workers\n")
+    print(f"{'mode':<16} {'requests':>9} {'submit p50':>14} {'result p50':>11} {'result max':>11} {'handler time':>13}")
+    summarize("sync", await run_sync(make_job_descriptions(args.requests)))
+    summarize("jobs + polling", await run_jobs(make_job_descriptions(args.requests), args.poll_interval, use_sse=False))
+    summarize("jobs + SSE", await run_jobs(make_job_descriptions(args.requests), args.poll_interval, use_sse=True))
+    await job_queue.stop()
+
+    finished_before, recovered, succeeded = await check_restart(make_job_descriptions(args.requests), args.workers, args.model_latency)
+    print(f"\nsqlite restart: {finished_before} jobs finished before the stop, {recovered} re-queued on start, "
+          f"{succeeded}/{args.requests} succeeded")
+    reruns, succeeded = await check_shared_file(make_job_descriptions(args.requests), args.workers, args.model_latency)
+    print(f"sqlite shared file: second queue started mid-run, {reruns} jobs run twice, {succeeded}/{args.requests} succeeded")
+    taken_at_start, recovered, succeeded, elapsed = await check_crash(make_job_descriptions(args.requests), args.workers, args.model_latency)
+    print(f"sqlite crash: {taken_at_start} queued jobs taken at start, {recovered - taken_at_start} running jobs taken over "
+          f"after their leases expired, {succeeded}/{args.requests} succeeded in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
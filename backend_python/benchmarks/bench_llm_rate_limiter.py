@@ -0,0 +1,116 @@
+"""Benchmark: outbound LLM limiter against a rate-limited fake model endpoint.
+
+Fires a burst of concurrent `AIClient.run_agent` calls at a local fake
+Responses API (benchmarks/fake_openai_server.py) that enforces a concurrency
+limit and answers excess requests with 429 + Retry-After. Compares:
+
+- no limiter:   unbounded fan-out, 429s are not retried
+- retry only:   unbounded fan-out, 429s pause the model and are re-queued
+- limiter:      concurrency configured to the endpoint's limit
+- sdk retries:  like "retry only", but with the openai client's default
+                max_retries=2 (what production did before
+                `create_openai_client`), which retries 429s inside the call
+
+All modes except the last use the production client (`create_openai_client`).
+The table also reports the requests that reached the endpoint.
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_llm_rate_limiter
+    uv run python -m benchmarks.bench_llm_rate_limiter --calls 60 --server-concurrency 4
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from agents import set_default_openai_client, set_tracing_disabled  # noqa: E402
+from openai import AsyncOpenAI  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.services.client import ai_client, create_openai_client  # noqa: E402
+from app.services.rate_limiter import llm_rate_limiter  # noqa: E402
+from benchmarks.fake_openai_server import FakeOpenAIServer  # noqa: E402
+
+PROMPT = "Write one resume bullet for a backend engineer who built payment APIs with Python and FastAPI."
+
+
+async def run_burst(label, calls, max_concurrency, tokens_per_minute, retries):
+    settings.LLM_MAX_CONCURRENT_REQUESTS = max_concurrency
+    settings.LLM_TOKENS_PER_MINUTE = tokens_per_minute
+    settings.LLM_RATE_LIMIT_RETRIES = retries
+    llm_rate_limiter.reset()
+    agent = ai_client.create_agent(name="bench-bullet", model="gpt-4")
+
+    latencies = []
+    failures = 0
+
+    async def call():
+        nonlocal failures
+        start = time.perf_counter()
+        try:
+            await ai_client.run_agent(agent, PROMPT)
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+    stats = llm_rate_limiter.stats().get("gpt-4", {})
+    p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) >= 2 else 0.0
+    return {
+        "label": label, "ok": len(latencies), "failed": failures, "wall": elapsed, "p95": p95,
+        "max_wait_ms": stats.get("max_wait_ms", 0.0)
+    }
+
+
+async def run_scenario(title, make_server, calls, limiter_concurrency):
+    print(f"\n{title}")
+    print(f"{'mode':<12} {'ok':>4} {'failed':>6} {'requests':>9} {'429s':>5} {'wall':>8} {'p95':>8} {'max queue wait':>15}")
+    for label, concurrency, retries, sdk_retries in (
+        ("no limiter", 1000, 0, False),
+        ("retry only", 1000, 3, False),
+        ("limiter", limiter_concurrency, 3, False),
+        ("sdk retries", 1000, 3, True),
+    ):
+        # A fresh endpoint per mode, so no mode inherits another's in-flight calls
+        server = make_server().start()
+        if sdk_retries:
+            client = AsyncOpenAI(base_url=server.base_url, api_key="benchmark")
+        else:
+            client = create_openai_client(base_url=server.base_url, api_key="benchmark")
+        set_default_openai_client(client, use_for_tracing=False)
+        row = await run_burst(label, calls, concurrency, 0, retries)
+        server.stop()
+        print(f"{row['label']:<12} {row['ok']:>4} {row['failed']:>6} {server.requests:>9} {server.rate_limited:>5} "
+              f"{row['wall']:>7.2f}s {row['p95']:>7.2f}s {row['max_wait_ms'] / 1000:>14.2f}s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake endpoint seconds per call")
+    parser.add_argument("--server-concurrency", type=int, default=4, help="Concurrent calls the endpoint accepts")
+    args = parser.parse_args()
+
+    set_tracing_disabled(True)
+    logging.getLogger("openai.agents").setLevel(logging.CRITICAL)
+    logging.getLogger("app.services.rate_limiter").setLevel(logging.ERROR)
+    settings.LLM_CACHE_ENABLED = False
+    settings.LLM_QUEUE_TIMEOUT = 120
+    settings.LLM_ESTIMATED_OUTPUT_TOKENS = 20
+
+    await run_scenario(
+        f"concurrency: endpoint accepts {args.server_concurrency} concurrent calls, {args.calls} call burst",
+        lambda: FakeOpenAIServer(latency=args.latency, max_concurrency=args.server_concurrency),
+        args.calls, args.server_concurrency
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
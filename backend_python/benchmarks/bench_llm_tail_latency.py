@@ -0,0 +1,161 @@
+"""Benchmark: tail latency and outage behaviour of AIClient.run_agent.
+
+Sends a stream of calls (a fixed number in flight) to a local fake Responses
+API (benchmarks/fake_openai_server.py) whose latency has a heavy tail: most
+calls take ~0.3s but a few stall for several seconds. Compares:
+
+- baseline:        no deadline, no hedging
+- deadline+retry:  LLM_CALL_TIMEOUT cancels stalled calls, which are retried
+- hedged:          a second call is started after the model's p95 latency
+
+Then takes the endpoint down (every call answers 500) and reports how many
+requests reach it before the circuit breaker opens and calls fail fast. It
+does this with the production client (`create_openai_client`, no retries
+inside the openai client) and with the client's default max_retries=2, whose
+hidden attempts multiply with LLM_MAX_RETRIES.
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_llm_tail_latency
+    uv run python -m benchmarks.bench_llm_tail_latency --calls 300 --stall-rate 0.05 --stall 4
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import threading
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from agents import set_default_openai_client, set_tracing_disabled  # noqa: E402
+from openai import AsyncOpenAI  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.services.client import ai_client, create_openai_client  # noqa: E402
+from app.services.rate_limiter import llm_rate_limiter  # noqa: E402
+from app.services.resilience import CircuitOpenError, llm_health  # noqa: E402
+from benchmarks.fake_openai_server import FakeOpenAIServer  # noqa: E402
+
+PROMPT = "Select the skills, experiences and projects that best match this job description."
+NAMESPACE = "full_resume"
+
+
+def heavy_tail_latency(seed, base, stall_rate, stall):
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def latency():
+        with lock:
+            if rng.random() < stall_rate:
+                return stall
+            return base * rng.uniform(0.7, 1.5)
+
+    return latency
+
+
+def configure(timeout, retries, hedge):
+    settings.LLM_CALL_TIMEOUT = timeout
+    settings.LLM_MAX_RETRIES = retries
+    settings.LLM_HEDGE_NAMESPACES = {NAMESPACE} if hedge else set()
+    llm_rate_limiter.reset()
+    llm_health.reset()
+
+
+async def run_calls(calls, in_flight):
+    agent = ai_client.create_agent(name="bench-full-resume", model="gpt-4")
+    latencies = []
+    failures = 0
+    fail_fast = 0
+    queue = asyncio.Queue()
+    for _ in range(calls):
+        queue.put_nowait(None)
+
+    async def worker():
+        nonlocal failures, fail_fast
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                await ai_client.run_agent(agent, PROMPT, cache_namespace=NAMESPACE)
+                latencies.append(time.perf_counter() - start)
+            except CircuitOpenError:
+                fail_fast += 1
+            except Exception:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(in_flight)))
+    return latencies, failures, fail_fast, time.perf_counter() - start
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+async def bench_tail_latency(args):
+    print(f"\ntail latency: {args.calls} calls, {args.in_flight} in flight, "
+          f"{args.stall_rate:.0%} of calls stall for {args.stall}s")
+    print(f"{'mode':<16} {'ok':>4} {'failed':>6} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} {'extra calls':>12}")
+    for label, timeout, retries, hedge in (
+        ("baseline", 600, 0, False),
+        ("deadline+retry", args.deadline, 2, False),
+        ("hedged", 600, 0, True),
+    ):
+        server = FakeOpenAIServer(latency_fn=heavy_tail_latency(args.seed, args.latency, args.stall_rate, args.stall)).start()
+        set_default_openai_client(create_openai_client(base_url=server.base_url, api_key="benchmark"), use_for_tracing=False)
+        configure(timeout, retries, hedge)
+        latencies, failures, _, _ = await run_calls(args.calls, args.in_flight)
+        server.stop()
+        print(f"{label:<16} {len(latencies):>4} {failures:>6} {statistics.median(latencies):>6.2f}s "
+              f"{percentile(latencies, 0.95):>6.2f}s {percentile(latencies, 0.99):>6.2f}s {max(latencies):>6.2f}s "
+              f"{server.requests - args.calls:>12}")
+
+
+async def bench_outage(args):
+    calls = 50
+    print(f"\noutage: endpoint answers 500 to every call, {calls} calls, 5 in flight")
+    print(f"{'client':<16} {'requests':>9} {'failed (500)':>13} {'failed fast':>12} {'wall':>8}")
+    for label, sdk_retries in (("production", False), ("sdk retries", True)):
+        server = FakeOpenAIServer(latency=args.latency, error_rate=1.0).start()
+        if sdk_retries:
+            client = AsyncOpenAI(base_url=server.base_url, api_key="benchmark")
+        else:
+            client = create_openai_client(base_url=server.base_url, api_key="benchmark")
+        set_default_openai_client(client, use_for_tracing=False)
+        configure(args.deadline, 2, False)
+        settings.LLM_RETRY_BASE_DELAY = 0.05
+        _, failures, fail_fast, elapsed = await run_calls(calls, 5)
+        server.stop()
+        print(f"{label:<16} {server.requests:>9} {failures:>13} {fail_fast:>12} {elapsed:>7.2f}s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--in-flight", type=int, default=10, help="Concurrent calls")
+    parser.add_argument("--latency", type=float, default=0.3, help="Typical seconds per call")
+    parser.add_argument("--stall-rate", type=float, default=0.03, help="Fraction of calls that stall")
+    parser.add_argument("--stall", type=float, default=5.0, help="Seconds a stalled call takes")
+    parser.add_argument("--deadline", type=float, default=1.5, help="LLM_CALL_TIMEOUT for the deadline+retry mode")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    set_tracing_disabled(True)
+    for name in ("openai.agents", "app.services.client", "app.services.resilience"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+    settings.LLM_CACHE_ENABLED = False
+    settings.LLM_MAX_CONCURRENT_REQUESTS = 100
+    settings.LLM_ESTIMATED_OUTPUT_TOKENS = 20
+    settings.LLM_HEDGE_MIN_SAMPLES = 20
+    settings.LLM_HEDGE_MIN_DELAY = 0.1
+
+    await bench_tail_latency(args)
+    await bench_outage(args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
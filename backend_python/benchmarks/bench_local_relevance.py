@@ -0,0 +1,97 @@
+"""Benchmark: local BM25 ranking and shortlisting of resume items.
+
+Uses the "veteran" profile of bench_context_budget (many items across
+unrelated domains) and a backend/payments job description. Reports:
+
+- ranking time for all items and the precision of the top-k (items from the
+  domains the JD asks for: backend and DevOps),
+- full resume prompt tokens with FULL_RESUME_SHORTLIST_SIZE off and on,
+- experience selection time (it no longer calls a model).
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_local_relevance
+    uv run python -m benchmarks.bench_local_relevance --items 80 --points 10 --shortlist 6
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from agents.usage import Usage  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.database import repository  # noqa: E402
+from app.database.request_context import request_data_context  # noqa: E402
+from app.services import pointer_service  # noqa: E402
+from app.services.client import ai_client  # noqa: E402
+from app.services.rate_limiter import estimate_tokens  # noqa: E402
+from app.services.relevance import rank_resume_items  # noqa: E402
+from benchmarks.bench_context_budget import JOB_DESCRIPTION, USER_ID, make_veteran_tables  # noqa: E402
+from benchmarks.fake_supabase import FakeSupabase  # noqa: E402
+
+RELEVANT_TITLES = ("Backend Engineer", "DevOps Engineer")
+
+
+def count_model_calls(counter):
+    async def run_agent(agent, prompt, **kwargs):
+        counter["calls"] += 1
+        counter["tokens"] += estimate_tokens(prompt)
+        return SimpleNamespace(final_output="{}", context_wrapper=SimpleNamespace(usage=Usage()))
+    ai_client.run_agent = run_agent
+
+
+def timed_ms(fn, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=40, help="Experiences + projects in the profile")
+    parser.add_argument("--points", type=int, default=8, help="Bullets per item")
+    parser.add_argument("--shortlist", type=int, default=8, help="FULL_RESUME_SHORTLIST_SIZE when on")
+    args = parser.parse_args()
+
+    tables = make_veteran_tables(args.items, args.points)
+    repository.get_supabase_client = lambda: FakeSupabase(tables, latency=0.0)
+    settings.LLM_CACHE_ENABLED = False
+    settings.JD_DEDUP_ENABLED = False
+    with request_data_context():
+        user_data = await repository.get_user_resume_data(USER_ID)
+    items = user_data["resume_items"]
+
+    ranked, rank_ms = timed_ms(lambda: rank_resume_items(items, JOB_DESCRIPTION))
+    relevant = sum(item["title"].startswith(RELEVANT_TITLES) for item in items)
+    print(f"profile: {args.items} items x {args.points} bullets ({relevant} from the JD's domains)")
+    print(f"ranking all items: {rank_ms:.2f}ms")
+    for k in (3, 5, args.shortlist):
+        hits = sum(item["title"].startswith(RELEVANT_TITLES) for item, _, _ in ranked[:k])
+        print(f"  precision@{k}: {hits}/{k}")
+    print("  top 3:", ", ".join(f"{item['title']} ({score}: {' '.join(terms[:3])})" for item, score, terms in ranked[:3]))
+
+    print(f"\n{'full resume prompt':<24} {'tokens':>7} {'build time':>11}")
+    for label, size in (("all items", 0), (f"shortlist {args.shortlist}", args.shortlist)):
+        settings.FULL_RESUME_SHORTLIST_SIZE = size
+        for budget in (False, True):
+            settings.CONTEXT_BUDGET_ENABLED = budget
+            prompt, build_ms = timed_ms(lambda: pointer_service.build_full_resume_prompt(user_data, JOB_DESCRIPTION))
+            name = f"{label}{' + budget' if budget else ''}"
+            print(f"{name:<24} {estimate_tokens(prompt):>7} {build_ms:>9.2f}ms")
+
+    counter = {"calls": 0, "tokens": 0}
+    count_model_calls(counter)
+    start = time.perf_counter()
+    selected = await pointer_service.select_relevant_experiences_with_context(user_data, JOB_DESCRIPTION)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"\nexperience selection: {elapsed:.2f}ms, {counter['calls']} model calls, "
+          f"scores {[experience['score'] for experience in selected]}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""Benchmark: latency and token usage per task per model from recorded fixtures.
+
+For every task in the routing table (app/services/model_routing.py) runs the
+task's fixture prompt on the route's primary and fallback models (plus any
+--models) through `AIClient` and reports latency and token usage.
+
+By default the calls are replayed from benchmarks/fixtures/model_routes.json
+by a local fake Responses API (benchmarks/fake_openai_server.py) that answers
+with the recorded text, latency and usage, so the run needs no credentials.
+Pass --live to call OpenAI for real, and --record PATH to save the live
+responses as a new fixture file.
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_model_routes
+    uv run python -m benchmarks.bench_model_routes --repeat 3 --models gpt-4o-mini
+    uv run python -m benchmarks.bench_model_routes --live --record benchmarks/fixtures/model_routes.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import time
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from agents import set_default_openai_client, set_tracing_disabled  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.services.client import ai_client, create_openai_client  # noqa: E402
+from app.services.model_routing import TASK_BULLET_BATCH, model_router  # noqa: E402
+from app.services.pointer_service import BulletVariants  # noqa: E402
+from benchmarks.fake_openai_server import FakeOpenAIServer  # noqa: E402
+
+DEFAULT_FIXTURES = Path(__file__).parent / "fixtures" / "model_routes.json"
+
+
+def models_for(task, extra_models):
+    route = model_router.route(task)
+    models = [(route.primary, "primary")]
+    if route.fallback and route.fallback != route.primary:
+        models.append((route.fallback, "fallback"))
+    models.extend((model, "extra") for model in extra_models if model not in {m for m, _ in models})
+    return models
+
+
+def start_replay_server(fixtures, current):
+    """Fake endpoint answering with the recorded response of the (task, model) being measured."""
+    def recorded(body):
+        return fixtures["tasks"][current["task"]]["responses"][body.get("model")]
+
+    return FakeOpenAIServer(
+        reply=lambda body: recorded(body)["text"],
+        latency_for=lambda body: recorded(body)["latency_s"],
+        usage=lambda body: (recorded(body)["input_tokens"], recorded(body)["output_tokens"])
+    ).start()
+
+
+async def measure(task, model, prompt, repeat):
+    route = model_router.route(task)
+    output_type = BulletVariants if task == TASK_BULLET_BATCH else None
+    agent = ai_client.create_agent(
+        name=f"bench-{task}", model=model, tools=[], temperature=route.temperature,
+        output_type=output_type, max_tokens=route.max_tokens
+    )
+    latencies, input_tokens, output_tokens, text = [], [], [], ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await ai_client.run_agent(agent, prompt)
+        latencies.append(time.perf_counter() - start)
+        usage = result.context_wrapper.usage
+        input_tokens.append(usage.input_tokens)
+        output_tokens.append(usage.output_tokens)
+        output = result.final_output
+        text = output.model_dump_json() if hasattr(output, "model_dump_json") else str(output)
+    return {
+        "latency_s": statistics.median(latencies),
+        "input_tokens": round(statistics.mean(input_tokens)),
+        "output_tokens": round(statistics.mean(output_tokens)),
+        "text": text
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument("--repeat", type=int, default=1, help="Calls per task and model (median latency is reported)")
+    parser.add_argument("--models", nargs="*", default=[], help="Extra models to measure for every task")
+    parser.add_argument("--live", action="store_true", help="Call OpenAI instead of replaying the fixtures")
+    parser.add_argument("--record", type=Path, help="With --live, write the responses to this fixture file")
+    args = parser.parse_args()
+
+    set_tracing_disabled(True)
+    logging.getLogger("openai.agents").setLevel(logging.CRITICAL)
+    settings.LLM_CACHE_ENABLED = False
+    fixtures = json.loads(args.fixtures.read_text())
+    if fixtures.get("source") == "synthetic" and not args.live:
+        print(f"note: {fixtures.get('note', 'fixture latencies are synthetic')}")
+
+    current = {}
+    server = None
+    if not args.live:
+        server = start_replay_server(fixtures, current)
+        set_default_openai_client(create_openai_client(base_url=server.base_url, api_key="benchmark"), use_for_tracing=False)
+
+    recorded = {"source": "recorded", "tasks": {}}
+    print(f"\n{'task':<16} {'model':<14} {'role':<9} {'latency':>9} {'in tok':>7} {'out tok':>8} {'out tok/s':>10}")
+    try:
+        for task, fixture in fixtures["tasks"].items():
+            recorded["tasks"][task] = {"prompt": fixture["prompt"], "responses": {}}
+            for model, role in models_for(task, args.models):
+                if not args.live and model not in fixture["responses"]:
+                    print(f"{task:<16} {model:<14} {role:<9} {'no fixture':>9}")
+                    continue
+                current["task"] = task
+                row = await measure(task, model, fixture["prompt"], args.repeat)
+                recorded["tasks"][task]["responses"][model] = {
+                    "text": row["text"], "latency_s": round(row["latency_s"], 3),
+                    "input_tokens": row["input_tokens"], "output_tokens": row["output_tokens"]
+                }
+                throughput = row["output_tokens"] / row["latency_s"] if row["latency_s"] else 0.0
+                print(f"{task:<16} {model:<14} {role:<9} {row['latency_s']:>8.2f}s {row['input_tokens']:>7} "
+                      f"{row['output_tokens']:>8} {throughput:>10.1f}")
+    finally:
+        if server is not None:
+            server.stop()
+
+    if args.live and args.record:
+        args.record.write_text(json.dumps(recorded, indent=2) + "\n")
+        print(f"\nrecorded fixtures written to {args.record}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
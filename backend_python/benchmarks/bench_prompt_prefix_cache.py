@@ -0,0 +1,117 @@
+"""Benchmark: provider prompt-cache hits with the cache-friendly prompt layout.
+
+Tailors one profile to several job descriptions (full resume, resume analysis
+and pointer chunks for each) through AIClient against a local fake Responses
+API that simulates OpenAI's automatic prefix caching (cached_tokens for the
+longest prefix shared with an earlier prompt, in 128-token steps from 1024
+tokens). Compares the template layout (instructions, candidate, then job
+description) with a job-description-first layout like the old prompts, and
+reports the cached share of input tokens per agent from `token_usage`.
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_prompt_prefix_cache
+    uv run python -m benchmarks.bench_prompt_prefix_cache --jobs 10 --items 12
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from agents import set_default_openai_client, set_tracing_disabled  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.database import repository  # noqa: E402
+from app.database.request_context import request_data_context  # noqa: E402
+from app.services import feedback_service, pointer_service  # noqa: E402
+from app.services.client import create_openai_client  # noqa: E402
+from app.services.prompt_templates import PromptTemplate  # noqa: E402
+from app.services.token_usage import token_usage  # noqa: E402
+from benchmarks.bench_context_budget import USER_ID, make_veteran_tables  # noqa: E402
+from benchmarks.fake_openai_server import FakeOpenAIServer  # noqa: E402
+from benchmarks.fake_supabase import FakeSupabase  # noqa: E402
+
+ANALYSIS_REPLY = json.dumps({"strengths": ["Python"], "weaknesses": ["AWS"], "suggestions": ["Add metrics"]})
+FULL_RESUME_REPLY = json.dumps({
+    "selected_skills": ["Python"],
+    "selected_experiences": [{"title": "Backend Engineer 0", "company": "Company 0", "points": ["Built payment API"]}],
+    "selected_projects": []
+})
+
+template_render = PromptTemplate.render
+
+
+def job_description_first(self, context, job_description, request):
+    """The old layout: job description before instructions and candidate data."""
+    return f"JOB DESCRIPTION:\n{job_description}\n\n{self.instructions}\n\n{context}\n\n{request}"
+
+
+def reply(body):
+    prompt = json.dumps(body.get("input", ""))
+    if "Give feedback on how well" in prompt:
+        return ANALYSIS_REPLY
+    if "Create a resume" in prompt:
+        return FULL_RESUME_REPLY
+    return "Built payment API with Python/FastAPI serving 2M requests/day"
+
+
+def make_job_descriptions(count):
+    stacks = ["Python, FastAPI and PostgreSQL", "Kafka event pipelines on AWS", "Docker and Kubernetes", "React dashboards"]
+    return [
+        f"Senior Engineer #{i} at Company {i}. Build services with {stacks[i % len(stacks)]}; "
+        f"own design, on-call and mentoring for team {i}."
+        for i in range(count)
+    ]
+
+
+async def tailor_to_jobs(user_data, item_id, job_descriptions):
+    for job_description in job_descriptions:
+        with request_data_context():
+            await pointer_service.generate_full_resume_with_single_call(user_data, job_description)
+            await feedback_service.analyze_resume_relevancy(USER_ID, job_description)
+            await pointer_service.generate_pointer_chunks_with_context(
+                item_id, USER_ID, job_description, count=3, mode="parallel"
+            )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=8, help="Job descriptions to tailor the profile to")
+    parser.add_argument("--items", type=int, default=10, help="Experiences + projects in the profile")
+    parser.add_argument("--points", type=int, default=4, help="Bullets per item")
+    args = parser.parse_args()
+
+    set_tracing_disabled(True)
+    logging.getLogger("openai.agents").setLevel(logging.CRITICAL)
+    settings.LLM_CACHE_ENABLED = False
+    settings.JD_DEDUP_ENABLED = False
+    settings.SINGLEFLIGHT_ENABLED = False
+    # The fake endpoint repeats one bullet, which would otherwise be regenerated as a duplicate
+    settings.BULLET_DEDUP_ENABLED = False
+    tables = make_veteran_tables(args.items, args.points)
+    repository.get_supabase_client = lambda: FakeSupabase(tables, latency=0.0)
+    with request_data_context():
+        user_data = await repository.get_user_resume_data(USER_ID)
+    item_id = tables["resume_items"][1]["id"]
+    job_descriptions = make_job_descriptions(args.jobs)
+
+    print(f"{args.jobs} jobs, profile of {args.items} items x {args.points} bullets")
+    print(f"{'layout':<14} {'agent':<30} {'calls':>5} {'input tokens':>13} {'cached':>8} {'cached %':>9}")
+    for label, render in (("jd first", job_description_first), ("templates", template_render)):
+        PromptTemplate.render = render
+        token_usage.reset()
+        server = FakeOpenAIServer(latency=0.0, reply=reply, prefix_cache=True).start()
+        set_default_openai_client(create_openai_client(base_url=server.base_url, api_key="benchmark"), use_for_tracing=False)
+        await tailor_to_jobs(user_data, item_id, job_descriptions)
+        server.stop()
+        for agent_name, totals in token_usage.stats().items():
+            print(f"{label:<14} {agent_name:<30} {totals['calls']:>5} {totals['input_tokens']:>13} "
+                  f"{totals['cached_tokens']:>8} {totals['cached_ratio']:>8.0%}")
+    PromptTemplate.render = template_render
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""Benchmark: per-item pointer queries vs. the batched, concurrent, cached resume data loader.
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_resume_data_loader --items 40 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from app.config.settings import settings  # noqa: E402
+from app.database import repository  # noqa: E402
+from app.database.profile_cache import profile_cache  # noqa: E402
+from benchmarks.fake_supabase import FakeSupabase, make_profile_tables  # noqa: E402
+
+USER_ID = "bench-user"
+
+
+def legacy_get_user_resume_data(supabase, user_id):
+    """The original N+1 loader: one resume_item_points query per item."""
+    user_data = supabase.table("users").select("*").eq("id", user_id).execute()
+    resume_items = supabase.table("resume_items").select("*").eq("user_id", user_id).execute()
+    for item in resume_items.data:
+        pointers = supabase.table("resume_item_points").select("*").eq("resume_item_id", item["id"]).order("display_order").execute()
+        item["existing_pointers"] = pointers.data
+    skills = supabase.table("skills").select("*").eq("user_id", user_id).execute()
+    education = supabase.table("education").select("*").eq("user_id", user_id).execute()
+    return {
+        "user": user_data.data[0] if user_data.data else None,
+        "resume_items": resume_items.data,
+        "skills": skills.data,
+        "education": education.data,
+    }
+
+
+def sequential_batched_get_user_resume_data(supabase, user_id):
+    """Batched points query, but the profile queries still run one after another."""
+    user_data = supabase.table("users").select("*").eq("id", user_id).execute()
+    resume_items = supabase.table("resume_items").select("*").eq("user_id", user_id).execute()
+    pointers = supabase.table("resume_item_points").select("*").in_("resume_item_id", [item["id"] for item in resume_items.data]).order("display_order").execute()
+    repository.attach_pointers_to_items(resume_items.data, pointers.data)
+    skills = supabase.table("skills").select("*").eq("user_id", user_id).execute()
+    education = supabase.table("education").select("*").eq("user_id", user_id).execute()
+    return {
+        "user": user_data.data[0] if user_data.data else None,
+        "resume_items": resume_items.data,
+        "skills": skills.data,
+        "education": education.data,
+    }
+
+
+def run(label, loader, supabase):
+    supabase.round_trips = 0
+    start = time.perf_counter()
+    data = loader()
+    elapsed = time.perf_counter() - start
+    points = sum(len(item["existing_pointers"]) for item in data["resume_items"])
+    print(f"{label:<12} round trips: {supabase.round_trips:>3}   wall time: {elapsed * 1000:8.1f} ms   points loaded: {points}")
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=40)
+    parser.add_argument("--points", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated seconds per round trip")
+    args = parser.parse_args()
+
+    supabase = FakeSupabase(make_profile_tables(USER_ID, args.items, args.points), latency=args.latency)
+    repository.get_supabase_client = lambda: supabase
+
+    legacy = run("legacy", lambda: legacy_get_user_resume_data(supabase, USER_ID), supabase)
+    run("sequential", lambda: sequential_batched_get_user_resume_data(supabase, USER_ID), supabase)
+    profile_cache.clear()
+    batched = run("concurrent", lambda: asyncio.run(repository.get_user_resume_data(USER_ID)), supabase)
+    settings.PROFILE_CACHE_VERIFY_VERSION = True
+    run("cache+ver", lambda: asyncio.run(repository.get_user_resume_data(USER_ID)), supabase)
+    settings.PROFILE_CACHE_VERIFY_VERSION = False
+    run("cache+ttl", lambda: asyncio.run(repository.get_user_resume_data(USER_ID)), supabase)
+
+    def by_item(data):
+        return {item["id"]: [p["id"] for p in item["existing_pointers"]] for item in data["resume_items"]}
+
+    assert by_item(legacy) == by_item(batched), "batched loader returned different pointers"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark: /api/analyze-resume in fast (local) and full (local scores + AI feedback) mode.
+
+Uses the "veteran" profile of bench_context_budget and its backend/payments
+job description. The model is replaced by a stub that sleeps --llm-latency
+seconds and returns feedback JSON (or, for the "unparseable" row, plain
+text). Reports per mode: time per analysis, model calls, prompt tokens and
+the score, plus the local scoring time and its category breakdown.
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_resume_scoring
+    uv run python -m benchmarks.bench_resume_scoring --items 60 --points 10 --llm-latency 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from agents.usage import Usage  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.database import repository  # noqa: E402
+from app.database.request_context import request_data_context  # noqa: E402
+from app.services import feedback_service  # noqa: E402
+from app.services.client import ai_client  # noqa: E402
+from app.services.rate_limiter import estimate_tokens  # noqa: E402
+from app.services.resume_scoring import score_resume  # noqa: E402
+from benchmarks.bench_context_budget import JOB_DESCRIPTION, USER_ID, make_veteran_tables  # noqa: E402
+from benchmarks.fake_supabase import FakeSupabase  # noqa: E402
+
+FEEDBACK = {"strengths": ["Strong payments backend"], "weaknesses": ["Few Redis mentions"], "suggestions": ["Add Redis"]}
+
+
+def stub_model(counter, latency, output):
+    async def run_agent(agent, prompt, **kwargs):
+        counter["calls"] += 1
+        counter["tokens"] += estimate_tokens(prompt)
+        await asyncio.sleep(latency)
+        return SimpleNamespace(final_output=output, context_wrapper=SimpleNamespace(usage=Usage()))
+    ai_client.run_agent = run_agent
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=40, help="Experiences + projects in the profile")
+    parser.add_argument("--points", type=int, default=8, help="Bullets per item")
+    parser.add_argument("--llm-latency", type=float, default=2.0, help="Simulated model latency (seconds)")
+    parser.add_argument("--runs", type=int, default=3, help="Analyses per mode")
+    args = parser.parse_args()
+
+    tables = make_veteran_tables(args.items, args.points)
+    repository.get_supabase_client = lambda: FakeSupabase(tables, latency=0.0)
+    settings.LLM_CACHE_ENABLED = False
+    settings.JD_DEDUP_ENABLED = False
+    with request_data_context():
+        user_data = await repository.get_user_resume_data(USER_ID)
+
+    repeat = 50
+    start = time.perf_counter()
+    for _ in range(repeat):
+        scores = score_resume(user_data, JOB_DESCRIPTION)
+    scoring_ms = (time.perf_counter() - start) * 1000 / repeat
+    print(f"profile: {args.items} items x {args.points} bullets; simulated model latency {args.llm_latency:.1f}s")
+    print(f"local scoring: {scoring_ms:.2f}ms -> {scores.score}/100 {scores.category_scores}")
+    print(f"  matched skills {scores.matched_skills}, missing {scores.missing_skills}\n")
+
+    print(f"{'mode':<18} {'per analysis':>13} {'model calls':>12} {'prompt tokens':>14} {'score':>6}")
+    for label, mode, output in (
+        ("fast", "fast", json.dumps(FEEDBACK)),
+        ("full", "full", json.dumps(FEEDBACK)),
+        ("full, unparseable", "full", "Sorry, I cannot help with that."),
+    ):
+        counter = {"calls": 0, "tokens": 0}
+        stub_model(counter, args.llm_latency, output)
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            with request_data_context():
+                analysis = await feedback_service.analyze_resume_relevancy(USER_ID, JOB_DESCRIPTION, mode=mode)
+        elapsed = (time.perf_counter() - start) * 1000 / args.runs
+        tokens = counter["tokens"] // args.runs
+        print(f"{label:<18} {elapsed:>11.1f}ms {counter['calls']:>12} {tokens:>14} {analysis['score']:>6}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
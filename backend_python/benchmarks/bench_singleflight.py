@@ -0,0 +1,116 @@
+"""Benchmark: concurrent identical requests with and without singleflight.
+
+Fires bursts of concurrent /api/generate-full-resume, /api/analyze-resume and
+/api/generate-pointer-chunks requests at the route handlers (fake Supabase
+client, simulated model) where each distinct request is duplicated several
+times, as with double submits or several open tabs. Reports model calls and
+wall time with SINGLEFLIGHT_ENABLED off and on.
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_singleflight
+    uv run python -m benchmarks.bench_singleflight --distinct 3 --duplicates 4 --model-latency 1.0
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from agents.usage import Usage  # noqa: E402
+
+from app.config.settings import settings  # noqa: E402
+from app.database import repository  # noqa: E402
+from app.database.request_context import request_data_context  # noqa: E402
+from app.models import AnalyzeResumeRequest, GenerateFullResumeRequest, GeneratePointerChunksRequest  # noqa: E402
+from app.routes import resume  # noqa: E402
+from app.services.client import ai_client  # noqa: E402
+from app.services.singleflight import request_coalescer  # noqa: E402
+from benchmarks.fake_supabase import FakeSupabase, make_profile_tables  # noqa: E402
+
+USER_ID = "bench-user"
+
+ANALYSIS_REPLY = json.dumps({
+    "score": 80,
+    "category_scores": {"skills_match": 35, "experience_relevance": 25, "bullet_quality": 12, "presentation": 8},
+    "strengths": ["Python"], "weaknesses": ["AWS"], "suggestions": ["Add metrics"]
+})
+FULL_RESUME_REPLY = json.dumps({
+    "selected_skills": ["Python", "FastAPI"],
+    "selected_experiences": [{"title": "Role 1", "company": "Company 1", "points": ["Built payment API serving 2M requests/day"]}],
+    "selected_projects": []
+})
+
+
+def install_simulated_model(latency, counter):
+    async def run_agent(agent, prompt, **kwargs):
+        counter["calls"] += 1
+        await asyncio.sleep(latency)
+        if agent.name == "resume-analyzer":
+            output = ANALYSIS_REPLY
+        elif agent.name == "resume-optimizer":
+            output = FULL_RESUME_REPLY
+        else:
+            output = "Built payment API with Python/FastAPI serving 2M requests/day"
+        return SimpleNamespace(final_output=output, context_wrapper=SimpleNamespace(usage=Usage()))
+
+    ai_client.run_agent = run_agent
+
+
+def make_requests(distinct, item_id):
+    requests = []
+    for i in range(distinct):
+        job_description = f"Backend Engineer #{i}: Python, FastAPI, PostgreSQL and AWS."
+        requests.append((resume.generate_full_resume, GenerateFullResumeRequest(user_id=USER_ID, job_description=job_description)))
+        requests.append((resume.analyze_resume, AnalyzeResumeRequest(user_id=USER_ID, job_description=job_description)))
+        requests.append((resume.generate_pointer_chunks, GeneratePointerChunksRequest(
+            user_id=USER_ID, resume_item_id=item_id, job_description=job_description, generation_mode="parallel"
+        )))
+    return requests
+
+
+async def call_handler(handler, request):
+    # Every HTTP request gets its own data context (see the middleware in app.main)
+    with request_data_context():
+        return await handler(request=request)
+
+
+async def run_burst(requests, duplicates):
+    start = time.perf_counter()
+    await asyncio.gather(*(call_handler(handler, request) for handler, request in requests for _ in range(duplicates)))
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--distinct", type=int, default=2, help="Distinct job descriptions per endpoint")
+    parser.add_argument("--duplicates", type=int, default=3, help="Concurrent copies of each request")
+    parser.add_argument("--model-latency", type=float, default=0.5, help="Simulated seconds per model call")
+    args = parser.parse_args()
+
+    tables = make_profile_tables(USER_ID, num_items=10)
+    repository.get_supabase_client = lambda: FakeSupabase(tables, latency=0.02)
+    settings.LLM_CACHE_ENABLED = False
+    settings.JD_DEDUP_ENABLED = False
+    settings.PROFILE_CACHE_ENABLED = False
+    counter = {"calls": 0}
+    install_simulated_model(args.model_latency, counter)
+    requests = make_requests(args.distinct, tables["resume_items"][1]["id"])
+
+    total = len(requests) * args.duplicates
+    print(f"{total} requests: {len(requests)} distinct x {args.duplicates} concurrent copies, "
+          f"{args.model_latency}s per model call")
+    print(f"{'singleflight':<13} {'model calls':>11} {'wall':>8}")
+    for enabled in (False, True):
+        settings.SINGLEFLIGHT_ENABLED = enabled
+        counter["calls"] = 0
+        elapsed = await run_burst(requests, args.duplicates)
+        print(f"{'on' if enabled else 'off':<13} {counter['calls']:>11} {elapsed:>7.2f}s")
+    print(f"\ncoalescing stats: {request_coalescer.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""Benchmark: skill validation and JD skill extraction with the compiled skill index.
+
+Compares, over synthetic profiles and job descriptions that name skills by
+their aliases ("Postgres", "JS", "k8s", "React.js", ...):
+
+- validation of model-selected skills: the old exact/case-insensitive lookup
+  vs `validate_selected_skills` (alias-aware): skills kept and time per call,
+- finding the user's skills in a JD: one regex search per skill vs one
+  Aho-Corasick pass (`SkillIndex.matching_skills`).
+
+Run from backend_python/:
+    uv run python -m benchmarks.bench_skill_matching
+    uv run python -m benchmarks.bench_skill_matching --skills 60 --jds 200
+"""
+
+import argparse
+import logging
+import os
+import random
+import re
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from app.services.pointer_service import validate_selected_skills  # noqa: E402
+from app.services.skill_index import SKILL_ALIASES, skill_index_for  # noqa: E402
+
+# How users spell skills in their profile vs how JDs and models refer to them
+PROFILE_SPELLINGS = {
+    "postgresql": "PostgreSQL", "javascript": "JavaScript", "typescript": "TypeScript", "kubernetes": "Kubernetes",
+    "node.js": "Node.js", "react": "React", "c++": "C++", "aws": "AWS", "ci/cd": "CI/CD", "mongodb": "MongoDB",
+    "scikit-learn": "scikit-learn", "machine learning": "Machine Learning", "golang": "Go", "c#": "C#",
+}
+FILLER = "You will design, build and operate services, collaborate with product, and mentor engineers. "
+
+
+def legacy_validate(selected_skills, skills_list):
+    """The previous validation: exact match, then case-insensitive match."""
+    skills_lower_map = {s.lower(): s for s in skills_list}
+    valid = []
+    for skill in selected_skills:
+        if skill in skills_list:
+            valid.append(skill)
+        elif skill.lower() in skills_lower_map:
+            valid.append(skills_lower_map[skill.lower()])
+    return valid
+
+
+def make_cases(num_skills, num_jds, seed=5):
+    rng = random.Random(seed)
+    canonical = list(SKILL_ALIASES)
+    cases = []
+    for _ in range(num_jds):
+        owned = rng.sample(canonical, min(num_skills, len(canonical)))
+        profile = [PROFILE_SPELLINGS.get(skill, skill.title()) for skill in owned]
+        profile += [f"Internal Tool {i}" for i in range(max(0, num_skills - len(owned)))]
+        wanted = rng.sample(owned, min(8, len(owned)))
+        # JD and model both name the wanted skills by a random alias
+        names = [rng.choice((skill, *SKILL_ALIASES[skill])) for skill in wanted]
+        job_description = FILLER + " ".join(f"Experience with {name}." for name in names) + " " + FILLER
+        cases.append((profile, names, job_description, len(wanted)))
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skills", type=int, default=30, help="Skills per profile")
+    parser.add_argument("--jds", type=int, default=100, help="Job descriptions (one profile each)")
+    args = parser.parse_args()
+    logging.getLogger("app.services.pointer_service").setLevel(logging.CRITICAL)
+
+    cases = make_cases(args.skills, args.jds)
+    total_wanted = sum(wanted for _, _, _, wanted in cases)
+    # Indexes are compiled once per profile and cached, like in production
+    start = time.perf_counter()
+    for profile, _, _, _ in cases:
+        skill_index_for(profile)
+    compile_us = (time.perf_counter() - start) * 1e6 / len(cases)
+
+    print(f"{args.jds} JDs, {args.skills} skills per profile, {total_wanted} skills named by alias")
+    print(f"skill index compile: {compile_us:.0f}us per profile (once, then cached)\n")
+    print(f"{'validation':<22} {'kept':>6} {'per call':>10}")
+    for label, validate in (("exact/case-insensitive", legacy_validate), ("skill index", validate_selected_skills)):
+        start = time.perf_counter()
+        kept = sum(len(validate(names, profile)) for profile, names, _, _ in cases)
+        elapsed = (time.perf_counter() - start) * 1e6 / len(cases)
+        print(f"{label:<22} {kept:>6} {elapsed:>8.0f}us")
+
+    print(f"\n{'JD extraction':<22} {'found':>6} {'per JD':>10}")
+    start = time.perf_counter()
+    found = 0
+    for profile, _, job_description, _ in cases:
+        found += sum(
+            bool(re.search(rf"(?<![a-z0-9]){re.escape(skill.lower())}(?![a-z0-9])", job_description.lower()))
+            for skill in profile
+        )
+    elapsed = (time.perf_counter() - start) * 1e6 / len(cases)
+    print(f"{'regex per skill':<22} {found:>6} {elapsed:>8.0f}us")
+
+    start = time.perf_counter()
+    found = sum(len(skill_index_for(profile).matching_skills(job_description)) for profile, _, job_description, _ in cases)
+    elapsed = (time.perf_counter() - start) * 1e6 / len(cases)
+    print(f"{'skill index (1 pass)':<22} {found:>6} {elapsed:>8.0f}us")
+
+
+if __name__ == "__main__":
+    main()
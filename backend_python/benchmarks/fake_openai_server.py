@@ -0,0 +1,192 @@
+"""Local stand-in for the OpenAI Responses API used by the benchmarks.
+
+Serves `POST /v1/responses` (non-streaming) on 127.0.0.1 with a configurable
+latency, and enforces its own concurrency and tokens-per-minute limits the way
+the real API does: requests over the limit get a 429 with a Retry-After
+header. It can also fail a fraction of requests with a 500 to simulate an
+outage, and simulate automatic prompt (prefix) caching in the reported usage.
+Point the OpenAI SDK at it with OPENAI_BASE_URL=<server.base_url>.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Tuple
+
+
+class FakeOpenAIServer:
+    """Threaded HTTP server answering Responses API calls with canned text."""
+
+    def __init__(self, latency: float = 0.2, max_concurrency: int = 0, tokens_per_minute: int = 0,
+                 reply: Optional[Callable[[dict], str]] = None, latency_fn: Optional[Callable[[], float]] = None,
+                 error_rate: float = 0.0, seed: int = 0, usage: Optional[Callable[[dict], Tuple[int, int]]] = None,
+                 latency_for: Optional[Callable[[dict], float]] = None, prefix_cache: bool = False):
+        self.latency = latency
+        self.latency_fn = latency_fn
+        # Per-request overrides (e.g. replaying recorded calls): latency and (input, output) tokens
+        self.latency_for = latency_for
+        self.usage = usage
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.error_rate = error_rate
+        # Report cached_tokens for prompt prefixes shared with earlier requests to the same model
+        self.prefix_cache = prefix_cache
+        self._seen_prompts = {}
+        self._random = random.Random(seed)
+        self.reply = reply or (lambda body: "Built payment API with Python/FastAPI serving 2M requests/day")
+        self.requests = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        # Token bucket refilled continuously, like the API's rate limiter
+        self._tokens = float(tokens_per_minute)
+        self._tokens_updated = time.monotonic()
+        self._lock = threading.Lock()
+        ThreadingHTTPServer.request_queue_size = 1024  # accept bursts without connection resets
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _admit(self, tokens: int) -> Optional[float]:
+        """Return None if the request may run, else the Retry-After in seconds."""
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            if self.max_concurrency and self._in_flight >= self.max_concurrency:
+                self.rate_limited += 1
+                return 1.0
+            if self.tokens_per_minute:
+                rate = self.tokens_per_minute / 60
+                self._tokens = min(self.tokens_per_minute, self._tokens + (now - self._tokens_updated) * rate)
+                self._tokens_updated = now
+                if tokens > self._tokens:
+                    self.rate_limited += 1
+                    return (tokens - self._tokens) / rate
+                self._tokens -= tokens
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            return None
+
+    def _latency(self, body: dict) -> float:
+        if self.latency_for:
+            return self.latency_for(body)
+        return self.latency_fn() if self.latency_fn else self.latency
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.requests += 1
+                self.errors += 1
+                return True
+            return False
+
+    def _cached_tokens(self, model: str, prompt: str) -> int:
+        """Longest prefix shared with an earlier prompt, counted like the API: 128-token steps from 1024 tokens."""
+        if not self.prefix_cache:
+            return 0
+        with self._lock:
+            seen = self._seen_prompts.setdefault(model, [])
+            shared = max((len(os.path.commonprefix([prompt, other])) for other in seen), default=0)
+            seen.append(prompt)
+        tokens = shared // 4
+        return tokens // 128 * 128 if tokens >= 1024 else 0
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                prompt = json.dumps(body.get("input", ""))
+                input_tokens = len(prompt) // 4 + 1
+                text = server.reply(body)
+                output_tokens = len(text) // 4 + 1
+                if server.usage:
+                    input_tokens, output_tokens = server.usage(body)
+
+                if server._should_fail():
+                    self._send(500, {"error": {"message": "The server had an error", "type": "server_error"}})
+                    return
+                retry_after = server._admit(input_tokens + output_tokens)
+                if retry_after is not None:
+                    self._send(429, {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                               {"Retry-After": f"{retry_after:.2f}"})
+                    return
+                try:
+                    time.sleep(server._latency(body))
+                finally:
+                    server._release()
+                model = body.get("model", "gpt-4")
+                cached_tokens = min(server._cached_tokens(model, prompt), input_tokens)
+                self._send(200, make_response(model, text, input_tokens, output_tokens, cached_tokens))
+
+            def _send(self, status, payload, headers=None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client cancelled the call (deadline or losing hedge)
+                    self.close_connection = True
+
+        return Handler
+
+
+def make_response(model: str, text: str, input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> dict:
+    """Minimal Responses API payload with one assistant message."""
+    return {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": model,
+        "status": "completed",
+        "output": [{
+            "type": "message",
+            "id": f"msg_{uuid.uuid4().hex}",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": text, "annotations": []}]
+        }],
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": cached_tokens},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens
+        }
+    }
@@ -0,0 +1,125 @@
+"""In-memory stand-in for the Supabase client used by the benchmarks.
+
+Every `execute()` sleeps for a fixed latency and counts as one round trip,
+so benchmarks can compare query strategies without a live database.
+"""
+
+import random
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+
+class FakeSupabase:
+    """Minimal table/select/filter/order/execute chain over in-memory rows."""
+
+    def __init__(self, tables: Dict[str, List[Dict[str, Any]]], latency: float = 0.02):
+        self.tables = tables
+        self.latency = latency
+        self.round_trips = 0
+        self._lock = threading.Lock()
+
+    def table(self, name: str) -> "FakeQuery":
+        return FakeQuery(self, name)
+
+
+class FakeQuery:
+    """Chainable query builder mimicking the postgrest request builder."""
+
+    def __init__(self, client: FakeSupabase, table_name: str):
+        self._client = client
+        self._table_name = table_name
+        self._filters = []
+        self._orders = []
+        self._limit = None
+        self._insert_rows = None
+        self._count = None
+
+    def select(self, *columns: str, count: str = None) -> "FakeQuery":
+        self._count = count
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column: str, values: List[Any]) -> "FakeQuery":
+        allowed = set(values)
+        self._filters.append(lambda row: row.get(column) in allowed)
+        return self
+
+    def order(self, column: str, desc: bool = False, nullsfirst: bool = None) -> "FakeQuery":
+        self._orders.append((column, desc))
+        return self
+
+    def limit(self, size: int) -> "FakeQuery":
+        self._limit = size
+        return self
+
+    def insert(self, rows: List[Dict[str, Any]]) -> "FakeQuery":
+        self._insert_rows = rows
+        return self
+
+    def execute(self) -> SimpleNamespace:
+        time.sleep(self._client.latency)
+        with self._client._lock:
+            self._client.round_trips += 1
+
+        table = self._client.tables.setdefault(self._table_name, [])
+        if self._insert_rows is not None:
+            inserted = [{"id": str(uuid.uuid4()), **row} for row in self._insert_rows]
+            table.extend(inserted)
+            return SimpleNamespace(data=inserted)
+
+        rows = [dict(row) for row in table if all(f(row) for f in self._filters)]
+        total = len(rows)
+        for column, desc in reversed(self._orders):
+            # Nulls always sort last
+            present = sorted((row for row in rows if row.get(column) is not None), key=lambda row: row[column], reverse=desc)
+            rows = present + [row for row in rows if row.get(column) is None]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        return SimpleNamespace(data=rows, count=total if self._count else None)
+
+
+def make_profile_tables(user_id: str, num_items: int = 40, points_per_item: int = 4, seed: int = 7) -> Dict[str, List[Dict[str, Any]]]:
+    """Build a synthetic profile roughly shaped like a power user's data."""
+    rng = random.Random(seed)
+    items, points = [], []
+    for i in range(num_items):
+        item_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        items.append({
+            "id": item_id,
+            "user_id": user_id,
+            "item_type": "experience" if i % 3 else "project",
+            "title": f"Role {i}",
+            "organization": f"Company {i}",
+            "description": f"Worked on system {i} using Python, FastAPI and PostgreSQL.",
+            "start_date": f"20{10 + i % 14:02d}-01-01",
+            "end_date": None,
+            "is_current": False,
+            "updated_at": f"2025-01-{1 + i % 28:02d}T00:00:00+00:00",
+        })
+        for order in range(points_per_item):
+            points.append({
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "resume_item_id": item_id,
+                "user_id": user_id,
+                "content": f"Delivered feature {order} for role {i}, cutting latency by {rng.randint(5, 60)}%",
+                "display_order": order,
+                "usage_count": 0,
+                "updated_at": "2025-01-01T00:00:00+00:00",
+            })
+    rng.shuffle(points)
+
+    return {
+        "users": [{"id": user_id, "name": "Bench User", "email": "bench@example.com", "phone": None,
+                   "updated_at": "2025-01-01T00:00:00+00:00"}],
+        "resume_items": items,
+        "resume_item_points": points,
+        "skills": [{"id": str(i), "user_id": user_id, "name": name} for i, name in enumerate(["Python", "FastAPI", "PostgreSQL", "Docker", "AWS", "React"])],
+        "education": [{"id": "edu-1", "user_id": user_id, "title": "B.Sc. Computer Science", "description": "NUS", "end_date": "2020-06-01",
+                       "updated_at": "2025-01-01T00:00:00+00:00"}],
+    }